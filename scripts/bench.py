@@ -0,0 +1,630 @@
+#!/usr/bin/env python3
+"""
+=============================================================================
+File:           bench.py
+Purpose:        Benchmark harness for the scripts in this directory. Builds
+               deterministic synthetic inputs (nmap text/XML scans,
+               directory trees, CIDR lists, password dumps, OUI
+               registries), runs each tool over them and reports
+               throughput, latency percentiles and peak memory. Results can
+               be saved as a JSON baseline and later runs compared against
+               it, failing when a tool gets slower or hungrier than a
+               threshold allows.
+
+How to run:     python bench.py [options]
+               Options:
+                   --list: List the benchmarks and exit
+                   --only NAME [NAME ...]: Run only these benchmarks
+                   --scale F: Multiply every fixture size (default: 1.0)
+                   --seed N: Fixture seed (default: 0)
+                   --min-time S: Seconds to time each benchmark (default: 1.0)
+                   --save FILE: Write the results as a JSON baseline
+                   --compare FILE: Compare against a baseline and exit with
+                       status 1 on a regression
+                   --threshold PCT: Allowed regression in percent
+                       (default: 15)
+                   --write-fixtures DIR: Write the synthetic inputs to DIR
+                       and exit
+               Examples:
+                   python bench.py --save baseline.json
+                   python bench.py --compare baseline.json --threshold 10
+                   python bench.py --only nmap-text nmap-xml --scale 10
+                   python bench.py --write-fixtures /tmp/fixtures
+
+Dependencies:   Python 3.6+
+               - argparse
+               - json
+               - math
+               - random
+               - tempfile
+               - time
+               - tracemalloc
+               - The scripts being measured (same directory)
+
+Author:         Tom Kinsella
+Email:          tkinsella@sisng.io
+Organization:   Personal Project
+
+Creation Date:  2026-10-18
+Last Updated:   2026-10-18
+Version:        1.0.1
+
+Change History:
+   1.0.0 (2026-10-18) - Initial release
+       - Seeded generators for nmap text/XML, directory trees, CIDR
+         lists, password dumps and IEEE OUI registries
+       - Benchmarks for nmapFormat.py, ftg.py, subnet.py,
+         subnetLookup.py, perms.py, userPass.py, employeeGenerator.py and
+         macLookup.py
+       - Throughput, p50/p95/p99 latency and tracemalloc peak memory
+       - JSON baselines and a regression check with a threshold
+   1.0.1 (2026-10-18) - Fixes
+       - Nearest-rank percentiles use ceil(fraction * n) - 1; the old
+         rounding picked one rank too high
+       - Per-record benchmarks time a batch of 1000 calls per sample, so
+         sub-microsecond calls no longer swing p50 and throughput by more
+         than the default threshold between identical runs
+       - The credentials benchmark draws from a generator seeded with
+         --seed
+
+License:        MIT License
+               Copyright (c) 2024 Tom Kinsella
+               See LICENSE file for full license text
+
+Notes:
+   - The same --seed and --scale always produce byte-identical fixtures,
+     so results are only compared when both match the baseline
+   - Whole-input benchmarks (parsers, tree rendering, batch modes) time
+     one pass per sample; per-record benchmarks (single lookups,
+     credentials) time a batch of RECORD_BATCH (1000) calls per sample,
+     cycling through the inputs. Their percentiles are per batch; divide
+     by items_per_sample for the latency of one call
+   - A run regresses when throughput drops, or p50 latency or peak memory
+     grows, by more than --threshold. p95/p99 are reported but not
+     checked, as they are the noisiest figures
+   - Peak memory is the tracemalloc peak of one pass over the input,
+     measured separately from the timed samples
+   - Timing single sub-microsecond calls mostly measures the timer
+     (about 0.1 us per read) and scheduler noise, which is why per-record
+     benchmarks are batched
+   - credentials runs the real SecureRandomBuffer fed from
+     random.Random(--seed) instead of os.urandom, so its output is
+     reproducible; the urandom reads themselves are not timed
+   - Baselines are only meaningful on the machine that recorded them;
+     the Python version and platform are stored and a mismatch is
+     reported
+=============================================================================
+"""
+
+import io
+import os
+import gc
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import platform
+import datetime
+import itertools
+import tempfile
+import tracemalloc
+
+BASELINE_VERSION = 1
+
+# Calls timed per sample by per-record benchmarks
+RECORD_BATCH = 1000
+
+# Fixture sizes at --scale 1.0
+SIZES = {
+    'nmap_hosts': 2000,
+    'ports_per_host': 5,
+    'tree_dirs': 1500,
+    'files_per_dir': 6,
+    'cidrs': 20000,
+    'passwords': 50000,
+    'employees': 10000,
+    'oui_assignments': 5000,
+    'macs': 20000,
+}
+
+# (port, protocol, service) pool for synthetic scans
+SCAN_PORTS = [
+    (21, 'tcp', 'ftp'), (22, 'tcp', 'ssh'), (23, 'tcp', 'telnet'), (25, 'tcp', 'smtp'),
+    (53, 'tcp', 'domain'), (53, 'udp', 'domain'), (80, 'tcp', 'http'), (110, 'tcp', 'pop3'),
+    (123, 'udp', 'ntp'), (135, 'tcp', 'msrpc'), (139, 'tcp', 'netbios-ssn'),
+    (143, 'tcp', 'imap'), (161, 'udp', 'snmp'), (389, 'tcp', 'ldap'), (443, 'tcp', 'https'),
+    (445, 'tcp', 'microsoft-ds'), (636, 'tcp', 'ldapssl'), (993, 'tcp', 'imaps'),
+    (1433, 'tcp', 'ms-sql-s'), (3306, 'tcp', 'mysql'), (3389, 'tcp', 'ms-wbt-server'),
+    (5432, 'tcp', 'postgresql'), (5900, 'tcp', 'vnc'), (6379, 'tcp', 'redis'),
+    (8080, 'tcp', 'http-proxy'), (8443, 'tcp', 'https-alt'), (9200, 'tcp', 'wap-wsp'),
+]
+PORT_STATES = ['open'] * 6 + ['filtered'] * 2 + ['closed']
+PASSWORD_CHARS = 'ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz123456789!@#$%^&*()_+-=0lIO '
+WORDS = ['alpha', 'bravo', 'delta', 'echo', 'kilo', 'lima', 'oscar', 'sierra', 'tango', 'zulu']
+
+def scaled(name, scale):
+    return max(1, int(SIZES[name] * scale))
+
+# Synthetic inputs. Every generator takes its own random.Random(seed) so
+# each fixture is reproducible on its own.
+
+def scan_model(hosts, ports_per_host, seed):
+    # Yield (ip, hostname, [(port, protocol, state, service), ...]) per host
+    rng = random.Random(seed)
+    for h in range(hosts):
+        value = 0x0A000000 + (h // 254 << 8) + h % 254 + 1
+        ip = f"{value >> 24}.{(value >> 16) & 255}.{(value >> 8) & 255}.{value & 255}"
+        ports = sorted(rng.sample(SCAN_PORTS, min(ports_per_host, len(SCAN_PORTS))), key=lambda p: (p[1], p[0]))
+        yield ip, f"host-{h}.corp.example", [
+            (port, protocol, rng.choice(PORT_STATES), service) for port, protocol, service in ports
+        ]
+
+def nmap_text(hosts, ports_per_host, seed):
+    # Normal (-oN) nmap output as a list of lines
+    lines = [f"# Nmap 7.94 scan initiated Mon Oct 14 09:00:00 2024 as: nmap -sS -sU -sV -oN scan.txt 10.0.0.0/16\n"]
+    for ip, name, ports in scan_model(hosts, ports_per_host, seed):
+        lines.append(f"Nmap scan report for {name} ({ip})\n")
+        lines.append("Host is up (0.00042s latency).\n")
+        lines.append(f"Not shown: {1000 - len(ports)} closed tcp ports (reset)\n")
+        lines.append("PORT      STATE    SERVICE\n")
+        for port, protocol, state, service in ports:
+            lines.append(f"{f'{port}/{protocol}':<9} {state:<8} {service}\n")
+        lines.append("\n")
+    lines.append(f"# Nmap done at Mon Oct 14 09:30:00 2024 -- {hosts} IP addresses ({hosts} hosts up) scanned in 1800.00 seconds\n")
+    return lines
+
+def nmap_xml(hosts, ports_per_host, seed):
+    # XML (-oX) nmap output as bytes
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<nmaprun scanner="nmap" args="nmap -sS -sU -sV -oX scan.xml 10.0.0.0/16" start="1728896400" version="7.94" xmloutputversion="1.05">\n'
+    ]
+    for ip, name, ports in scan_model(hosts, ports_per_host, seed):
+        parts.append(
+            f'<host starttime="1728896400" endtime="1728896460"><status state="up" reason="syn-ack"/>\n'
+            f'<address addr="{ip}" addrtype="ipv4"/>\n'
+            f'<hostnames><hostname name="{name}" type="PTR"/></hostnames>\n<ports>'
+        )
+        for port, protocol, state, service in ports:
+            parts.append(
+                f'<port protocol="{protocol}" portid="{port}"><state state="{state}" reason="syn-ack" reason_ttl="64"/>'
+                f'<service name="{service}" method="probed" conf="10"/></port>\n'
+            )
+        parts.append('</ports>\n</host>\n')
+    parts.append('<runstats><finished time="1728898200"/></runstats>\n</nmaprun>\n')
+    return ''.join(parts).encode()
+
+def make_tree(root, dirs, files_per_dir, seed):
+    # Create a directory tree under root. Each new directory is placed under
+    # a random existing one, which gives a mix of deep and wide branches.
+    # Files are sparse, so sizes vary without writing data.
+    rng = random.Random(seed)
+    created = [root]
+    os.makedirs(os.path.join(root, '.git', 'objects'), exist_ok=True)
+    for d in range(dirs):
+        parent = rng.choice(created)
+        path = os.path.join(parent, f"{rng.choice(WORDS)}_{d}")
+        os.mkdir(path)
+        created.append(path)
+        for f in range(rng.randint(0, 2 * files_per_dir)):
+            with open(os.path.join(path, f"file_{f}.{rng.choice(['txt', 'log', 'py', 'csv'])}"), 'wb') as handle:
+                handle.truncate(rng.randrange(1 << rng.randrange(4, 24)))
+    return root
+
+def cidr_list(count, seed):
+    # CIDR lines with nested, duplicate and netmask-form entries
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.05 and lines:
+            lines.append(rng.choice(lines))
+            continue
+        prefix = rng.randint(8, 30)
+        value = rng.choice([0x0A000000, 0xAC100000, 0xC0A80000]) | rng.getrandbits(20)
+        value &= (0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF
+        ip = f"{value >> 24}.{(value >> 16) & 255}.{(value >> 8) & 255}.{value & 255}"
+        if kind < 0.15:
+            mask = (0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF
+            lines.append(f"{ip}/{mask >> 24}.{(mask >> 16) & 255}.{(mask >> 8) & 255}.{mask & 255}")
+        else:
+            lines.append(f"{ip}/{prefix}")
+    return lines
+
+def ip_list(count, seed):
+    rng = random.Random(seed)
+    return [
+        f"{rng.choice([10, 172, 192])}.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(256)}"
+        for _ in range(count)
+    ]
+
+def password_dump(count, seed):
+    # One password per line; lengths and character mixes vary so every
+    # policy rule fails for some entries
+    rng = random.Random(seed)
+    return [
+        ''.join(rng.choices(PASSWORD_CHARS, k=rng.choice([8, 12, 14, 16, 16, 16, 20]))) + '\n'
+        for _ in range(count)
+    ]
+
+def oui_registry(count, seed):
+    # IEEE registry CSV lines (MA-L, MA-M and MA-S rows)
+    rng = random.Random(seed)
+    lines = ['Registry,Assignment,Organization Name,Organization Address\n']
+    for value in sorted(rng.sample(range(1 << 24), count)):
+        kind = rng.random()
+        company = f"{rng.choice(WORDS).title()} Networks {value % 997}"
+        if kind < 0.9:
+            lines.append(f'MA-L,{value:06X},"{company}, Inc.",{value % 89} Main St Springfield US\n')
+        elif kind < 0.95:
+            lines.append(f'MA-M,{value:06X}{rng.randrange(16):X},{company},Springfield US\n')
+        else:
+            lines.append(f'MA-S,{value:06X}{rng.randrange(1 << 12):03X},{company},Springfield US\n')
+    return lines
+
+def mac_list(registry_lines, count, seed):
+    # MAC addresses, mostly under assigned prefixes
+    rng = random.Random(seed)
+    prefixes = [int(line.split(',')[1][:6], 16) for line in registry_lines[1:]]
+    macs = []
+    for _ in range(count):
+        oui = rng.choice(prefixes) if rng.random() < 0.9 else rng.getrandbits(24)
+        value = (oui << 24) | rng.getrandbits(24)
+        macs.append(':'.join(f"{(value >> shift) & 255:02x}" for shift in range(40, -8, -8)))
+    return macs
+
+def write_fixtures(directory, scale, seed):
+    # Write every fixture to directory for use with the scripts directly
+    os.makedirs(directory, exist_ok=True)
+    hosts, ports = scaled('nmap_hosts', scale), SIZES['ports_per_host']
+    with open(os.path.join(directory, 'scan.txt'), 'w') as f:
+        f.writelines(nmap_text(hosts, ports, seed))
+    with open(os.path.join(directory, 'scan.xml'), 'wb') as f:
+        f.write(nmap_xml(hosts, ports, seed))
+    with open(os.path.join(directory, 'cidrs.txt'), 'w') as f:
+        f.write('\n'.join(cidr_list(scaled('cidrs', scale), seed)) + '\n')
+    with open(os.path.join(directory, 'passwords.txt'), 'w') as f:
+        f.writelines(password_dump(scaled('passwords', scale), seed))
+    registry = oui_registry(scaled('oui_assignments', scale), seed)
+    with open(os.path.join(directory, 'oui.csv'), 'w') as f:
+        f.writelines(registry)
+    with open(os.path.join(directory, 'macs.txt'), 'w') as f:
+        f.write('\n'.join(mac_list(registry, scaled('macs', scale), seed)) + '\n')
+    tree = os.path.join(directory, 'tree')
+    if not os.path.exists(tree):
+        make_tree(tree, scaled('tree_dirs', scale), SIZES['files_per_dir'], seed)
+
+# Benchmarks. Each setup function takes (scale, seed, workdir) and returns
+# (step, items per step, unit, full pass): step is timed once per sample,
+# full pass runs over the whole input once for the memory measurement.
+
+def per_record(function, values):
+    # Time RECORD_BATCH calls per sample, cycling through values
+    cycle = itertools.cycle(values)
+
+    def step():
+        for value in itertools.islice(cycle, RECORD_BATCH):
+            function(value)
+
+    def full_pass():
+        for value in values:
+            function(value)
+    return step, RECORD_BATCH, full_pass
+
+def setup_nmap_text(scale, seed, workdir):
+    from nmapFormat import parse_nmap_output
+    lines = nmap_text(scaled('nmap_hosts', scale), SIZES['ports_per_host'], seed)
+    step = lambda: parse_nmap_output(lines)
+    return step, len(step()), 'rows', step
+
+def setup_nmap_xml(scale, seed, workdir):
+    from nmapFormat import iter_nmap_xml
+    data = nmap_xml(scaled('nmap_hosts', scale), SIZES['ports_per_host'], seed)
+    step = lambda: list(iter_nmap_xml(io.BytesIO(data)))
+    return step, len(step()), 'rows', step
+
+def setup_nmap_columns(scale, seed, workdir):
+    from nmapFormat import ScanResults, iter_nmap_output
+    lines = nmap_text(scaled('nmap_hosts', scale), SIZES['ports_per_host'], seed)
+
+    def step():
+        results = ScanResults()
+        results.extend(iter_nmap_output(lines))
+        return results
+    return step, len(step()), 'rows', step
+
+def setup_nmap_diff(scale, seed, workdir):
+    from nmapFormat import parse_nmap_output
+    from nmapDiff import diff_scans
+    hosts, ports = scaled('nmap_hosts', scale), SIZES['ports_per_host']
+    old = parse_nmap_output(nmap_text(hosts, ports, seed))
+    new = parse_nmap_output(nmap_text(hosts, ports, seed + 1))
+    step = lambda: list(diff_scans(old, new))
+    return step, len(old) + len(new), 'rows', step
+
+def _tree(scale, seed, workdir):
+    root = os.path.join(workdir, f"tree-{seed}")
+    if not os.path.exists(root):
+        make_tree(root, scaled('tree_dirs', scale), SIZES['files_per_dir'], seed)
+    return root
+
+def setup_tree(scale, seed, workdir):
+    from ftg import iter_tree
+    root = _tree(scale, seed, workdir)
+    step = lambda: sum(1 for _ in iter_tree(root))
+    return step, step(), 'lines', step
+
+def setup_tree_sizes(scale, seed, workdir):
+    from ftg import DEFAULT_EXCLUDES, SizeIndex, iter_tree
+    root = _tree(scale, seed, workdir)
+
+    def step():
+        sizes = SizeIndex(root, DEFAULT_EXCLUDES)
+        return sum(1 for _ in iter_tree(root, lister=sizes.get, describe=sizes.describe))
+    return step, step(), 'lines', step
+
+def setup_subnet_info(scale, seed, workdir):
+    from subnet import calculate_subnet_info
+    step, items, full_pass = per_record(calculate_subnet_info, cidr_list(scaled('cidrs', scale), seed))
+    return step, items, 'lookups', full_pass
+
+def setup_subnet_batch(scale, seed, workdir):
+    from subnet import calculate_subnet_batch
+    lines = cidr_list(scaled('cidrs', scale), seed)
+    step = lambda: calculate_subnet_batch(lines, io.StringIO(), errors=io.StringIO())
+    return step, len(lines), 'lines', step
+
+def setup_subnet_aggregate(scale, seed, workdir):
+    from subnet import aggregate_subnets, read_subnets
+    subnets = list(read_subnets(cidr_list(scaled('cidrs', scale), seed), io.StringIO()))
+    step = lambda: aggregate_subnets(subnets)
+    return step, len(subnets), 'subnets', step
+
+def setup_subnet_lookup(scale, seed, workdir):
+    from subnetLookup import SubnetIndex
+    index = SubnetIndex((cidr, '') for cidr in cidr_list(scaled('cidrs', scale), seed))
+    step, items, full_pass = per_record(index.lookup, ip_list(scaled('cidrs', scale), seed))
+    return step, items, 'lookups', full_pass
+
+def setup_perms(scale, seed, workdir):
+    from perms import SYMBOLIC_TABLE, OCTAL_TABLE, convert_perm
+    # Half octal values, half ls -l modes
+    rng = random.Random(seed)
+    values = [
+        OCTAL_TABLE[mode] if rng.random() < 0.5 else 'd' + SYMBOLIC_TABLE[mode]
+        for mode in (rng.randrange(0o10000) for _ in range(scaled('cidrs', scale)))
+    ]
+    step, items, full_pass = per_record(convert_perm, values)
+    return step, items, 'conversions', full_pass
+
+def setup_credentials(scale, seed, workdir):
+    from userPass import CredentialGenerator, SecureRandomBuffer
+    rng = random.Random(seed)
+    source = lambda n: rng.getrandbits(8 * n).to_bytes(n, 'little')
+    generator = CredentialGenerator(rng=SecureRandomBuffer(source=source))
+    count = scaled('passwords', scale)
+    # One long run, so the usernames of every sample share one bitmap
+    credentials = generator.generate_credentials(count * RECORD_BATCH)
+    step = lambda: sum(1 for _ in itertools.islice(credentials, RECORD_BATCH))
+    full_pass = lambda: sum(1 for _ in generator.generate_credentials(count))
+    return step, RECORD_BATCH, 'credentials', full_pass
+
+def setup_password_audit(scale, seed, workdir):
+    from userPass import PasswordPolicy
+    violations = PasswordPolicy().violations
+    passwords = [line.rstrip('\n') for line in password_dump(scaled('passwords', scale), seed)]
+    step = lambda: sum(1 for password in passwords if violations(password))
+    return step, len(passwords), 'passwords', step
+
+def setup_employees(scale, seed, workdir):
+    from employeeGenerator import generate_shard
+    count = scaled('employees', scale)
+    step = lambda: generate_shard((seed, 0, 0, count, 'csv'))
+    return step, count, 'rows', step
+
+def setup_mac(scale, seed, workdir):
+    from macLookup import OuiIndex, compile_index, parse_mac
+    registry = oui_registry(scaled('oui_assignments', scale), seed)
+    registry_path = os.path.join(workdir, f"oui-{seed}.csv")
+    with open(registry_path, 'w') as f:
+        f.writelines(registry)
+    index_path = os.path.join(workdir, f"oui-{seed}.idx")
+    compile_index([registry_path], index_path)
+    macs = mac_list(registry, scaled('macs', scale), seed)
+
+    # A fresh index per pass, so the per-OUI result cache starts empty
+    def step():
+        index = OuiIndex(index_path)
+        lookup_value = index.lookup_value
+        found = sum(1 for mac in macs if lookup_value(*parse_mac(mac)))
+        index.close()
+        return found
+    return step, len(macs), 'lookups', step
+
+# name -> (setup function, description)
+BENCHMARKS = {
+    'nmap-text': (setup_nmap_text, 'nmapFormat.parse_nmap_output over normal output'),
+    'nmap-xml': (setup_nmap_xml, 'nmapFormat.iter_nmap_xml over -oX output'),
+    'nmap-columns': (setup_nmap_columns, 'nmapFormat.ScanResults built from normal output'),
+    'nmap-diff': (setup_nmap_diff, 'nmapDiff.diff_scans of two scans'),
+    'tree': (setup_tree, 'ftg.iter_tree over a synthetic directory tree'),
+    'tree-sizes': (setup_tree_sizes, 'ftg.iter_tree with SizeIndex sizes'),
+    'subnet-info': (setup_subnet_info, 'subnet.calculate_subnet_info, one CIDR per call'),
+    'subnet-batch': (setup_subnet_batch, 'subnet.calculate_subnet_batch over a CIDR list'),
+    'subnet-aggregate': (setup_subnet_aggregate, 'subnet.aggregate_subnets over a CIDR list'),
+    'subnet-lookup': (setup_subnet_lookup, 'subnetLookup.SubnetIndex.lookup, one IP per call'),
+    'perms': (setup_perms, 'perms.convert_perm, one value per call'),
+    'credentials': (setup_credentials, 'userPass.CredentialGenerator, one credential per call'),
+    'password-audit': (setup_password_audit, 'userPass.PasswordPolicy.violations over a dump'),
+    'employees': (setup_employees, 'employeeGenerator.generate_shard of one shard'),
+    'mac': (setup_mac, 'macLookup.OuiIndex lookups over a MAC list'),
+}
+
+def percentile(sorted_values, fraction):
+    # Nearest-rank percentile of an already sorted list
+    index = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def measure(step, items, full_pass, min_time=1.0, min_samples=5):
+    # Time step() until min_time has passed and min_samples were taken,
+    # then measure the peak memory of one full pass
+    timer = time.perf_counter_ns
+    gc.collect()
+    step()
+    samples = []
+    budget = int(min_time * 1e9)
+    total = 0
+    while total < budget or len(samples) < min_samples:
+        started = timer()
+        step()
+        elapsed = timer() - started
+        samples.append(elapsed)
+        total += elapsed
+    samples.sort()
+
+    gc.collect()
+    tracemalloc.start()
+    full_pass()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'throughput': round(items * len(samples) / (total / 1e9), 1),
+        'p50_us': round(percentile(samples, 0.50) / 1000, 3),
+        'p95_us': round(percentile(samples, 0.95) / 1000, 3),
+        'p99_us': round(percentile(samples, 0.99) / 1000, 3),
+        'peak_kib': round(peak / 1024, 1),
+        'samples': len(samples),
+        'items_per_sample': items,
+    }
+
+def run_benchmarks(names, scale=1.0, seed=0, min_time=1.0, report=None):
+    # Run the named benchmarks and return {name: result}
+    here = os.path.dirname(os.path.abspath(__file__))
+    if here not in sys.path:
+        sys.path.insert(0, here)
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='bench-') as workdir:
+        for name in names:
+            setup, _ = BENCHMARKS[name]
+            step, items, unit, full_pass = setup(scale, seed, workdir)
+            result = measure(step, items, full_pass, min_time)
+            result['unit'] = unit
+            results[name] = result
+            if report:
+                report(name, result)
+    return results
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+    }
+
+def compare(results, baseline, threshold):
+    # Yield (name, metric, baseline value, current value, relative change,
+    # regressed) for every checked metric of every benchmark in both runs
+    limit = threshold / 100
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        for metric, higher_is_better in (('throughput', True), ('p50_us', False), ('peak_kib', False)):
+            before, after = old.get(metric), result.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            yield name, metric, before, after, change, (-change if higher_is_better else change) > limit
+
+def format_result(name, result):
+    return (f"{name:<17} {result['throughput']:>14,.0f} {result['unit'] + '/s':<14} "
+            f"{result['p50_us']:>11,.1f} {result['p95_us']:>11,.1f} {result['p99_us']:>11,.1f} "
+            f"{result['peak_kib']:>11,.1f}")
+
+RESULT_HEADER = (f"{'Benchmark':<17} {'Throughput':>14} {'':<14} "
+                 f"{'p50 (us)':>11} {'p95 (us)':>11} {'p99 (us)':>11} {'Peak (KiB)':>11}")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the scripts on deterministic synthetic inputs"
+    )
+    parser.add_argument("--list", action="store_true", help="List the benchmarks and exit")
+    parser.add_argument("--only", nargs="+", metavar="NAME", help="Run only these benchmarks")
+    parser.add_argument("--scale", type=float, default=1.0, help="Fixture size multiplier (default: 1.0)")
+    parser.add_argument("--seed", type=int, default=0, help="Fixture seed (default: 0)")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Seconds to time each benchmark (default: 1.0)")
+    parser.add_argument("--save", metavar="FILE", help="Write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="Compare against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=15.0, help="Allowed regression in percent (default: 15)")
+    parser.add_argument("--write-fixtures", metavar="DIR", help="Write the synthetic inputs to DIR and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, (_, description) in BENCHMARKS.items():
+            print(f"{name:<17} {description}")
+        return
+
+    if args.write_fixtures:
+        write_fixtures(args.write_fixtures, args.scale, args.seed)
+        print(f"Fixtures written to {args.write_fixtures}")
+        return
+
+    names = args.only or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        print(f"Error: Unknown benchmark(s): {', '.join(unknown)} (see --list)")
+        sys.exit(2)
+
+    baseline = None
+    if args.compare:
+        try:
+            with open(args.compare) as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error: Cannot read baseline '{args.compare}': {e}")
+            sys.exit(2)
+        if baseline.get('version') != BASELINE_VERSION:
+            print(f"Error: Baseline '{args.compare}' has an unsupported format")
+            sys.exit(2)
+        if (baseline.get('scale'), baseline.get('seed')) != (args.scale, args.seed):
+            print(f"Error: Baseline was recorded with --scale {baseline.get('scale')} --seed {baseline.get('seed')}")
+            sys.exit(2)
+        if baseline.get('environment') != environment():
+            print("Warning: Baseline was recorded on a different Python or platform", file=sys.stderr)
+
+    print(RESULT_HEADER)
+    results = run_benchmarks(names, args.scale, args.seed, args.min_time,
+                             report=lambda name, result: print(format_result(name, result), flush=True))
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({
+                'version': BASELINE_VERSION,
+                'created': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'environment': environment(),
+                'scale': args.scale,
+                'seed': args.seed,
+                'results': results,
+            }, f, indent=4)
+            f.write('\n')
+        print(f"\nBaseline written to {args.save}")
+
+    if baseline is not None:
+        regressions = 0
+        print(f"\nCompared with {args.compare} (threshold {args.threshold:g}%):")
+        for name, metric, before, after, change, regressed in compare(results, baseline['results'], args.threshold):
+            if regressed:
+                regressions += 1
+            marker = 'REGRESSION' if regressed else 'ok'
+            print(f"  {name:<17} {metric:<11} {before:>14,.1f} -> {after:>14,.1f} {change:>+8.1%}  {marker}")
+        if regressions:
+            print(f"\n{regressions} regression(s) beyond {args.threshold:g}%")
+            sys.exit(1)
+        print("\nNo regressions")
+
+if __name__ == "__main__":
+    main()
@@ -3,33 +3,85 @@
 =============================================================================
 File:           employeeGenerator.py
 Purpose:        Generates synthetic employee data for testing and development
-                purposes. Creates 50 random employee profiles with realistic
-                personal information including names, addresses, SSNs, and
-                other demographic data.
+                purposes. Creates random employee profiles (50 by default)
+                with realistic personal information including names,
+                addresses, SSNs, and other demographic data.
 
-How to run:     python employeeGenerator.py
+How to run:     python employeeGenerator.py [options]
+                Options:
+                    --count N: Number of employees (default: 50)
+                    --seed N: Random seed for reproducible output
+                    --output FILE: Write to FILE instead of stdout
+                    --format {csv,parquet}: Output format (default: csv)
+                    --workers N: Worker processes (default: 1)
+                    --shard-size N: Rows per shard (default: 100000)
                 Output is printed to stdout and can be redirected to a file:
                 python employeeGenerator.py > employees.csv
+                python employeeGenerator.py --count 20000000 --seed 7 --output employees.csv
+                python employeeGenerator.py --count 100000000 --seed 7 --workers 8 \
+                    --format parquet --output employees.parquet
 
 Dependencies:   Python 3.6+
                 - random
                 - datetime
                 - string
+                - argparse
+                - csv
+                - io
+                - concurrent.futures
+                - hashlib
+                - pyarrow (Parquet output only)
 
 Author:         Tom Kinsella
 Email:          tkinsella@sisng.io
 Organization:   Private Project
 
 Creation Date:  2024-10-26
-Last Updated:   2024-10-26
-Version:        1.0.1
+Last Updated:   2026-10-18
+Version:        1.4.1
+
+Change History:
+    1.0.1 (2024-10-26) - Initial release
+        - 50 random employee profiles written to stdout as CSV
+    1.1.0 (2026-10-18) - Large output support
+        - --count, --seed and --output options
+        - Rows are written in chunks through the csv module instead of
+          building one string, so memory does not grow with --count
+        - Issued employee numbers are tracked in a bitmap instead of a set
+    1.2.0 (2026-10-18) - Columnar, sharded generation
+        - Each field is generated for a whole shard with one
+          random.choices() call; dates come from precomputed tables
+        - Shards run on a process pool (--workers) and are written in
+          order, so output only depends on --seed and --shard-size
+        - Employee numbers come from a permutation of the row index
+          instead of a bitmap of issued numbers
+        - Parquet output through pyarrow
+    1.3.0 (2026-10-18) - Unique IDs
+        - Employee numbers, SSNs and driver's licenses are unique per run:
+          each is the row index passed through a keyed Feistel permutation
+          of its ID space, seeded from --seed
+        - O(1) time and memory per ID, and safe across parallel shards
+    1.4.0 (2026-10-18) - Startup time
+        - concurrent.futures is imported only when --workers is above 1
+        - Available as "tools.py employees"
+    1.4.1 (2026-10-18) - Fixes
+        - Removed the per-row generators (random_date,
+          generate_employee_number, generate_ssn, generate_drivers_license)
+          left unused by the columnar generator
+        - Change History is listed oldest first
+        - Shards are rendered with csv.writer().writerows() into a string
+          buffer; the plain ",".join could not quote fields
+        - --shard-size must be a positive integer
 
 License:        MIT License
                 Copyright (c) 2024 [Your Name]
                 See LICENSE file for full license text
 
 Notes:
-    - Generates 50 unique employee profiles
+    - Generates 50 unique employee profiles unless --count is given
+    - Employee numbers, SSNs and driver's licenses are unique; at most
+      26*26*10^6 employees can be generated per run
+    - Output for a given --seed is identical for any --workers value
     - All data is randomly generated and not based on real persons
     - Date ranges:
         * Birth dates: 65 to 18 years from current date
@@ -37,34 +89,16 @@ Notes:
 =============================================================================
 """
 
+import io
+import sys
+import csv
 import random
+import argparse
+import hashlib
+from collections import deque
 from datetime import datetime, timedelta
 import string
 
-# Helper function to generate random dates
-def random_date(start_date, end_date):
-    time_between = end_date - start_date
-    days_between = time_between.days
-    random_days = random.randrange(days_between)
-    return start_date + timedelta(days=random_days)
-
-# Generate 50 unique employee numbers
-def generate_employee_number():
-    letters = ''.join(random.choices(string.ascii_uppercase, k=2))
-    numbers = ''.join(random.choices(string.digits, k=6))
-    return f"{letters}{numbers}"
-
-# Generate random SSN
-def generate_ssn():
-    area = random.randint(100, 999)
-    group = random.randint(10, 99)
-    serial = random.randint(1000, 9999)
-    return f"{area}-{group}-{serial}"
-
-# Generate random driver's license
-def generate_drivers_license():
-    return f"WDL{random.randint(100,999)}{'ABCDEFGHIJKLMNOPQRSTUVWXYZ'[random.randint(0,25)]}{random.randint(0,9)}{'ABCDEFGHIJKLMNOPQRSTUVWXYZ'[random.randint(0,25)]}{random.randint(0,9)}{'ABCDEFGHIJKLMNOPQRSTUVWXYZ'[random.randint(0,25)]}"
-
 # Lists for generating random names
 first_names = ["James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "William", "Elizabeth", "David", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen", "Christopher", "Nancy", "Daniel", "Lisa", "Matthew", "Betty", "Anthony", "Margaret", "Donald", "Sandra", "Mark", "Ashley", "Paul", "Kimberly", "Steven", "Emily", "Andrew", "Donna", "Kenneth", "Michelle", "Joshua", "Dorothy", "Kevin", "Carol", "Brian", "Amanda", "George", "Melissa", "Edward", "Deborah"]
 middle_names = ["Alexander", "Marie", "William", "Elizabeth", "James", "Anne", "Joseph", "Grace", "Michael", "Rose", "David", "Lynn", "Robert", "Mae", "Thomas", "Jane", "Charles", "Louise", "Daniel", "Ruth", "Richard", "Ellen", "John", "Catherine"]
@@ -76,13 +110,11 @@ marital_statuses = ["Single", "Married", "Divorced", "Widowed"]
 genders = ["Male", "Female", "Non-Binary"]
 email_domains = ["gmail.com", "yahoo.com", "hotmail.com", "outlook.com"]
 
-# Generate CSV header
-csv_data = "Employee_Number,First_Name,Middle_Name,Last_Name,Date_of_Birth,Gender,Marital_Status,SSN,Drivers_License,Start_Date,Address,City,State,Zip_Code,Phone_Number,Email\n"
-
-# Generate unique employee numbers
-employee_numbers = set()
-while len(employee_numbers) < 50:
-    employee_numbers.add(generate_employee_number())
+CSV_HEADER = ["Employee_Number", "First_Name", "Middle_Name", "Last_Name", "Date_of_Birth", "Gender", "Marital_Status", "SSN", "Drivers_License", "Start_Date", "Address", "City", "State", "Zip_Code", "Phone_Number", "Email"]
+EMPLOYEE_NUMBER_SPACE = 26 * 26 * 10**6
+SSN_SPACE = 900 * 90 * 9000
+DRIVERS_LICENSE_SPACE = 900 * 26 * 10 * 26 * 10 * 26
+SHARD_SIZE = 100000
 
 # Calculate date ranges
 today = datetime(2024, 10, 26)  # Current date from system parameters
@@ -91,29 +123,248 @@ latest_birth_date = today - timedelta(days=365*18)  # 18 years ago
 start_date_begin = datetime(2024, 1, 1)
 start_date_end = datetime(2024, 10, 26)
 
-# Generate 50 employee profiles
-for emp_num in employee_numbers:
-    first_name = random.choice(first_names)
-    middle_name = random.choice(middle_names)
-    last_name = random.choice(last_names)
-    dob = random_date(earliest_birth_date, latest_birth_date).strftime("%Y-%m-%d")
-    gender = random.choice(genders)
-    marital_status = random.choice(marital_statuses)
-    ssn = generate_ssn()
-    dl = generate_drivers_license()
-    start_date = random_date(start_date_begin, start_date_end).strftime("%Y-%m-%d")
-    street_num = random.randint(100, 9999)
-    street = random.choice(streets)
-    city = random.choice(cities)
-    state = random.choice(states)
-    zip_code = random.randint(10000, 99999)
-    phone_area = random.randint(200, 999)
-    phone_prefix = random.randint(200, 999)
-    phone_suffix = random.randint(1000, 9999)
-    email = f"{first_name.lower()}.{last_name.lower()}@{random.choice(email_domains)}"
-    
-    # Create CSV row
-    csv_row = f"{emp_num},{first_name},{middle_name},{last_name},{dob},{gender},{marital_status},{ssn},{dl},{start_date},{street_num} {street},{city},{state},{zip_code},{phone_area}-{phone_prefix}-{phone_suffix},{email}\n"
-    csv_data += csv_row
-
-print(csv_data)
+# Lookup tables for the columnar generator, built on first use
+_tables = {}
+
+def _date_strings(start_date, end_date):
+    # Every date in [start_date, end_date), formatted once
+    return [(start_date + timedelta(days=d)).strftime("%Y-%m-%d") for d in range((end_date - start_date).days)]
+
+def _number_strings(low, high):
+    # Cached string forms of range(low, high) so batches skip int formatting
+    key = (low, high)
+    if key not in _tables:
+        _tables[key] = [str(n) for n in range(low, high)]
+    return _tables[key]
+
+def _get_tables():
+    if "birth_dates" not in _tables:
+        _tables["birth_dates"] = _date_strings(earliest_birth_date, latest_birth_date)
+        _tables["start_dates"] = _date_strings(start_date_begin, start_date_end)
+        _tables["first_lower"] = {name: name.lower() for name in first_names}
+        _tables["last_lower"] = {name: name.lower() for name in last_names}
+    return _tables
+
+class IdPermutation:
+    """Keyed bijection of range(size) onto itself (format-preserving shuffle)"""
+
+    ROUNDS = 4
+
+    def __init__(self, size, key):
+        self.size = size
+        # Balanced Feistel network over the smallest even bit width that
+        # covers size; values that land outside range(size) are walked
+        # through the network again until they fall inside it
+        self.half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+        self.half_mask = (1 << self.half_bits) - 1
+        digest = hashlib.blake2b(key.encode(), digest_size=4 * self.ROUNDS).digest()
+        self.round_keys = [int.from_bytes(digest[i:i + 4], "big") for i in range(0, len(digest), 4)]
+
+    def __call__(self, index):
+        if not 0 <= index < self.size:
+            raise ValueError(f"Index {index} outside the ID space of {self.size}")
+        bits, mask, keys = self.half_bits, self.half_mask, self.round_keys
+        value = index
+        while True:
+            left, right = value >> bits, value & mask
+            for key in keys:
+                h = ((right + key) * 0x9E3779B1) & 0xFFFFFFFF
+                left, right = right, left ^ ((h ^ (h >> 16)) & mask)
+            value = (left << bits) | right
+            if value < self.size:
+                return value
+
+class UniqueIdAllocator:
+    """Hands out unique employee numbers, SSNs and driver's licenses by index"""
+
+    def __init__(self, seed=0):
+        # Every ID type gets its own keyed permutation. Index n always maps
+        # to the same IDs, so shards that own disjoint index ranges can never
+        # collide and need no shared state.
+        self._employee = IdPermutation(EMPLOYEE_NUMBER_SPACE, f"{seed}:employee_number")
+        self._ssn = IdPermutation(SSN_SPACE, f"{seed}:ssn")
+        self._license = IdPermutation(DRIVERS_LICENSE_SPACE, f"{seed}:drivers_license")
+
+    def employee_number(self, index):
+        """XX000000, two uppercase letters and six digits"""
+        letters, digits = divmod(self._employee(index), 10**6)
+        first, second = divmod(letters, 26)
+        return f"{string.ascii_uppercase[first]}{string.ascii_uppercase[second]}{digits:06d}"
+
+    def ssn(self, index):
+        """AAA-GG-SSSS with area 100-999, group 10-99 and serial 1000-9999"""
+        value, serial = divmod(self._ssn(index), 9000)
+        area, group = divmod(value, 90)
+        return f"{area + 100}-{group + 10}-{serial + 1000}"
+
+    def drivers_license(self, index):
+        """WDL000A0A0A, three digits from 100-999 then letter/digit pairs"""
+        value = self._license(index)
+        value, l3 = divmod(value, 26)
+        value, d2 = divmod(value, 10)
+        value, l2 = divmod(value, 26)
+        value, d1 = divmod(value, 10)
+        number, l1 = divmod(value, 26)
+        upper = string.ascii_uppercase
+        return f"WDL{number + 100}{upper[l1]}{d1}{upper[l2]}{d2}{upper[l3]}"
+
+# Generate a batch of employee profiles one column at a time. Each field
+# is drawn for the whole batch with a single random.choices() call.
+def generate_columns(rng, first_index, count, ids):
+    tables = _get_tables()
+    indexes = range(first_index, first_index + count)
+    choices = rng.choices
+
+    def numbers(low, high):
+        return choices(_number_strings(low, high), k=count)
+
+    first = choices(first_names, k=count)
+    last = choices(last_names, k=count)
+    first_lower = tables["first_lower"]
+    last_lower = tables["last_lower"]
+
+    return {
+        "Employee_Number": list(map(ids.employee_number, indexes)),
+        "First_Name": first,
+        "Middle_Name": choices(middle_names, k=count),
+        "Last_Name": last,
+        "Date_of_Birth": choices(tables["birth_dates"], k=count),
+        "Gender": choices(genders, k=count),
+        "Marital_Status": choices(marital_statuses, k=count),
+        "SSN": list(map(ids.ssn, indexes)),
+        "Drivers_License": list(map(ids.drivers_license, indexes)),
+        "Start_Date": choices(tables["start_dates"], k=count),
+        "Address": list(map("{} {}".format, numbers(100, 10000), choices(streets, k=count))),
+        "City": choices(cities, k=count),
+        "State": choices(states, k=count),
+        "Zip_Code": numbers(10000, 100000),
+        "Phone_Number": list(map("{}-{}-{}".format, numbers(200, 1000), numbers(200, 1000), numbers(1000, 10000))),
+        "Email": [f"{first_lower[f]}.{last_lower[l]}@{d}" for f, l, d in zip(first, last, choices(email_domains, k=count))],
+    }
+
+# Worker: generate one shard. Shard n always uses the same random stream
+# for a given seed, so output is reproducible for any number of workers.
+def generate_shard(job):
+    seed, shard, first_index, count, output_format = job
+    rng = random.Random(seed * 1000003 + shard)
+    columns = generate_columns(rng, first_index, count, UniqueIdAllocator(seed))
+    if output_format == "parquet":
+        return columns
+    # Rendered to one string in the worker, so the parent only writes it out
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(zip(*columns.values()))
+    return buffer.getvalue()
+
+def _shard_jobs(count, seed, shard_size, output_format):
+    for shard, first_index in enumerate(range(0, count, shard_size)):
+        yield (seed, shard, first_index, min(shard_size, count - first_index), output_format)
+
+def _run_shards(count, seed, workers, shard_size, output_format):
+    # Yield shard results in order, generated in-process or on a pool
+    jobs = _shard_jobs(count, seed, shard_size, output_format)
+    if workers <= 1:
+        yield from map(generate_shard, jobs)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Keep a bounded number of shards in flight so memory stays flat
+        pending = deque()
+        for job in jobs:
+            pending.append(pool.submit(generate_shard, job))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+# Write count employee profiles to out as CSV
+def write_employees(out, count, seed=0, workers=1, shard_size=SHARD_SIZE):
+    if count > EMPLOYEE_NUMBER_SPACE:
+        raise ValueError(f"At most {EMPLOYEE_NUMBER_SPACE} unique employee numbers exist")
+    csv.writer(out, lineterminator="\n").writerow(CSV_HEADER)
+    for text in _run_shards(count, seed, workers, shard_size, "csv"):
+        out.write(text)
+
+# Write count employee profiles to a Parquet file, one row group per shard
+def write_employees_parquet(path, count, seed=0, workers=1, shard_size=SHARD_SIZE):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if count > EMPLOYEE_NUMBER_SPACE:
+        raise ValueError(f"At most {EMPLOYEE_NUMBER_SPACE} unique employee numbers exist")
+    writer = None
+    try:
+        for columns in _run_shards(count, seed, workers, shard_size, "parquet"):
+            table = pa.table(columns)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+def positive_int(text):
+    # argparse type for counts and sizes that must be at least 1
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {text}")
+    return value
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate synthetic employee data as CSV or Parquet"
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=50,
+        help="Number of employees to generate (default: 50)"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Random seed for reproducible output"
+    )
+    parser.add_argument(
+        "--output",
+        help="Output file (default: stdout)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["csv", "parquet"],
+        default="csv",
+        help="Output format (default: csv). parquet requires --output and pyarrow"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes (default: 1)"
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=positive_int,
+        default=SHARD_SIZE,
+        help=f"Rows per shard (default: {SHARD_SIZE})"
+    )
+    args = parser.parse_args()
+
+    seed = args.seed if args.seed is not None else random.randrange(EMPLOYEE_NUMBER_SPACE)
+
+    if args.format == "parquet":
+        if not args.output:
+            print("Error: --format parquet requires --output")
+            return
+        try:
+            write_employees_parquet(args.output, args.count, seed, args.workers, args.shard_size)
+        except ImportError:
+            print("Error: --format parquet requires the pyarrow package")
+        return
+
+    if args.output:
+        with open(args.output, "w", newline="", buffering=1 << 20) as out:
+            write_employees(out, args.count, seed, args.workers, args.shard_size)
+    else:
+        write_employees(sys.stdout, args.count, seed, args.workers, args.shard_size)
+
+if __name__ == "__main__":
+    main()
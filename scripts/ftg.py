@@ -6,26 +6,77 @@ Purpose:        Generates a visual tree structure of a directory and its
                 contents, similar to the Unix 'tree' command.
 
 How to run:     python ftg.py [path] [--exclude dir1 dir2 ...]
+                            [--workers N] [--queue-depth N]
+                            [--max-depth N] [--max-entries N]
+                            [--snapshot FILE] [--sizes]
+                            [--sort-by {name,size}] [--top N]
+                python ftg.py --diff OLD_SNAPSHOT NEW_SNAPSHOT
                 Example: python ftg.py /var/www/project
+                         python ftg.py /mnt/nfs/share --workers 32
+                         python ftg.py /var/spool --max-depth 3 --max-entries 50
+                         python ftg.py /srv/data --snapshot data.snap
+                         python ftg.py --diff monday.snap data.snap
+                         python ftg.py /home --sizes --sort-by size --top 20
 
 Dependencies:   Python 3.6+
                 - os
                 - argparse
-                - pathlib
+                - concurrent.futures
+                - sqlite3
 
 Author:         Tom Kinsella
 Email:          tkinsella@sisng.io
 Organization:   Personal Project
 
 Creation Date:  2024-11-13
-Last Updated:   2024-11-13
-Version:        1.0.0
+Last Updated:   2026-10-18
+Version:        1.5.1
 
 Change History:
     1.0.0 (2024-11-13) - Initial release
         - Basic directory tree generation
         - Support for exclusion lists
         - Permission handling
+    1.1.0 (2026-10-18) - Parallel directory scanning
+        - Directory listings are fetched on a thread pool ahead of the
+          printer, so slow scandir/stat calls overlap on network mounts
+        - Output order is unchanged: the printer still walks the tree in
+          sorted order and waits for each listing it needs
+        - --workers and --queue-depth options (--workers 0 scans inline)
+    1.2.0 (2026-10-18) - Bounded rendering
+        - Tree is rendered by a generator with an explicit stack, so deep
+          trees no longer hit the recursion limit
+        - --max-depth stops descending below the given depth
+        - --max-entries shows at most N entries per directory followed by
+          a "… N more" line; only the first N sorted names are kept while
+          a directory is read
+    1.3.0 (2026-10-18) - Snapshot cache
+        - --snapshot FILE keeps every directory listing in a SQLite file
+          keyed by path and signature (device, inode, mtime, ctime); later
+          runs stat each directory and rescan only the changed ones
+        - --diff OLD NEW prints entries added (+) and removed (-) between
+          two snapshot files
+    1.4.0 (2026-10-18) - Sizes
+        - --sizes labels entries with on-disk size and directories with
+          their file count, totalled in the same scandir pass that reads
+          the listings (du-style, no second walk)
+        - Apparent and on-disk bytes per subtree; hardlinked files are
+          counted once via an (st_dev, st_ino) set
+        - --sort-by size lists the heaviest entries first
+        - --top N prints the N heaviest subtrees after the tree
+    1.5.0 (2026-10-18) - Startup time
+        - concurrent.futures and sqlite3 are imported only when the thread
+          pool or a snapshot is used; unused pathlib import removed
+        - Available as "tools.py tree"
+    1.5.1 (2026-10-18) - Fixes
+        - --max-depth 0 prints only the root path again, without the
+          root's own name repeated as a child line
+        - --sizes no longer aborts when a directory or file disappears or
+          becomes unreadable during the scan; the directory is shown as
+          an error or [Permission Denied] like in the other modes
+        - An entry whose own stat fails with an error other than "not
+          found" (EACCES, EIO, ...) stays in the tree with no bytes
+          counted instead of ending the scan of its directory
 
 MIT License
                 Copyright (c) 2024 Tom Kinsella
@@ -34,13 +85,32 @@ MIT License
 Notes:
     - Requires appropriate permissions to access directories
     - Use sudo for system directories
+    - --queue-depth caps how many listings are fetched ahead, and so how
+      many are held in memory at once
+    - With --max-entries, memory is bounded by tree depth times the entry
+      cap (plus prefetched listings), not by the size of any directory
+    - With --snapshot, changed directories are scanned inline (--workers is
+      ignored) and listings are stored uncapped, so a later run can use a
+      different --max-entries. A snapshot is updated in place; copy it
+      before a run to keep the old state for --diff
+    - --sizes, --sort-by size and --top scan the whole tree before
+      printing (a directory's total needs all of its subtree), so they
+      hold every listing in memory and ignore --workers and --snapshot.
+      Like du, symlinked directories are listed but not followed and count
+      only the size of the link itself
+    - Directories modified within a second of being scanned are stored as
+      stale and rescanned on the next run, so changes made in the same
+      timestamp tick are not missed
 =============================================================================
 """
 import os
 import argparse
 import stat
-from pathlib import Path
-from typing import List
+import time
+import heapq
+from typing import List, Optional
+
+DEFAULT_EXCLUDES = [".git", "node_modules", "__pycache__"]
 
 def has_directory_access(path):
    # Check if we have read and execute permissions for the directory.
@@ -49,52 +119,460 @@ def has_directory_access(path):
     except Exception:
         return False
 
-def generate_tree(
+def _keep_smallest(items, limit):
+    # Trim a list of sort keys to its limit smallest once it doubles, so it
+    # never holds more than 2 * limit items while a directory is read
+    if limit is not None and len(items) > 2 * limit:
+        items.sort()
+        del items[limit:]
+
+def list_directory(directory: str, exclude_dirs: List[str], max_entries: Optional[int] = None):
+    # Read and sort one directory. Returns ("ok", directory paths, file names,
+    # entries left out by max_entries), ("denied", None, None, 0) or
+    # ("error", message, None, 0).
+    if not has_directory_access(directory):
+        return ("denied", None, None, 0)
+    try:
+        # Separate directories and files, keyed by lowercase name; the scan
+        # position keeps the sort stable for names differing only in case
+        directories, files = [], []
+        total = 0
+        with os.scandir(directory) as scanner:
+            for position, entry in enumerate(scanner):
+                if entry.name in exclude_dirs:
+                    continue
+                if entry.is_dir():
+                    directories.append((entry.name.lower(), position, entry.path))
+                    _keep_smallest(directories, max_entries)
+                elif entry.is_file():
+                    files.append((entry.name.lower(), position, entry.name))
+                    _keep_smallest(files, max_entries)
+                else:
+                    continue
+                total += 1
+
+        # Sort directories and files, directories first within the cap
+        directories.sort()
+        files.sort()
+        if max_entries is not None:
+            del directories[max_entries:]
+            del files[max_entries - len(directories):]
+        omitted = total - len(directories) - len(files)
+        return ("ok", [d[2] for d in directories], [f[2] for f in files], omitted)
+    except PermissionError:
+        return ("denied", None, None, 0)
+    except Exception as e:
+        return ("error", str(e), None, 0)
+
+class DirectoryPrefetcher:
+    """Fetches directory listings on a thread pool ahead of the printer"""
+
+    def __init__(self, exclude_dirs: List[str], workers: int = 8, queue_depth: int = 256,
+                 max_entries: Optional[int] = None):
+        self.exclude_dirs = exclude_dirs
+        self.queue_depth = queue_depth
+        self.max_entries = max_entries
+        # Imported here so runs without a thread pool start faster
+        from concurrent.futures import ThreadPoolExecutor
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._pending = {}
+
+    def _submit(self, path):
+        return self._pool.submit(list_directory, path, self.exclude_dirs, self.max_entries)
+
+    def get(self, directory: str, prefetch: bool = True):
+        """Return the listing of directory, then queue its subdirectories
+        unless prefetch is False (they will not be expanded)"""
+        future = self._pending.pop(directory, None) or self._submit(directory)
+        listing = future.result()
+        if prefetch and listing[0] == "ok":
+            # Subdirectories are queued in print order, so the next ones the
+            # printer needs are fetched first
+            for path in listing[1]:
+                if len(self._pending) >= self.queue_depth:
+                    break
+                if path not in self._pending:
+                    self._pending[path] = self._submit(path)
+        return listing
+
+    def close(self):
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        self._pool.shutdown(wait=True)
+
+SNAPSHOT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS directories (
+    path TEXT PRIMARY KEY,
+    device INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    ctime_ns INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    dirs TEXT NOT NULL,
+    files TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Directories changed this close to their scan may change again within the
+# same timestamp tick, so their signature cannot be trusted on the next run
+RACY_WINDOW_NS = 1_000_000_000
+
+def _split_names(text):
+    # Names are stored NUL-separated; NUL cannot appear in a file name
+    return text.split('\0') if text else []
+
+class TreeSnapshot:
+    """Directory listing cache persisted in a SQLite file"""
+
+    def __init__(self, db_path: str, root: str, exclude_dirs: List[str],
+                 max_entries: Optional[int] = None):
+        self.exclude_dirs = exclude_dirs
+        self.max_entries = max_entries
+        self.hits = self.misses = 0
+        import sqlite3
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(SNAPSHOT_SCHEMA)
+
+        # Listings depend on the exclude list; drop them if it changed
+        meta = dict(self.conn.execute('SELECT key, value FROM meta'))
+        excludes = '\0'.join(sorted(exclude_dirs))
+        if meta.get('excludes', excludes) != excludes:
+            self.conn.execute('DELETE FROM directories')
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+            (('root', root), ('excludes', excludes))
+        )
+
+    def _cap(self, directories, files):
+        if self.max_entries is None:
+            return ("ok", directories, files, 0)
+        shown_dirs = directories[:self.max_entries]
+        shown_files = files[:self.max_entries - len(shown_dirs)]
+        omitted = len(directories) + len(files) - len(shown_dirs) - len(shown_files)
+        return ("ok", shown_dirs, shown_files, omitted)
+
+    def _forget_below(self, directory, names):
+        # Drop the cached subtrees of subdirectories that no longer exist
+        for name in names:
+            path = os.path.join(directory, name)
+            self.conn.execute(
+                'DELETE FROM directories WHERE path = ? OR (path >= ? AND path < ?)',
+                (path, path + '/', path + '0')
+            )
+
+    def get(self, directory: str, prefetch: bool = True):
+        """Lister: return the listing of directory, rescanning it only if
+        its signature differs from the cached one"""
+        try:
+            st = os.stat(directory)
+        except OSError:
+            return list_directory(directory, self.exclude_dirs, self.max_entries)
+        signature = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_ctime_ns)
+
+        row = self.conn.execute(
+            'SELECT device, inode, mtime_ns, ctime_ns, status, dirs, files '
+            'FROM directories WHERE path = ?', (directory,)
+        ).fetchone()
+        if row is not None and row[:4] == signature:
+            self.hits += 1
+            if row[4] != "ok":
+                return (row[4], None, None, 0)
+            names = _split_names(row[5])
+            return self._cap([os.path.join(directory, n) for n in names], _split_names(row[6]))
+
+        self.misses += 1
+        scanned_ns = time.time_ns()
+        status, directories, files, _ = list_directory(directory, self.exclude_dirs)
+        if status == "error":
+            return (status, directories, None, 0)
+
+        names = [os.path.basename(p) for p in directories] if status == "ok" else []
+        if row is not None and row[4] == "ok":
+            self._forget_below(directory, set(_split_names(row[5])) - set(names))
+        if max(st.st_mtime_ns, st.st_ctime_ns) >= scanned_ns - RACY_WINDOW_NS:
+            signature = signature[:2] + (-1, -1)
+        self.conn.execute(
+            'INSERT OR REPLACE INTO directories VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (directory, *signature, status, '\0'.join(names), '\0'.join(files or []))
+        )
+        if status != "ok":
+            return (status, None, None, 0)
+        return self._cap(directories, files)
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+def _iter_snapshot(db_path):
+    # Yield (path relative to the snapshot root, dir names, file names) in
+    # path order
+    import sqlite3
+    conn = sqlite3.connect(db_path)
+    try:
+        root = dict(conn.execute('SELECT key, value FROM meta')).get('root', '')
+        rows = conn.execute('SELECT path, status, dirs, files FROM directories ORDER BY path')
+        for path, status, dirs, files in rows:
+            relative = path[len(root):].lstrip('/') if path.startswith(root) else path
+            yield relative, set(_split_names(dirs)), set(_split_names(files))
+    finally:
+        conn.close()
+
+def diff_snapshots(old_path: str, new_path: str):
+    """Yield ("+" or "-", relative path, is_dir) for every entry added or
+    removed between two snapshots, merging both in path order"""
+    def changes(marker, directory, dirs, files):
+        entries = [(name, True) for name in dirs] + [(name, False) for name in files]
+        for name, is_dir in sorted(entries):
+            yield marker, os.path.join(directory, name), is_dir
+
+    done = (None, set(), set())
+    old_rows, new_rows = _iter_snapshot(old_path), _iter_snapshot(new_path)
+    old, new = next(old_rows, done), next(new_rows, done)
+    while old is not done or new is not done:
+        if new is done or (old is not done and old[0] < new[0]):
+            # Directory only in the old snapshot: all of its entries are gone
+            yield from changes("-", *old)
+            old = next(old_rows, done)
+        elif old is done or new[0] < old[0]:
+            yield from changes("+", *new)
+            new = next(new_rows, done)
+        else:
+            directory = new[0]
+            yield from changes("-", directory, old[1] - new[1], old[2] - new[2])
+            yield from changes("+", directory, new[1] - old[1], new[2] - old[2])
+            old, new = next(old_rows, done), next(new_rows, done)
+
+def human_size(size):
+    # Format a byte count the way tree -h does (4.0K, 12.5M, ...)
+    for unit in "BKMGTP":
+        if size < 1024 or unit == "P":
+            return f"{size}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+
+def _entry_bytes(st, seen):
+    # (apparent, on-disk) bytes of a stat result (None when it could not be
+    # read); a hardlinked file counts only the first time its (st_dev,
+    # st_ino) is seen
+    if st is None:
+        return 0, 0
+    if st.st_nlink > 1 and not stat.S_ISDIR(st.st_mode):
+        key = (st.st_dev, st.st_ino)
+        if key in seen:
+            return 0, 0
+        seen.add(key)
+    return st.st_size, st.st_blocks * 512
+
+class SizeIndex:
+    """Listings and per-subtree totals of a whole tree, read in one pass"""
+
+    def __init__(self, root: str, exclude_dirs: List[str], sort_by: str = "name",
+                 max_entries: Optional[int] = None):
+        self.exclude_dirs = exclude_dirs
+        self.sort_by = sort_by
+        self.max_entries = max_entries
+        self.listings = {}   # directory -> (status, dir paths or message, file names)
+        self.sizes = {}      # path -> [files, apparent bytes, on-disk bytes]
+        self._scan(root)
+
+    def _scan_directory(self, directory, seen):
+        # Read one directory, recording the size of every file and symlinked
+        # directory from the DirEntry stat. Returns the real subdirectories.
+        sizes = self.sizes
+        try:
+            sizes[directory] = [0, *_entry_bytes(os.stat(directory), seen)]
+        except PermissionError:
+            sizes[directory] = [0, 0, 0]
+            self.listings[directory] = ("denied", None, None)
+            return []
+        except OSError as e:
+            # Removed or replaced since its parent was read
+            sizes[directory] = [0, 0, 0]
+            self.listings[directory] = ("error", str(e), None)
+            return []
+        if not has_directory_access(directory):
+            self.listings[directory] = ("denied", None, None)
+            return []
+        try:
+            directories, files, descend = [], [], []
+            with os.scandir(directory) as scanner:
+                for position, entry in enumerate(scanner):
+                    if entry.name in self.exclude_dirs:
+                        continue
+                    try:
+                        entry_stat = entry.stat(follow_symlinks=False)
+                    except FileNotFoundError:
+                        # Deleted while the directory was being read
+                        continue
+                    except OSError:
+                        # Unreadable metadata (EACCES, I/O errors, ...): keep
+                        # the entry in the tree but count no bytes for it
+                        entry_stat = None
+                    if entry.is_dir():
+                        directories.append((entry.name.lower(), position, entry.path))
+                        if entry.is_symlink():
+                            sizes[entry.path] = [0, *_entry_bytes(entry_stat, seen)]
+                            self.listings[entry.path] = ("ok", [], [])
+                        else:
+                            descend.append(entry.path)
+                    elif entry.is_file():
+                        files.append((entry.name.lower(), position, entry.name))
+                        sizes[entry.path] = [1, *_entry_bytes(entry_stat, seen)]
+                    else:
+                        # Not shown in the tree (dangling links, sockets, ...)
+                        # but still part of the directory total, as in du
+                        apparent, disk = _entry_bytes(entry_stat, seen)
+                        sizes[directory][1] += apparent
+                        sizes[directory][2] += disk
+            directories.sort()
+            files.sort()
+            self.listings[directory] = ("ok", [d[2] for d in directories], [f[2] for f in files])
+            return descend
+        except PermissionError:
+            self.listings[directory] = ("denied", None, None)
+        except Exception as e:
+            self.listings[directory] = ("error", str(e), None)
+        return []
+
+    def _scan(self, root):
+        seen = set()
+        order = []
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            order.append(directory)
+            stack.extend(reversed(self._scan_directory(directory, seen)))
+
+        # Every directory comes after its parent in order, so walking it
+        # backwards adds each subtree into its parent once it is complete
+        sizes = self.sizes
+        for directory in reversed(order):
+            status, directories, files = self.listings[directory]
+            if status != "ok":
+                continue
+            total = sizes[directory]
+            for path in directories + [os.path.join(directory, name) for name in files]:
+                child = sizes[path]
+                total[0] += child[0]
+                total[1] += child[1]
+                total[2] += child[2]
+
+    def get(self, directory: str, prefetch: bool = True):
+        """Lister: return the scanned listing of directory"""
+        status, directories, files = self.listings[directory]
+        if status != "ok":
+            return (status, directories, None, 0)
+        if self.sort_by == "size":
+            # Stable sort keeps name order between entries of equal size
+            directories = sorted(directories, key=lambda p: -self.sizes[p][2])
+            files = sorted(files, key=lambda n: -self.sizes[os.path.join(directory, n)][2])
+        if self.max_entries is None:
+            return ("ok", directories, files, 0)
+        shown_dirs = directories[:self.max_entries]
+        shown_files = files[:self.max_entries - len(shown_dirs)]
+        return ("ok", shown_dirs, shown_files, len(directories) + len(files) - len(shown_dirs) - len(shown_files))
+
+    def describe(self, path: str, is_dir: bool) -> str:
+        """Size label printed before an entry name"""
+        files, _, disk = self.sizes[path]
+        if is_dir:
+            return f"[{human_size(disk)}, {files:,} files] "
+        return f"[{human_size(disk)}] "
+
+    def heaviest(self, count: int, root: str):
+        """Return the count heaviest subtrees below root as (path, files,
+        apparent, on-disk) tuples, largest on-disk size first"""
+        subtrees = (
+            (path, *self.sizes[path]) for path, listing in self.listings.items()
+            if path != root and listing[1] is not None and not os.path.islink(path)
+        )
+        return heapq.nlargest(count, subtrees, key=lambda item: item[3])
+
+def iter_tree(
     directory: str,
+    exclude_dirs: List[str] = DEFAULT_EXCLUDES,
+    max_depth: Optional[int] = None,
+    max_entries: Optional[int] = None,
+    lister=None,
     prefix: str = "",
     is_last: bool = True,
-    exclude_dirs: List[str] = [".git", "node_modules", "__pycache__"],
-    is_root: bool = False
-) -> None:  # Recursively generate and print a tree structure for the given directory.
-    if not has_directory_access(directory):
-        print(f"{prefix}{'└── ' if is_last else '├── '}[Permission Denied] {os.path.basename(directory)}/")
-        return
+    is_root: bool = True,
+    describe=None
+):  # Yield the lines of the tree for directory, without recursion.
+    if lister is None:
+        lister = lambda path, prefetch=True: list_directory(path, exclude_dirs, max_entries)
+
+    def expands(depth):
+        return max_depth is None or depth < max_depth
+
+    def enter(path, prefix, is_last, is_root, depth):
+        # Returns (line to print or None, stack frame or None)
+        connector = '└── ' if is_last else '├── '
+        name = os.path.basename(path)
+        if describe is not None and not is_root:
+            name = describe(path, True) + name
+        if not expands(depth):
+            # The root is already printed as the header
+            return (None if is_root else f"{prefix}{connector}{name}/"), None
+
+        status, directories, files, omitted = lister(path, expands(depth + 1))
+        if status == "denied":
+            return f"{prefix}{connector}[Permission Denied] {name}/", None
+        if status == "error":
+            return f"{prefix}{connector}[Error: {directories}] {name}/", None
 
-    try:
-        # Get all entries in the directory
-        entries = []
-        with os.scandir(directory) as scanner:
-            for entry in scanner:
-                if entry.name not in exclude_dirs:
-                    entries.append(entry)
-        
-        # Separate and sort directories and files
-        directories = sorted([e for e in entries if e.is_dir()], key=lambda x: x.name.lower())
-        files = sorted([e for e in entries if e.is_file()], key=lambda x: x.name.lower())
-        
-        # Print current directory if it's not the root
-        if not is_root:
-            print(f"{prefix}{'└── ' if is_last else '├── '}{os.path.basename(directory)}/")
-            
         # Calculate new prefix for children
-        new_prefix = prefix
-        if not is_root:
-            new_prefix = prefix + ("    " if is_last else "│   ")
-        
-        # Process directories
-        for i, entry in enumerate(directories):
-            is_last_dir = (i == len(directories) - 1) and not files
-            generate_tree(entry.path, new_prefix, is_last_dir, exclude_dirs, False)
-        
+        child_prefix = prefix if is_root else prefix + ("    " if is_last else "│   ")
+        line = None if is_root else f"{prefix}{connector}{name}/"
+        return line, [child_prefix, directories, files, omitted, depth, 0, path]
+
+    line, frame = enter(directory, prefix, is_last, is_root, 0)
+    if line is not None:
+        yield line
+    stack = [frame] if frame else []
+
+    while stack:
+        frame = stack[-1]
+        child_prefix, directories, files, omitted, depth, index, path = frame
+
+        # Process directories, one per pass so the stack can grow
+        if index < len(directories):
+            frame[5] += 1
+            is_last_dir = (index == len(directories) - 1) and not files and not omitted
+            line, child = enter(directories[index], child_prefix, is_last_dir, False, depth + 1)
+            if line is not None:
+                yield line
+            if child:
+                stack.append(child)
+            continue
+
         # Process files
-        for i, entry in enumerate(files):
-            is_last_file = i == len(files) - 1
-            print(f"{new_prefix}{'└── ' if is_last_file else '├── '}{entry.name}")
-            
-    except PermissionError:
-        print(f"{prefix}{'└── ' if is_last else '├── '}[Permission Denied] {os.path.basename(directory)}/")
-    except Exception as e:
-        print(f"{prefix}{'└── ' if is_last else '├── '}[Error: {str(e)}] {os.path.basename(directory)}/")
+        for i, name in enumerate(files):
+            is_last_file = i == len(files) - 1 and not omitted
+            if describe is not None:
+                name = describe(os.path.join(path, name), False) + name
+            yield f"{child_prefix}{'└── ' if is_last_file else '├── '}{name}"
+        if omitted:
+            yield f"{child_prefix}└── … {omitted} more"
+        stack.pop()
+
+def generate_tree(
+    directory: str,
+    prefix: str = "",
+    is_last: bool = True,
+    exclude_dirs: List[str] = DEFAULT_EXCLUDES,
+    is_root: bool = False,
+    lister=None,
+    max_depth: Optional[int] = None,
+    max_entries: Optional[int] = None,
+    describe=None
+) -> None:  # Generate and print a tree structure for the given directory.
+    for line in iter_tree(directory, exclude_dirs, max_depth, max_entries, lister, prefix, is_last, is_root, describe):
+        print(line)
 
 def main():
     parser = argparse.ArgumentParser(
@@ -109,11 +587,71 @@ def main():
     parser.add_argument(
         "--exclude",
         nargs="*",
-        default=[".git", "node_modules", "__pycache__"],
+        default=DEFAULT_EXCLUDES,
         help="Directories to exclude (default: .git node_modules __pycache__)"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Threads fetching directory listings (default: 8, 0 to scan inline)"
+    )
+    parser.add_argument(
+        "--queue-depth",
+        type=int,
+        default=256,
+        help="Maximum directory listings fetched ahead of the output (default: 256)"
+    )
+    parser.add_argument(
+        "--max-depth",
+        type=int,
+        help="Do not descend more than N levels below the path"
+    )
+    parser.add_argument(
+        "--max-entries",
+        type=int,
+        help="Show at most N entries per directory, then a '… N more' line"
+    )
+    parser.add_argument(
+        "--snapshot",
+        metavar="FILE",
+        help="Cache directory listings in FILE and rescan only changed directories"
+    )
+    parser.add_argument(
+        "--sizes",
+        action="store_true",
+        help="Show on-disk sizes and file counts (du-style, hardlinks counted once)"
+    )
+    parser.add_argument(
+        "--sort-by",
+        choices=["name", "size"],
+        default="name",
+        help="Order entries by name or by size, largest first (default: name)"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        metavar="N",
+        help="After the tree, list the N heaviest subtrees"
+    )
+    parser.add_argument(
+        "--diff",
+        nargs=2,
+        metavar=("OLD", "NEW"),
+        help="Print entries added and removed between two snapshot files"
+    )
     
     args = parser.parse_args()
+
+    if args.diff:
+        for snapshot in args.diff:
+            if not os.path.isfile(snapshot):
+                print(f"Error: Snapshot '{snapshot}' does not exist")
+                return
+        for marker, relative, is_dir in diff_snapshots(*args.diff):
+            print(f"{marker} {relative}{'/' if is_dir else ''}")
+        return
+
     path = os.path.abspath(args.path)
     
     if not os.path.exists(path):
@@ -128,7 +666,36 @@ def main():
     print(path)
     
     # Start generating the tree with empty prefix for root
-    generate_tree(path, "", True, args.exclude, True)
+    if args.sizes or args.sort_by == "size" or args.top:
+        index = SizeIndex(path, args.exclude, args.sort_by, args.max_entries)
+        describe = index.describe if args.sizes else None
+        generate_tree(path, "", True, args.exclude, True, index.get, args.max_depth, args.max_entries, describe)
+        files, apparent, disk = index.sizes[path]
+        if args.sizes:
+            print(f"\n{files:,} files, {human_size(apparent)} apparent, {human_size(disk)} on disk")
+        if args.top:
+            print(f"\nHeaviest {args.top} subtrees:")
+            for subtree, files, apparent, disk in index.heaviest(args.top, path):
+                print(f"{human_size(disk):>8} {human_size(apparent):>8} {files:>10,}  {subtree}")
+        return
+
+    if args.snapshot:
+        snapshot = TreeSnapshot(args.snapshot, path, args.exclude, args.max_entries)
+        try:
+            generate_tree(path, "", True, args.exclude, True, snapshot.get, args.max_depth, args.max_entries)
+        finally:
+            snapshot.close()
+        return
+
+    if args.workers <= 0:
+        generate_tree(path, "", True, args.exclude, True, None, args.max_depth, args.max_entries)
+        return
+
+    prefetcher = DirectoryPrefetcher(args.exclude, args.workers, args.queue_depth, args.max_entries)
+    try:
+        generate_tree(path, "", True, args.exclude, True, prefetcher.get, args.max_depth, args.max_entries)
+    finally:
+        prefetcher.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+=============================================================================
+File:           macLookup.py
+Purpose:        Identifies the vendor of a network interface from its MAC
+               address using a local copy of the IEEE registries. The
+               registry files are compiled once into a compact sorted index
+               that is memory-mapped for lookups, so no network access is
+               needed and bulk lookups over ARP/DHCP dumps run at memory
+               speed. Offline replacement for macLookup.sh.
+
+How to run:     python macLookup.py --compile oui.csv [mam.csv oui36.csv ...]
+               python macLookup.py [options] [MAC ...]
+               python macLookup.py [options] < arp_dump.txt
+               Options:
+                   -j, --json: Display JSON output (same shape as the
+                       macvendorlookup.com API used by macLookup.sh)
+                   --db FILE: Compiled index (default: oui.idx)
+                   --compile FILE [FILE ...]: Build the index from IEEE
+                       registry files (CSV or TXT; MA-L, MA-M, MA-S, IAB)
+                   --field N: In bulk mode, take the MAC from the Nth field
+                       (1-based) instead of the first MAC on the line
+                   --delimiter D: Field delimiter (default: whitespace for
+                       --field, "," for appended output)
+               Examples:
+                   python macLookup.py --compile oui.csv mam.csv oui36.csv
+                   python macLookup.py -j 00:50:56
+                   ip neigh | python macLookup.py > neighbours.csv
+
+Dependencies:   Python 3.6+
+               - argparse
+               - array
+               - bisect
+               - csv
+               - mmap
+               - struct
+               - IEEE registry files from https://standards.ieee.org
+                 (oui.csv, mam.csv, oui36.csv; only needed to compile)
+
+Author:         Tom Kinsella
+Email:          tkinsella@sisng.io
+Organization:   Personal Project
+
+Creation Date:  2026-10-18
+Last Updated:   2026-10-18
+Version:        1.0.1
+
+Change History:
+   1.0.0 (2026-10-18) - Initial release
+       - Compiles IEEE MA-L/MA-M/MA-S/IAB registries (CSV or TXT) into one
+         sorted index file with deduplicated vendor records
+       - Longest-prefix match (36, 28 then 24 bits) by binary search over
+         the memory-mapped index
+       - MAC arguments, interactive prompt, or a streaming stdin filter
+       - -j JSON output compatible with macLookup.sh
+   1.0.1 (2026-10-18) - Fixes
+       - Bulk output CSV-quotes the appended vendor when it contains the
+         delimiter, so names such as "VMware, Inc." stay one field; the
+         input line is written unchanged
+       - The little-endian index is byte-swapped on big-endian hosts
+         instead of being read in native byte order
+
+License:        MIT License
+               Copyright (c) 2024 Tom Kinsella
+               See LICENSE file for full license text
+
+Notes:
+   - Accepts XX:XX:XX:XX:XX:XX, XX-XX-..., XXXX.XXXX.XXXX and bare hex,
+     full addresses or prefixes of at least 6 hex digits. A prefix only
+     matches assignments it fully covers (a 6-digit prefix never matches
+     an MA-S block)
+   - When several registry files assign the same prefix, the later file
+     on the --compile command line wins
+   - Results are cached per OUI (per 36-bit prefix under OUIs split into
+     MA-M/MA-S blocks), so dumps with millions of entries from a few
+     thousand vendors cost one dictionary lookup each
+   - test_macLookup.py checks bulk tagging against a small compiled
+     registry (python -m unittest test_macLookup)
+=============================================================================
+"""
+
+import os
+import re
+import sys
+import csv
+import json
+import mmap
+import struct
+import argparse
+import itertools
+from array import array
+from bisect import bisect_left
+
+INDEX_MAGIC = b'OUIIDX1\0'
+HEADER = struct.Struct('<8s4I')          # magic, 3 table sizes, records offset
+RECORD = struct.Struct('<BHH')           # registry, company length, address length
+PREFIX_BITS = (36, 28, 24)               # most specific first
+REGISTRIES = ['MA-L', 'MA-M', 'MA-S', 'IAB', 'CID']
+CACHE_LIMIT = 1 << 20
+# The index is little-endian; big-endian hosts read byte-swapped copies
+NATIVE_LITTLE_ENDIAN = sys.byteorder == 'little'
+UINT32 = 'I' if array('I').itemsize == 4 else 'L'
+
+MAC_PATTERN = re.compile(
+    r'(?<![0-9A-Fa-f:.-])('
+    r'[0-9A-Fa-f]{2}(?:([:-])[0-9A-Fa-f]{2})(?:\2[0-9A-Fa-f]{2}){4}'
+    r'|[0-9A-Fa-f]{4}\.[0-9A-Fa-f]{4}\.[0-9A-Fa-f]{4}'
+    r')(?![0-9A-Fa-f])'
+)
+HEX_PATTERN = re.compile(r'[0-9A-Fa-f]{6,12}')
+SEPARATORS = str.maketrans('', '', ':-.')
+TXT_HEX_PATTERN = re.compile(r'^\s*([0-9A-Fa-f]{2}-[0-9A-Fa-f]{2}-[0-9A-Fa-f]{2})\s+\(hex\)\s*(.*)$')
+TXT_BASE16_PATTERN = re.compile(r'^\s*([0-9A-Fa-f]{6})(?:-([0-9A-Fa-f]{6}))?\s+\(base 16\)\s*(.*)$')
+
+def parse_mac(text):
+    # Return (48-bit value, significant hex digits) of a full MAC address or
+    # prefix. Raises ValueError.
+    digits = text.strip().translate(SEPARATORS)
+    if not HEX_PATTERN.fullmatch(digits):
+        raise ValueError(f"Invalid MAC address or prefix: {text!r}")
+    return int(digits, 16) << (4 * (12 - len(digits))), len(digits)
+
+def read_registry(lines, short_registry='MA-S'):
+    # Yield (bits, prefix value, registry, company, address) from an IEEE
+    # registry file in CSV ("Registry,Assignment,...") or TXT format.
+    # short_registry names 36-bit TXT assignments (MA-S or IAB).
+    lines = iter(lines)
+    first = next(lines, '')
+    if first.lstrip('\ufeff').startswith('Registry,'):
+        for row in csv.reader(lines):
+            if len(row) < 3:
+                continue
+            kind, assignment, company = row[0].strip(), row[1].strip(), row[2].strip()
+            address = row[3].strip() if len(row) > 3 else ''
+            bits = len(assignment) * 4
+            if bits in PREFIX_BITS:
+                yield bits, int(assignment, 16), kind, company, address
+        return
+
+    # TXT: "00-50-56   (hex)  Org" then "005056  (base 16)  Org" (MA-L) or
+    # "A00000-AFFFFF  (base 16)  Org" (MA-M/MA-S), then address lines
+    entry, address, oui, company = None, [], None, ''
+    for line in itertools.chain([first], lines):
+        hex_match = TXT_HEX_PATTERN.match(line)
+        if hex_match:
+            if entry:
+                yield (*entry, ' '.join(' '.join(address).split()))
+            entry, address = None, []
+            oui, company = hex_match.group(1).replace('-', ''), hex_match.group(2).strip()
+            continue
+
+        base_match = TXT_BASE16_PATTERN.match(line)
+        if base_match and oui:
+            # The digits shared by both ends of the range extend the OUI
+            start, end = base_match.group(1), base_match.group(2)
+            fixed = 0
+            while end and fixed < 6 and start[fixed] == end[fixed]:
+                fixed += 1
+            bits = 24 + 4 * fixed
+            if bits in PREFIX_BITS:
+                kind = {24: 'MA-L', 28: 'MA-M', 36: short_registry}[bits]
+                entry = (bits, int(oui + start[:fixed], 16), kind, company)
+            continue
+
+        if entry and line.strip():
+            address.append(line.strip())
+    if entry:
+        yield (*entry, ' '.join(' '.join(address).split()))
+
+def compile_index(paths, index_path):
+    # Build the index file from registry files. Returns the assignment count.
+    assignments = {}
+    for path in paths:
+        short_registry = 'IAB' if 'iab' in os.path.basename(path).lower() else 'MA-S'
+        with open(path, encoding='utf-8', errors='replace', newline='') as f:
+            for bits, value, kind, company, address in read_registry(f, short_registry):
+                assignments[(bits, value)] = (kind, company, address)
+
+    # Vendor records are stored once and shared by every assignment
+    records, offsets = bytearray(), {}
+    tables = {bits: [] for bits in PREFIX_BITS}
+    for (bits, value), record in sorted(assignments.items()):
+        if record not in offsets:
+            kind, company, address = record
+            company_bytes = company.encode('utf-8')[:0xFFFF]
+            address_bytes = address.encode('utf-8')[:0xFFFF]
+            code = REGISTRIES.index(kind) if kind in REGISTRIES else 0
+            offsets[record] = len(records)
+            records += RECORD.pack(code, len(company_bytes), len(address_bytes))
+            records += company_bytes + address_bytes
+        tables[bits].append((value, offsets[record]))
+
+    body = bytearray()
+    for bits in PREFIX_BITS:
+        entries = tables[bits]
+        body += struct.pack(f'<{len(entries)}Q', *(value for value, _ in entries))
+        body += struct.pack(f'<{len(entries)}I', *(offset for _, offset in entries))
+        body += b'\0' * (-len(body) % 8)
+
+    tmp_path = index_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(INDEX_MAGIC, *(len(tables[b]) for b in PREFIX_BITS), HEADER.size + len(body)))
+        f.write(body)
+        f.write(records)
+    os.replace(tmp_path, index_path)
+    return len(assignments)
+
+class OuiIndex:
+    """Longest-prefix-match lookups over a memory-mapped compiled index"""
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, *sizes, records_offset = HEADER.unpack_from(self._map)
+        if magic != INDEX_MAGIC:
+            raise ValueError(f"Not a compiled OUI index: {path}")
+
+        # Keys and record offsets are viewed in place, not copied (except on
+        # big-endian hosts, which byte-swap a copy of each table)
+        view = memoryview(self._map)
+        self._views = [view]
+        self.tables = []
+        position = HEADER.size
+        for bits, size in zip(PREFIX_BITS, sizes):
+            key_bytes = view[position:position + 8 * size]
+            position += 8 * size
+            value_bytes = view[position:position + 4 * size]
+            position += 4 * size
+            position += -position % 8
+            self._views += [key_bytes, value_bytes]
+            if NATIVE_LITTLE_ENDIAN:
+                keys, values = key_bytes.cast('Q'), value_bytes.cast('I')
+                self._views += [keys, values]
+            else:
+                keys, values = array('Q'), array(UINT32)
+                keys.frombytes(key_bytes)
+                values.frombytes(value_bytes)
+                keys.byteswap()
+                values.byteswap()
+            self.tables.append((bits, keys, values))
+        self._records_offset = records_offset
+        self._records = {}
+        self._cache = {}
+        # OUIs with MA-M/MA-S assignments below them; every other MAC's
+        # result depends only on its first 24 bits
+        self._nested = {key >> (bits - 24) for bits, keys, _ in self.tables if bits > 24 for key in keys}
+
+    def __len__(self):
+        return sum(len(keys) for _, keys, _ in self.tables)
+
+    def _record(self, offset):
+        record = self._records.get(offset)
+        if record is None:
+            position = self._records_offset + offset
+            code, company_length, address_length = RECORD.unpack_from(self._map, position)
+            position += RECORD.size
+            company = self._map[position:position + company_length].decode('utf-8', 'replace')
+            position += company_length
+            address = self._map[position:position + address_length].decode('utf-8', 'replace')
+            record = self._records[offset] = (REGISTRIES[code], company, address)
+        return record
+
+    def lookup_value(self, value, digits=12):
+        """Return (bits, prefix, registry, company, address) for the longest
+        assignment covering a 48-bit value, or None"""
+        oui = value >> 24
+        cache_key = (value >> 12, digits) if oui in self._nested else oui
+        if cache_key in self._cache:
+            return self._cache[cache_key]
+
+        match = None
+        for bits, keys, values in self.tables:
+            if bits > digits * 4:
+                continue
+            key = value >> (48 - bits)
+            i = bisect_left(keys, key)
+            if i < len(keys) and keys[i] == key:
+                match = (bits, key, *self._record(values[i]))
+                break
+
+        if len(self._cache) >= CACHE_LIMIT:
+            self._cache.clear()
+        self._cache[cache_key] = match
+        return match
+
+    def lookup(self, mac):
+        """Return the vendor of a MAC address or prefix as a dict in the
+        macvendorlookup.com API shape, or None. Raises ValueError."""
+        return vendor_record(self.lookup_value(*parse_mac(mac)))
+
+    def close(self):
+        self.tables = []
+        for view in reversed(self._views):
+            view.release()
+        self._map.close()
+        self._file.close()
+
+def vendor_record(match):
+    # Format a lookup_value() match like the macvendorlookup.com API
+    if match is None:
+        return None
+    bits, prefix, registry, company, address = match
+    start = prefix << (48 - bits)
+    end = start | ((1 << (48 - bits)) - 1)
+    return {
+        'startHex': f"{start:012X}",
+        'endHex': f"{end:012X}",
+        'startDec': str(start),
+        'endDec': str(end),
+        'company': company,
+        'addressL1': address,
+        'type': registry,
+    }
+
+def extract_mac(line, field=None, delimiter=None):
+    # Return the MAC on a dump line: the given 1-based field or the first MAC
+    if field is not None:
+        fields = line.split(delimiter)
+        return fields[field - 1] if len(fields) >= field else None
+    match = MAC_PATTERN.search(line)
+    return match.group(1) if match else None
+
+def quote_field(value, sep):
+    # CSV-quote a field that contains the separator, a quote or a newline
+    if sep in value or '"' in value or '\n' in value or '\r' in value:
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+def tag_lines(index, lines, out, field=None, delimiter=None, as_json=False):
+    # Append the vendor to every line read from lines, or write one JSON
+    # object per line with -j.
+    sep = delimiter or ','
+    lookup_value = index.lookup_value
+    quoted = {}
+    for line in lines:
+        line = line.rstrip('\n')
+        mac = extract_mac(line, field, delimiter)
+        match = None
+        if mac is not None:
+            try:
+                match = lookup_value(*parse_mac(mac))
+            except ValueError:
+                pass
+        if as_json:
+            out.write(json.dumps({'line': line, 'mac': mac, 'vendor': vendor_record(match)}) + '\n')
+        else:
+            company = match[3] if match else ''
+            if company not in quoted:
+                quoted[company] = quote_field(company, sep)
+            out.write(f"{line}{sep}{quoted[company]}\n")
+
+def print_single(index, mac_input, as_json):
+    # Same layout as macLookup.sh
+    try:
+        vendor = index.lookup(mac_input)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    print(f"MAC Address: {mac_input}")
+    print(f"Company: {vendor['company'] if vendor else 'null'}")
+    if as_json:
+        print("JSON Output:")
+        print(json.dumps([vendor] if vendor else []))
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Look up MAC address vendors in a local IEEE OUI index"
+    )
+    parser.add_argument("macs", nargs="*", help="MAC addresses or prefixes (default: read stdin)")
+    parser.add_argument("-j", "--json", action="store_true", help="Show JSON output")
+    parser.add_argument("--db", default="oui.idx", help="Compiled index (default: oui.idx)")
+    parser.add_argument("--compile", nargs="+", metavar="FILE", help="Build the index from IEEE registry files")
+    parser.add_argument("--field", type=int, help="1-based field holding the MAC (bulk mode)")
+    parser.add_argument("--delimiter", help="Field delimiter (default: whitespace / ',')")
+    args = parser.parse_args()
+
+    if args.compile:
+        count = compile_index(args.compile, args.db)
+        print(f"Compiled {count} assignments into {args.db}")
+        return
+
+    if not os.path.exists(args.db):
+        print(f"Error: Index '{args.db}' does not exist; build it with --compile")
+        sys.exit(1)
+    index = OuiIndex(args.db)
+
+    try:
+        if args.macs:
+            for mac in args.macs:
+                print_single(index, mac, args.json)
+        elif sys.stdin.isatty():
+            mac_input = input("Enter the first 6 characters of the MAC address (in XX:XX:XX or XXXXXX format): ")
+            print_single(index, mac_input, args.json)
+        else:
+            tag_lines(index, sys.stdin, sys.stdout, args.field, args.delimiter, args.json)
+    except BrokenPipeError:
+        sys.stderr.close()
+    finally:
+        index.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+=============================================================================
+File:           nmapDiff.py
+Purpose:        Compares two nmap scans and reports, per host, ports that
+               were newly opened, closed, or are now running a different
+               service. Either scan can be normal, grepable or XML output.
+
+How to run:     python nmapDiff.py [options] old_scan new_scan
+               Options:
+                   --format {text,csv,jsonl}: Output format (default: text)
+                   --input-format {auto,text,xml}: Input format
+               Examples:
+                   python nmapDiff.py monday.xml tuesday.xml
+                   python nmapDiff.py --format csv old.gnmap new.gnmap > changes.csv
+
+Dependencies:   Python 3.6+
+               - argparse
+               - csv
+               - json
+               - nmapFormat.py (same directory)
+
+Author:         Tom Kinsella
+Email:          tkinsella@sisng.io
+Organization:   Personal Project
+
+Creation Date:  2026-10-18
+Last Updated:   2026-10-18
+Version:        1.0.0
+
+Change History:
+   1.0.0 (2026-10-18) - Initial release
+       - Opened, closed and changed-service detection per host
+       - Hash index of the old scan, new scan streamed against it
+       - Text, CSV and JSONL output written as changes are found
+
+License:        MIT License
+               Copyright (c) 2024 Tom Kinsella
+               See LICENSE file for full license text
+
+Notes:
+   - Only ports in the "open" state are compared; a port that moved from
+     open to filtered or closed is reported as closed
+   - Cost is linear in the size of both scans. Only the open ports of the
+     old scan (and the keys already seen in the new one) are held in memory
+   - Opened and changed ports are printed while the new scan is read,
+     closed ports are printed once it has been read completely
+=============================================================================
+"""
+
+import sys
+import csv
+import json
+import argparse
+
+from nmapFormat import INPUT_FORMATS, iter_nmap_files
+
+DIFF_COLUMNS = ['Change', 'IP', 'Port', 'Protocol', 'Old Service', 'New Service']
+TEXT_MARKERS = {'opened': '+', 'closed': '-', 'changed': '~'}
+
+def index_open_ports(rows):
+    # Build a {(ip, protocol, port): service} index of the open ports in rows.
+    index = {}
+    for ip, port, protocol, state, service in rows:
+        if state == 'open':
+            index[(ip, protocol, port)] = service
+    return index
+
+def diff_scans(old_rows, new_rows):
+    # Yield (change, ip, port, protocol, old_service, new_service) tuples.
+    # old_rows is indexed once; new_rows is streamed and may be a generator.
+    old_index = index_open_ports(old_rows)
+    seen = set()
+
+    for ip, port, protocol, state, service in new_rows:
+        if state != 'open':
+            continue
+        key = (ip, protocol, port)
+        if key in seen:
+            continue
+        seen.add(key)
+
+        old_service = old_index.pop(key, None)
+        if old_service is None:
+            yield ('opened', ip, port, protocol, '', service)
+        elif old_service != service:
+            yield ('changed', ip, port, protocol, old_service, service)
+
+    for (ip, protocol, port), old_service in old_index.items():
+        yield ('closed', ip, port, protocol, old_service, '')
+
+def write_changes(changes, out, output_format):
+    # Write changes as they are produced. Returns the number written.
+    if output_format == 'jsonl':
+        def write(change):
+            out.write(json.dumps(dict(zip(DIFF_COLUMNS, change))) + '\n')
+    elif output_format == 'csv':
+        writer = csv.writer(out, lineterminator='\n')
+        writer.writerow(DIFF_COLUMNS)
+        write = writer.writerow
+    else:
+        def write(change):
+            kind, ip, port, protocol, old_service, new_service = change
+            if kind == 'changed':
+                detail = f"{old_service} -> {new_service}"
+            else:
+                detail = old_service or new_service
+            out.write(f"{TEXT_MARKERS[kind]} {ip:<15} {port + '/' + protocol:<10} {detail}\n")
+
+    count = 0
+    for change in changes:
+        write(change)
+        count += 1
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Report port changes between two nmap scans"
+    )
+    parser.add_argument("old_scan", help="Earlier scan output file")
+    parser.add_argument("new_scan", help="Later scan output file")
+    parser.add_argument(
+        "--format",
+        choices=["text", "csv", "jsonl"],
+        default="text",
+        help="Output format (default: text)"
+    )
+    parser.add_argument(
+        "--input-format",
+        choices=INPUT_FORMATS,
+        default="auto",
+        help="Input format of both scans (default: auto)"
+    )
+    args = parser.parse_args()
+
+    old_rows = iter_nmap_files([args.old_scan], args.input_format)
+    new_rows = iter_nmap_files([args.new_scan], args.input_format)
+    try:
+        write_changes(diff_scans(old_rows, new_rows), sys.stdout, args.format)
+    except BrokenPipeError:
+        sys.stderr.close()
+
+if __name__ == "__main__":
+    main()
@@ -3,25 +3,49 @@
 =============================================================================
 File:           nmapFormat.py
 Purpose:        Parses nmap scan output from stdin and converts it into a
-               clean, formatted table using pandas. Extracts IP addresses,
+               clean, formatted table. Extracts IP addresses,
                ports, protocols, states and services from nmap scan results.
+               Can also stream rows as CSV/TSV/JSONL while nmap is running.
+               Reads normal (-oN), grepable (-oG) and XML (-oX) output.
 
-How to run:    nmap [options] target | python nmapFormat.py
-               Example:
+How to run:    nmap [options] target | python nmapFormat.py [options]
+               python nmapFormat.py [options] scan.xml [scan2.gnmap ...]
+               Options:
+                   --input-format {auto,text,xml}: Input format
+                       (default: auto). text covers both normal and
+                       grepable output.
+                   --format {table,csv,tsv,jsonl}: Output format
+                       (default: table). csv/tsv/jsonl stream one row per
+                       open port as soon as it is parsed.
+                   --table: With a streaming format, also print the table
+                       to stderr once the input ends
+                   --summary {hosts,services}: Print per-host or
+                       per-service counts of open ports instead of rows
+               Examples:
                nmap -p- 192.168.1.0/24 | python nmapFormat.py 
+               nmap -p- 10.0.0.0/16 | python nmapFormat.py --format csv > scan.csv
+               python nmapFormat.py --format jsonl archive/scan-2024-01.xml
+               python nmapFormat.py --summary services big-scan.xml
 
 Dependencies:   Python 3.6+
                - sys
                - re
-               - pandas
+               - argparse
+               - csv
+               - json
+               - xml.etree.ElementTree
+               - array
+               - socket
+               - pandas, numpy (output_to_table and ScanResults.to_pandas only)
+               - pyarrow (ScanResults.to_arrow only)
 
 Author:         Tom Kinsella
 Email:          tkinsella@sisng.io
 Organization:   Personal Project
 
 Creation Date:  2017-03-27
-Last Updated:   2017-03-27
-Version:        1.0.0
+Last Updated:   2026-10-18
+Version:        1.4.1
 
 Change History:
    1.0.0 (2017-03-27) - Initial release
@@ -34,42 +58,509 @@ Change History:
            * Service names
        - Pandas DataFrame output formatting
        - stdin input processing
+   1.1.0 (2026-10-18) - Streaming output
+       - Line-by-line parsing of stdin instead of readlines()
+       - CSV, TSV and JSONL output formats written as rows are parsed
+       - Memory stays flat in streaming formats unless --table is given
+       - pandas is only imported when a table is printed
+   1.2.0 (2026-10-18) - Additional input formats
+       - Normal output is parsed per host ("Nmap scan report for" lines)
+         instead of requiring the IP on every port line
+       - Grepable (-oG) output parsing
+       - XML (-oX) parsing with iterparse; each <host> element is cleared
+         after use so memory stays bounded on multi-GB files
+       - Input files can be given as arguments, format is auto-detected
+   1.3.0 (2026-10-18) - Columnar results
+       - ScanResults container: IPv4 addresses as uint32, ports as uint16,
+         protocol/state/service as dictionary codes, filled row by row
+         while parsing (about 10 bytes per port instead of five strings)
+       - Host and service summaries computed on the columns
+       - to_pandas()/to_arrow() export the numeric columns as views of the
+         arrays and the text columns as categoricals/dictionary arrays
+       - The table view and --table are built from ScanResults
+       - --summary {hosts,services}
+   1.4.0 (2026-10-18) - Startup time
+       - The table view is laid out like a pandas DataFrame by
+         format_table() without importing pandas (every row is printed,
+         no "..." truncation)
+       - Available as "tools.py nmap"
+   1.4.1 (2026-10-18) - Fixes
+       - Streamed rows are flushed per row only on a terminal; pipes and
+         files get block-buffered writes and one flush at the end
+       - ScanResults columns are copied to a wider typecode when a port
+         is above 65535 or a name list outgrows its codes (more than 256
+         protocols/states, 65536 services) instead of raising
+         OverflowError part way through a row
+       - A port that is negative or above 2**32 - 1 raises ValueError
+         before any column of the row is written; the command line
+         reports it as an error and exits 1
 
 License:        MIT License
                Copyright (c) 2024 Tom Kinsella
                See LICENSE file for full license text
 
 Notes:
-   - Expects nmap output via stdin
-   - Matches standard nmap output format
-   - Uses pandas for clean table formatting
+   - Reads nmap output from stdin when no files are given
+   - Matches standard, grepable and XML nmap output formats
+   - Every format produces the same IP/Port/Protocol/State/Service rows
+   - output_to_table() still returns a pandas DataFrame for library use
+   - The table view has to hold every row in memory (as ScanResults);
+     use a streaming format for very large scans
+   - Hosts that are not IPv4 addresses (IPv6, unresolved names) are kept
+     in ScanResults.other_hosts by row and stored as 0 in the uint32 column
+   - A ScanResults cannot grow while a pandas/Arrow export of it is alive,
+     since the export shares the array memory
+   - Export dtypes follow the column typecodes, so Port/Service may come
+     out wider than uint16 (and Protocol/State wider than uint8) after
+     unusual input
 =============================================================================
 """
 
 import sys
 import re
-import pandas as pd
+import csv
+import json
+import argparse
+import io
+import socket
+import xml.etree.ElementTree as ET
+from array import array
+from collections import Counter, defaultdict
 
-def parse_nmap_output(nmap_output):
-    pattern = re.compile(r'(\d+\.\d+\.\d+\.\d+).*?(\d+)/(\w+)\s+(\w+)\s+(\w+)')
-    data = []
+COLUMNS = ['IP', 'Port', 'Protocol', 'State', 'Service']
+OUTPUT_FORMATS = ['table', 'csv', 'tsv', 'jsonl']
+INPUT_FORMATS = ['auto', 'text', 'xml']
+
+# Single line form: "<ip> ... <port>/<proto> <state> <service>"
+PORT_PATTERN = re.compile(r'(\d+\.\d+\.\d+\.\d+).*?(\d+)/(\w+)\s+(\w+)\s+(\w+)')
+# Port table line under a "Nmap scan report for" header: "22/tcp open ssh"
+PORT_LINE_PATTERN = re.compile(r'(\d+)/(\w+)\s+(\S+)\s+(\S+)')
+HOST_HEADER = 'Nmap scan report for '
+GREPABLE_HOST = 'Host: '
+
+def parse_host_header(line):
+    # "Nmap scan report for name (10.0.0.1)" or "Nmap scan report for 10.0.0.1"
+    target = line[len(HOST_HEADER):].strip()
+    if target.endswith(')') and '(' in target:
+        return target[target.rindex('(') + 1:-1]
+    return target
 
+def iter_grepable_line(line):
+    # "Host: 10.0.0.1 (name)\tPorts: 22/open/tcp//ssh///, 80/open/tcp//http///"
+    fields = line.rstrip('\n').split('\t')
+    ip = fields[0][len(GREPABLE_HOST):].split(' ', 1)[0]
+    for field in fields[1:]:
+        if not field.startswith('Ports: '):
+            continue
+        for entry in field[7:].split(', '):
+            parts = entry.split('/')
+            if len(parts) < 5:
+                continue
+            port, state, protocol, _owner, service = parts[:5]
+            yield [ip, port, protocol, state, service]
+
+def iter_nmap_output(nmap_output):
+    # Yield one [ip, port, protocol, state, service] row per port found.
+    # Works on any iterable of lines, so sys.stdin is consumed as nmap writes it.
+    # Handles normal output (host header followed by a port table), grepable
+    # output, and the single line form matched by PORT_PATTERN.
+    search = PORT_PATTERN.search
+    match_port_line = PORT_LINE_PATTERN.match
+    current_ip = None
     for line in nmap_output:
-        match = pattern.search(line)
+        if line.startswith(HOST_HEADER):
+            current_ip = parse_host_header(line)
+            continue
+        if line.startswith(GREPABLE_HOST):
+            yield from iter_grepable_line(line)
+            continue
+        # Every port line contains a slash; skip the rest without a regex
+        if '/' not in line:
+            continue
+        if current_ip is not None:
+            match = match_port_line(line)
+            if match:
+                yield [current_ip, *match.groups()]
+                continue
+        match = search(line)
         if match:
-            ip, port, protocol, state, service = match.groups()
-            data.append([ip, port, protocol, state, service])
+            yield list(match.groups())
+
+def iter_nmap_xml(source):
+    # Incrementally parse nmap -oX output from a path or binary file object.
+    # Each finished <host> is cleared and detached from the root so memory
+    # stays bounded no matter how large the file is.
+    context = ET.iterparse(source, events=('start', 'end'))
+    root = None
+    for event, elem in context:
+        if root is None:
+            root = elem
+        if event != 'end' or elem.tag != 'host':
+            continue
+
+        ip = None
+        for address in elem.iter('address'):
+            if address.get('addrtype') in ('ipv4', 'ipv6'):
+                ip = address.get('addr')
+                break
+        if ip is not None:
+            for port in elem.iter('port'):
+                state = port.find('state')
+                service = port.find('service')
+                yield [
+                    ip,
+                    port.get('portid', ''),
+                    port.get('protocol', ''),
+                    state.get('state', '') if state is not None else '',
+                    service.get('name', '') if service is not None else '',
+                ]
+
+        elem.clear()
+        root.clear()
+
+def iter_nmap_stream(stream, input_format='auto'):
+    # Parse a binary stream in any supported format. 'auto' peeks at the
+    # first bytes: XML starts with '<', everything else is treated as text.
+    if input_format == 'auto':
+        if not isinstance(stream, io.BufferedReader):
+            stream = io.BufferedReader(stream)
+        head = stream.peek(64).lstrip()
+        input_format = 'xml' if head.startswith(b'<') else 'text'
+
+    if input_format == 'xml':
+        yield from iter_nmap_xml(stream)
+    else:
+        text = io.TextIOWrapper(stream, encoding='utf-8', errors='replace')
+        yield from iter_nmap_output(text)
+
+def iter_nmap_files(paths, input_format='auto'):
+    # Parse each file in turn, or stdin when no paths are given.
+    if not paths:
+        yield from iter_nmap_stream(sys.stdin.buffer, input_format)
+        return
+    for path in paths:
+        with open(path, 'rb') as stream:
+            yield from iter_nmap_stream(stream, input_format)
+
+def parse_nmap_output(nmap_output):
+    return list(iter_nmap_output(nmap_output))
+
+# 32-bit unsigned typecode ('I' is 4 bytes on every common platform)
+UINT32 = 'I' if array('I').itemsize == 4 else 'L'
+# Next wider unsigned typecode, for a column whose values outgrow its own
+WIDER_TYPECODE = {'B': 'H', 'H': UINT32, UINT32: 'Q'}
+# Column holding the codes of each name list, in _codes order
+CODE_COLUMNS = ('protocols', 'states', 'services')
+HOST_SUMMARY_COLUMNS = ['IP', 'Ports', 'Open Ports']
+SERVICE_SUMMARY_COLUMNS = ['Service', 'Protocol', 'Ports', 'Hosts']
+
+class ScanResults:
+    """Columnar store for parsed rows. IPv4 addresses are uint32, ports
+    uint16, and protocol/state/service are codes into small name lists.
+    A column is copied to a wider typecode when a value outgrows it."""
+
+    def __init__(self, rows=()):
+        self.ips = array(UINT32)
+        self.ports = array('H')
+        self.protocols = array('B')
+        self.states = array('B')
+        self.services = array('H')
+        self.protocol_names, self.state_names, self.service_names = [], [], []
+        self._codes = ({}, {}, {})
+        self.other_hosts = {}       # row -> host text that is not IPv4
+        self.extend(rows)
+
+    def _widen(self, name, value):
+        # Replace column name with a copy in a typecode that can hold value
+        column = getattr(self, name)
+        while value >> (8 * column.itemsize):
+            column = array(WIDER_TYPECODE[column.typecode], column)
+        setattr(self, name, column)
+
+    def _encode(self, which, names, value):
+        codes = self._codes[which]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(names)
+            names.append(value)
+            if code >> (8 * getattr(self, CODE_COLUMNS[which]).itemsize):
+                self._widen(CODE_COLUMNS[which], code)
+        return code
+
+    def append(self, row):
+        """Add one [ip, port, protocol, state, service] row. Raises
+        ValueError, without adding anything, if the port is not a number
+        from 0 to 2**32 - 1."""
+        ip, port, protocol, state, service = row
+        port_value = int(port) if port else 0
+        if not 0 <= port_value <= 0xFFFFFFFF:
+            raise ValueError(f"Port out of range: {port!r}")
+        if port_value >> (8 * self.ports.itemsize):
+            self._widen('ports', port_value)
+        try:
+            value = int.from_bytes(socket.inet_pton(socket.AF_INET, ip), 'big')
+        except OSError:
+            self.other_hosts[len(self.ips)] = ip
+            value = 0
+        # Encode before looking up the columns, since encoding may widen them
+        codes = (self._encode(0, self.protocol_names, protocol),
+                 self._encode(1, self.state_names, state),
+                 self._encode(2, self.service_names, service))
+        self.ips.append(value)
+        self.ports.append(port_value)
+        self.protocols.append(codes[0])
+        self.states.append(codes[1])
+        self.services.append(codes[2])
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+        return self
+
+    def __len__(self):
+        return len(self.ips)
+
+    @property
+    def nbytes(self):
+        # Bytes held by the columns (excluding the name lists)
+        return sum(len(column) * column.itemsize for column in
+                   (self.ips, self.ports, self.protocols, self.states, self.services))
+
+    def ip(self, i):
+        host = self.other_hosts.get(i)
+        return host if host is not None else socket.inet_ntoa(self.ips[i].to_bytes(4, 'big'))
 
-    return data
+    def row(self, i):
+        """Return row i in the parser's string form"""
+        return [
+            self.ip(i),
+            str(self.ports[i]),
+            self.protocol_names[self.protocols[i]],
+            self.state_names[self.states[i]],
+            self.service_names[self.services[i]],
+        ]
+
+    def __iter__(self):
+        return (self.row(i) for i in range(len(self)))
+
+    def _rows_in_state(self, state):
+        # Indices of the rows in state (every row if state is None)
+        if state is None:
+            return range(len(self))
+        code = self._codes[1].get(state)
+        if code is None:
+            return []
+        return [i for i, s in enumerate(self.states) if s == code]
+
+    def host_summary(self, state='open'):
+        """Return (ip, port count, "port/protocol,...") per host with ports
+        in state, in address order"""
+        by_host = defaultdict(list)
+        ips, other_hosts = self.ips, self.other_hosts
+        for i in self._rows_in_state(state):
+            key = (1, other_hosts[i]) if i in other_hosts else (0, ips[i])
+            by_host[key].append(i)
+
+        summary = []
+        for key in sorted(by_host):
+            rows = by_host[key]
+            ports = sorted((self.ports[i], self.protocol_names[self.protocols[i]]) for i in rows)
+            summary.append((self.ip(rows[0]), len(rows), ','.join(f"{p}/{proto}" for p, proto in ports)))
+        return summary
+
+    def service_summary(self, state='open'):
+        """Return (service, protocol, port count, host count) per service
+        with ports in state, most common first"""
+        rows = self._rows_in_state(state)
+        services, protocols, ips = self.services, self.protocols, self.ips
+        ports = Counter((services[i], protocols[i]) for i in rows)
+        hosts = Counter(key[:2] for key in {(services[i], protocols[i], ips[i], self.other_hosts.get(i)) for i in rows})
+        return [
+            (self.service_names[service], self.protocol_names[protocol], count, hosts[(service, protocol)])
+            for (service, protocol), count in ports.most_common()
+        ]
+
+    def to_pandas(self, ip_strings=False):
+        """Return a DataFrame whose IP and Port columns are numpy views of
+        the arrays (IP as dotted strings if ip_strings) and whose text
+        columns are categoricals over the name lists"""
+        import numpy as np
+        import pandas as pd
+
+        def view(column):
+            dtype = np.dtype(f"u{column.itemsize}")
+            return np.frombuffer(column, dtype=dtype) if len(column) else np.zeros(0, dtype)
+
+        def categorical(codes, names):
+            return pd.Categorical.from_codes(view(codes), categories=names)
+
+        ips = [self.ip(i) for i in range(len(self))] if ip_strings else view(self.ips)
+        return pd.DataFrame({
+            'IP': ips,
+            'Port': view(self.ports),
+            'Protocol': categorical(self.protocols, self.protocol_names),
+            'State': categorical(self.states, self.state_names),
+            'Service': categorical(self.services, self.service_names),
+        }, copy=False)
+
+    def to_arrow(self, ip_strings=False):
+        """Return a pyarrow Table over the array buffers, with the text
+        columns as dictionary arrays"""
+        import pyarrow as pa
+
+        arrow_types = {1: pa.uint8(), 2: pa.uint16(), 4: pa.uint32(), 8: pa.uint64()}
+
+        def column(values):
+            arrow_type = arrow_types[values.itemsize]
+            return pa.Array.from_buffers(arrow_type, len(values), [None, pa.py_buffer(values)])
+
+        def dictionary(codes, names):
+            return pa.DictionaryArray.from_arrays(column(codes), pa.array(names, pa.string()))
+
+        ips = pa.array([self.ip(i) for i in range(len(self))], pa.string()) if ip_strings else column(self.ips)
+        return pa.Table.from_arrays([
+            ips,
+            column(self.ports),
+            dictionary(self.protocols, self.protocol_names),
+            dictionary(self.states, self.state_names),
+            dictionary(self.services, self.service_names),
+        ], names=COLUMNS)
 
 def output_to_table(data):
-    df = pd.DataFrame(data, columns=['IP', 'Port', 'Protocol', 'State', 'Service'])
+    if isinstance(data, ScanResults):
+        return data.to_pandas(ip_strings=True)
+    import pandas as pd
+    df = pd.DataFrame(data, columns=COLUMNS)
     return df
 
-# Read from stdin
-nmap_output = sys.stdin.readlines()
+def format_table(rows, columns=COLUMNS):
+    # Lay rows out like a printed pandas DataFrame: a row-number column, then
+    # right-aligned columns separated by two spaces.
+    rows = [[str(value) for value in row] for row in rows]
+    if not rows:
+        return f"Empty DataFrame\nColumns: [{', '.join(columns)}]\nIndex: []"
+    index_width = len(str(len(rows) - 1))
+    widths = [max([len(c)] + [len(row[i]) for row in rows]) for i, c in enumerate(columns)]
+    lines = [' ' * index_width + ''.join(f"  {c.rjust(w)}" for c, w in zip(columns, widths))]
+    for number, row in enumerate(rows):
+        lines.append(str(number).ljust(index_width) + ''.join(f"  {v.rjust(w)}" for v, w in zip(row, widths)))
+    return '\n'.join(lines)
+
+def format_summary(rows, columns):
+    # Left-aligned text table for --summary
+    rows = [[str(value) for value in row] for row in rows]
+    widths = [max([len(c)] + [len(row[i]) for row in rows]) for i, c in enumerate(columns)]
+    lines = ['  '.join(c.ljust(w) for c, w in zip(columns, widths)).rstrip()]
+    for row in rows:
+        lines.append('  '.join(v.ljust(w) for v, w in zip(row, widths)).rstrip())
+    return '\n'.join(lines)
+
+def write_rows(rows, out, output_format, keep=None, columns=COLUMNS):
+    # Write rows to out as they arrive. Rows are flushed one at a time only
+    # when out is a terminal; pipes and files are block-buffered and
+    # flushed once at the end. If keep is given (a list or a ScanResults),
+    # rows are also appended to it for a final table view.
+    if output_format == 'jsonl':
+        def write(row):
+            out.write(json.dumps(dict(zip(columns, row))) + '\n')
+    else:
+        writer = csv.writer(out, delimiter='\t' if output_format == 'tsv' else ',',
+                            lineterminator='\n')
+        writer.writerow(columns)
+        write = writer.writerow
+
+    isatty = getattr(out, 'isatty', None)
+    interactive = bool(isatty and isatty())
+    count = 0
+    for row in rows:
+        write(row)
+        if interactive:
+            out.flush()
+        if keep is not None:
+            keep.append(row)
+        count += 1
+    out.flush()
+    return count
+
+def load_results(args):
+    # Parse every input into a ScanResults, exiting on a row it cannot store
+    try:
+        return ScanResults(iter_nmap_files(args.files, args.input_format))
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Parse nmap output into a table or a row stream"
+    )
+    parser.add_argument(
+        "files",
+        nargs="*",
+        help="nmap output files to read (default: stdin)"
+    )
+    parser.add_argument(
+        "--input-format",
+        choices=INPUT_FORMATS,
+        default="auto",
+        help="Input format (default: auto). text covers normal and grepable output"
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="table",
+        help="Output format (default: table). csv, tsv and jsonl are streamed"
+    )
+    parser.add_argument(
+        "--table",
+        action="store_true",
+        help="With a streaming format, also print the table to stderr at the end"
+    )
+    parser.add_argument(
+        "--summary",
+        choices=["hosts", "services"],
+        help="Print open port counts per host or per service instead of rows"
+    )
+    args = parser.parse_args()
+
+    if args.summary:
+        results = load_results(args)
+        if args.summary == 'hosts':
+            rows, columns = results.host_summary(), HOST_SUMMARY_COLUMNS
+        else:
+            rows, columns = results.service_summary(), SERVICE_SUMMARY_COLUMNS
+        try:
+            if args.format == 'table':
+                print(format_summary(rows, columns))
+            else:
+                write_rows(rows, sys.stdout, args.format, columns=columns)
+        except BrokenPipeError:
+            sys.stderr.close()
+        return
+
+    if args.format == 'table':
+        results = load_results(args)
+        try:
+            print(format_table(results))
+        except BrokenPipeError:
+            sys.stderr.close()
+        return
+
+    kept = ScanResults() if args.table else None
+    try:
+        rows = iter_nmap_files(args.files, args.input_format)
+        write_rows(rows, sys.stdout, args.format, kept)
+    except BrokenPipeError:
+        # Downstream closed early (e.g. piped into head)
+        sys.stderr.close()
+        return
+    except ValueError as e:
+        sys.stdout.flush()
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
 
-parsed_data = parse_nmap_output(nmap_output)
-table = output_to_table(parsed_data)
-print(table)
+    if kept is not None:
+        print(format_table(kept), file=sys.stderr)
 
+if __name__ == "__main__":
+    main()
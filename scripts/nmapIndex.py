@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+=============================================================================
+File:           nmapIndex.py
+Purpose:        Builds a deduplicated host/port index from many nmap result
+               files. Files are parsed in parallel with nmapFormat.py and
+               merged into a SQLite database keyed by (IP, port, protocol)
+               that records when each port was first and last seen.
+
+How to run:     python nmapIndex.py ingest [options] path [path ...]
+               python nmapIndex.py query [options]
+               Options (ingest):
+                   --db FILE: Index database (default: nmap_index.db)
+                   --workers N: Parser processes (default: CPU count)
+                   --input-format {auto,text,xml}: Input format
+               Options (query):
+                   --db FILE: Index database (default: nmap_index.db)
+                   --ip IP, --port N, --protocol P: Filters
+                   --format {csv,jsonl}: Output format (default: csv)
+               Examples:
+                   python nmapIndex.py ingest /srv/scans/weekly
+                   python nmapIndex.py ingest "/srv/scans/2024-*/*.xml"
+                   python nmapIndex.py query --port 3389 --format jsonl
+
+Dependencies:   Python 3.6+
+               - argparse
+               - concurrent.futures
+               - sqlite3
+               - glob
+               - nmapFormat.py (same directory)
+
+Author:         Tom Kinsella
+Email:          tkinsella@sisng.io
+Organization:   Personal Project
+
+Creation Date:  2026-10-18
+Last Updated:   2026-10-18
+Version:        1.0.1
+
+Change History:
+   1.0.0 (2026-10-18) - Initial release
+       - Directory and glob input
+       - Parallel parsing across a process pool
+       - SQLite index with first-seen/last-seen per (IP, port, protocol)
+       - Already ingested, unchanged files are skipped
+       - CSV and JSONL query output
+   1.0.1 (2026-10-18) - Fixes
+       - A file that cannot be read or parsed (e.g. truncated XML) is
+         reported and skipped instead of aborting the batch; ingest exits
+         with status 1 when any file failed
+       - Rows without a numeric port are skipped
+
+License:        MIT License
+               Copyright (c) 2024 Tom Kinsella
+               See LICENSE file for full license text
+
+Notes:
+   - The scan time of a file is read from the nmap header (XML start
+     attribute or "scan initiated" comment) and falls back to the file
+     modification time
+   - State and service are taken from the most recent scan of a port
+   - Each worker returns one deduplicated result set per file, so memory
+     is bounded by the largest single file, not the whole batch
+=============================================================================
+"""
+
+import os
+import re
+import sys
+import csv
+import glob
+import json
+import sqlite3
+import argparse
+import datetime
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+
+from nmapFormat import INPUT_FORMATS, iter_nmap_files
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ports (
+    ip TEXT NOT NULL,
+    port INTEGER NOT NULL,
+    protocol TEXT NOT NULL,
+    state TEXT NOT NULL,
+    service TEXT NOT NULL,
+    first_seen INTEGER NOT NULL,
+    last_seen INTEGER NOT NULL,
+    PRIMARY KEY (ip, port, protocol)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime INTEGER NOT NULL,
+    scan_time INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ports_by_port ON ports (port, protocol);
+"""
+
+UPSERT = """
+INSERT INTO ports (ip, port, protocol, state, service, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (ip, port, protocol) DO UPDATE SET
+    state = CASE WHEN excluded.last_seen >= last_seen THEN excluded.state ELSE state END,
+    service = CASE WHEN excluded.last_seen >= last_seen THEN excluded.service ELSE service END,
+    first_seen = min(first_seen, excluded.first_seen),
+    last_seen = max(last_seen, excluded.last_seen)
+"""
+
+XML_START_PATTERN = re.compile(rb'<nmaprun[^>]*\sstart="(\d+)"')
+TEXT_START_PATTERN = re.compile(rb'scan initiated (.+?) as:')
+
+def scan_time(path):
+    # Return the scan start time of a result file as a Unix timestamp.
+    with open(path, 'rb') as f:
+        head = f.read(4096)
+
+    match = XML_START_PATTERN.search(head)
+    if match:
+        return int(match.group(1))
+
+    match = TEXT_START_PATTERN.search(head)
+    if match:
+        # "Sat Jan  6 10:00:00 2024" - collapse the padding before parsing
+        stamp = ' '.join(match.group(1).decode('ascii', 'replace').split())
+        try:
+            return int(datetime.datetime.strptime(stamp, '%a %b %d %H:%M:%S %Y').timestamp())
+        except ValueError:
+            pass
+
+    return int(os.path.getmtime(path))
+
+def expand_paths(patterns):
+    # Expand directories (recursively) and glob patterns into a sorted file list.
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, _dirs, files in os.walk(pattern):
+                for name in files:
+                    paths.add(os.path.join(root, name))
+        else:
+            for path in glob.glob(pattern, recursive=True):
+                if os.path.isfile(path):
+                    paths.add(path)
+    return sorted(os.path.abspath(p) for p in paths)
+
+def parse_file(path, input_format='auto'):
+    # Worker: parse one file into a {(ip, port, protocol): (state, service)} dict.
+    # Returns (path, scan time, ports, None), or (path, None, None, message)
+    # if the file cannot be read or parsed. Rows without a numeric port are
+    # skipped.
+    ports = {}
+    try:
+        for ip, port, protocol, state, service in iter_nmap_files([path], input_format):
+            try:
+                port = int(port)
+            except ValueError:
+                continue
+            ports[(ip, port, protocol)] = (state, service)
+        return path, scan_time(path), ports, None
+    except (ET.ParseError, OSError) as e:
+        return path, None, None, str(e)
+
+def open_index(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.executescript(SCHEMA)
+    return conn
+
+def pending_files(conn, paths):
+    # Yield (path, size, mtime) for files not yet ingested or changed since.
+    known = {p: (s, m) for p, s, m in conn.execute('SELECT path, size, mtime FROM files')}
+    for path in paths:
+        st = os.stat(path)
+        signature = (st.st_size, int(st.st_mtime))
+        if known.get(path) != signature:
+            yield path, signature[0], signature[1]
+
+def ingest(conn, paths, workers=None, input_format='auto', errors=sys.stderr):
+    # Parse files across a process pool and merge them into the index.
+    # Files that cannot be parsed are reported to errors and left out of the
+    # index, so the next run retries them. Returns (files ingested, port
+    # rows merged, files failed).
+    pending = {path: (size, mtime) for path, size, mtime in pending_files(conn, paths)}
+    if not pending:
+        return 0, 0, 0
+
+    files = rows = failed = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(parse_file, pending, [input_format] * len(pending), chunksize=1)
+        for path, seen, ports, error in results:
+            if error is not None:
+                errors.write(f"Error: Cannot parse '{path}': {error}\n")
+                failed += 1
+                continue
+            size, mtime = pending[path]
+            with conn:
+                conn.executemany(UPSERT, (
+                    (ip, port, protocol, state, service, seen, seen)
+                    for (ip, port, protocol), (state, service) in ports.items()
+                ))
+                conn.execute(
+                    'INSERT OR REPLACE INTO files (path, size, mtime, scan_time) VALUES (?, ?, ?, ?)',
+                    (path, size, mtime, seen)
+                )
+            files += 1
+            rows += len(ports)
+    return files, rows, failed
+
+def query(conn, ip=None, port=None, protocol=None):
+    # Yield index rows as dicts, filtered on any of ip/port/protocol.
+    clauses, params = [], []
+    for column, value in (('ip', ip), ('port', port), ('protocol', protocol)):
+        if value is not None:
+            clauses.append(f'{column} = ?')
+            params.append(value)
+    sql = 'SELECT ip, port, protocol, state, service, first_seen, last_seen FROM ports'
+    if clauses:
+        sql += ' WHERE ' + ' AND '.join(clauses)
+    sql += ' ORDER BY ip, protocol, port'
+
+    for ip, port, protocol, state, service, first_seen, last_seen in conn.execute(sql, params):
+        yield {
+            'IP': ip,
+            'Port': port,
+            'Protocol': protocol,
+            'State': state,
+            'Service': service,
+            'First Seen': datetime.datetime.fromtimestamp(first_seen).strftime('%Y-%m-%d %H:%M:%S'),
+            'Last Seen': datetime.datetime.fromtimestamp(last_seen).strftime('%Y-%m-%d %H:%M:%S'),
+        }
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build and query a deduplicated index of nmap results"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = subparsers.add_parser("ingest", help="Parse result files into the index")
+    ingest_parser.add_argument("paths", nargs="+", help="Files, directories or glob patterns")
+    ingest_parser.add_argument("--db", default="nmap_index.db", help="Index database (default: nmap_index.db)")
+    ingest_parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    ingest_parser.add_argument("--input-format", choices=INPUT_FORMATS, default="auto", help="Input format (default: auto)")
+
+    query_parser = subparsers.add_parser("query", help="Print indexed ports")
+    query_parser.add_argument("--db", default="nmap_index.db", help="Index database (default: nmap_index.db)")
+    query_parser.add_argument("--ip", help="Only this IP address")
+    query_parser.add_argument("--port", type=int, help="Only this port")
+    query_parser.add_argument("--protocol", help="Only this protocol (tcp, udp, ...)")
+    query_parser.add_argument("--format", choices=["csv", "jsonl"], default="csv", help="Output format (default: csv)")
+
+    args = parser.parse_args()
+
+    if args.command == "ingest":
+        paths = expand_paths(args.paths)
+        if not paths:
+            print("Error: No input files found")
+            return
+        conn = open_index(args.db)
+        files, rows, failed = ingest(conn, paths, args.workers, args.input_format)
+        conn.close()
+        print(f"Ingested {files} of {len(paths)} files ({rows} port rows) into {args.db}")
+        if failed:
+            print(f"{failed} file(s) could not be parsed", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    if not os.path.exists(args.db):
+        print(f"Error: Index '{args.db}' does not exist")
+        return
+    conn = open_index(args.db)
+    rows = query(conn, args.ip, args.port, args.protocol)
+    if args.format == "jsonl":
+        for row in rows:
+            sys.stdout.write(json.dumps(row) + "\n")
+    else:
+        writer = None
+        for row in rows:
+            if writer is None:
+                writer = csv.DictWriter(sys.stdout, fieldnames=list(row), lineterminator="\n")
+                writer.writeheader()
+            writer.writerow(row)
+    conn.close()
+
+if __name__ == "__main__":
+    main()
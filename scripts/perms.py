@@ -5,24 +5,49 @@ File:           perms.py
 Purpose:        A utility script for converting Linux file permissions between
                numeric (octal) and symbolic notations. Supports bidirectional
                conversion and provides detailed permission breakdowns for 
-               user, group, and others.
+               user, group, and others. An audit mode walks directory trees
+               in parallel and reports risky permissions as JSONL. A filter
+               mode converts a permission field on every line of stdin.
 
 How to run:     python perms.py [permission]
                Examples:
                    python perms.py 755
                    python perms.py rwxr-xr-x
+                   python perms.py 4755
+                   python perms.py rwsr-xr-x
+                   python perms.py --audit / --workers 32 > findings.jsonl
+                   stat -c '%a %n' /etc/* | python perms.py --filter
+                   ls -l /usr/bin | python perms.py --filter
                If no argument provided, script will prompt for input.
+               Audit options:
+                   --audit PATH [PATH ...]: Walk these trees and report
+                       world-writable files, world-writable directories
+                       without the sticky bit, and SUID/SGID files
+                   --workers N: Directory scanning threads (default: 16)
+                   --xdev: Stay on the filesystem of each PATH
+               Filter options:
+                   --filter: Convert the permission in each stdin line
+                       (numeric to symbolic, symbolic or ls -l style
+                       to numeric) and print the line with it replaced.
+                       Lines without a permission are printed unchanged.
+                   --field N: Whitespace-separated field holding the
+                       permission (default: 1)
 
 Dependencies:   Python 3.6+
                - sys
+               - os
+               - stat
+               - json
+               - argparse
+               - concurrent.futures
 
 Author:         Tom Kinsella
 Email:          tkinsella@sisng.io
 Organization:   Personal Project
 
 Creation Date:  2018-09-04
-Last Updated:   2018-09-04
-Version:        1.0.0
+Last Updated:   2026-10-18
+Version:        1.3.1
 
 Change History:
    1.0.0 (2018-09-04) - Initial release
@@ -36,6 +61,25 @@ Change History:
            * Others permissions
        - Input validation for both formats
        - Interactive mode when no arguments provided
+   1.1.0 (2026-10-18) - Special bits and audit mode
+       - setuid, setgid and sticky bits (s/S, s/S, t/T) and 4-digit modes
+       - Conversions use precomputed 4096-entry lookup tables
+       - Numeric results are zero padded (044, not 44)
+       - --audit walks trees with os.scandir on a thread pool and streams
+         findings as JSONL
+   1.2.0 (2026-10-18) - Filter mode
+       - --filter converts permissions line by line from stdin using
+         dictionary lookups only
+       - Parses 10-character ls -l modes (file type, special bits and a
+         trailing ACL/SELinux marker)
+   1.3.0 (2026-10-18) - Startup time
+       - concurrent.futures is imported only by --audit
+       - Available as "tools.py perms"
+   1.3.1 (2026-10-18) - Fixes
+       - Unpadded 1- and 2-digit modes (stat -c %a prints 0 and 44) are
+         converted in every mode, not only 3- and 4-digit ones
+       - --audit reports an unreadable or missing PATH on stderr and
+         exits with status 1 instead of a traceback
 
 License:        MIT License
                Copyright (c) 2024 Tom Kinsella
@@ -43,36 +87,194 @@ License:        MIT License
 
 Notes:
    - Handles standard Linux permission formats only
-   - Does not support special permissions (setuid, setgid, sticky bit)
-   - Input must be either 3-digit octal or 9-character symbolic notation
+   - Input must be either 1-4 digit octal or 9-character symbolic notation
+     (10-character ls -l modes are also accepted). Short octal values are
+     read as stat -c %a prints them: 0 is 000 and 44 is 044
+   - Filter mode replaces the converted field; with --field > 1 the
+     whitespace between fields is collapsed to single spaces
+   - Audit mode does not follow symbolic links and skips directories it
+     cannot read, reporting them as "unreadable" findings
 =============================================================================
 """
+import os
+import sys
+import json
+import stat
+import argparse
+import threading
+
+def _build_symbolic(mode):
+    # 9-character symbolic form of a 12-bit mode, including special bits
+    chars = []
+    for shift, special, set_char in ((6, 0o4000, 's'), (3, 0o2000, 's'), (0, 0o1000, 't')):
+        bits = (mode >> shift) & 7
+        chars.append('r' if bits & 4 else '-')
+        chars.append('w' if bits & 2 else '-')
+        if mode & special:
+            chars.append(set_char if bits & 1 else set_char.upper())
+        else:
+            chars.append('x' if bits & 1 else '-')
+    return ''.join(chars)
+
+# Lookup tables for every 12-bit mode (permission and special bits)
+SYMBOLIC_TABLE = tuple(_build_symbolic(mode) for mode in range(0o10000))
+NUMERIC_TABLE = {symbolic: mode for mode, symbolic in enumerate(SYMBOLIC_TABLE)}
+OCTAL_TABLE = tuple(f"{mode:03o}" if mode < 0o1000 else f"{mode:04o}" for mode in range(0o10000))
+
+# Filter mode lookups: any 1-4 digit octal string to symbolic, and any
+# 9-character symbolic string to octal. stat -c %a does not pad, so mode
+# 000 is printed as 0 and 044 as 44.
+NUMERIC_TO_SYMBOLIC = {f"{mode:04o}": SYMBOLIC_TABLE[mode] for mode in range(0o10000)}
+for width in (3, 2, 1):
+    NUMERIC_TO_SYMBOLIC.update({f"{mode:0{width}o}": SYMBOLIC_TABLE[mode] for mode in range(8 ** width)})
+SYMBOLIC_TO_NUMERIC = {symbolic: OCTAL_TABLE[mode] for symbolic, mode in NUMERIC_TABLE.items()}
+
+# File type characters of ls -l, and markers ls appends for ACLs/contexts
+LS_FILE_TYPES = frozenset('-dlcbpsD')
+LS_MODE_SUFFIXES = frozenset('.+@')
+
 def numeric_to_symbolic(numeric_perm):
     numeric_perm = int(numeric_perm, 8)
-    symbolic_perm = ''
-    for i in range(9):
-        if numeric_perm & (1 << (8 - i)):
-            symbolic_perm += 'rwx'[i % 3]
-        else:
-            symbolic_perm += '-'
-    return symbolic_perm
+    if not 0 <= numeric_perm <= 0o7777:
+        raise ValueError(f"Invalid numeric permission: {numeric_perm:o}")
+    return SYMBOLIC_TABLE[numeric_perm]
 
 def symbolic_to_numeric(symbolic_perm):
-    numeric_perm = 0
-    for i, char in enumerate(symbolic_perm):
-        if char in 'rwx':
-            numeric_perm |= (1 << (8 - i))
-    return oct(numeric_perm)[2:]
+    try:
+        return OCTAL_TABLE[NUMERIC_TABLE[symbolic_perm]]
+    except KeyError:
+        raise ValueError(f"Invalid symbolic permission: {symbolic_perm}") from None
 
-def main():
-    import sys
+def parse_ls_mode(ls_mode):
+    # Split a 10-character ls -l mode (e.g. drwxr-sr-t.) into (file type,
+    # 9-character symbolic permission). Returns None if it is not one.
+    if len(ls_mode) == 11 and ls_mode[10] in LS_MODE_SUFFIXES:
+        ls_mode = ls_mode[:10]
+    if len(ls_mode) != 10 or ls_mode[0] not in LS_FILE_TYPES or ls_mode[1:] not in NUMERIC_TABLE:
+        return None
+    return ls_mode[0], ls_mode[1:]
 
-    if len(sys.argv) > 1:
-        input_perm = sys.argv[1]
-    else:
-        input_perm = input("Enter a Linux permission in numeric (e.g., 755) or symbolic (e.g., rwxr-xr-x) format: ")
+def convert_perm(value):
+    # Convert numeric to symbolic or symbolic/ls -l to numeric. Returns
+    # None if value is not a permission.
+    result = NUMERIC_TO_SYMBOLIC.get(value) or SYMBOLIC_TO_NUMERIC.get(value)
+    if result is None and 10 <= len(value) <= 11:
+        parsed = parse_ls_mode(value)
+        if parsed:
+            result = SYMBOLIC_TO_NUMERIC[parsed[1]]
+    return result
+
+def filter_lines(lines, out, field=1):
+    # Replace the permission in the given whitespace-separated field of
+    # every line. Lines without one are written unchanged.
+    convert = convert_perm
+    write = out.write
+    for line in lines:
+        if field == 1:
+            token, sep, rest = line.partition(' ')
+            converted = convert(token.rstrip('\n'))
+            if converted is not None:
+                line = f"{converted}{sep}{rest}" if sep else f"{converted}\n"
+        else:
+            parts = line.split()
+            if len(parts) >= field:
+                converted = convert(parts[field - 1])
+                if converted is not None:
+                    parts[field - 1] = converted
+                    line = ' '.join(parts) + '\n'
+        write(line)
+
+def is_numeric_perm(value):
+    return 1 <= len(value) <= 4 and all(char in '01234567' for char in value)
+
+def is_symbolic_perm(value):
+    return value in NUMERIC_TABLE or parse_ls_mode(value) is not None
+
+def check_mode(st_mode):
+    # Return the audit findings for a stat mode
+    mode = st_mode & 0o7777
+    findings = []
+    if stat.S_ISDIR(st_mode):
+        if mode & stat.S_IWOTH and not mode & stat.S_ISVTX:
+            findings.append("world_writable_dir_no_sticky")
+    elif stat.S_ISREG(st_mode):
+        if mode & stat.S_IWOTH:
+            findings.append("world_writable_file")
+        if mode & stat.S_ISUID:
+            findings.append("suid")
+        if mode & stat.S_ISGID and mode & stat.S_IXGRP:
+            # setgid without group execute is mandatory locking, not SGID
+            findings.append("sgid")
+    return findings
 
-    if input_perm.isdigit() and len(input_perm) == 3:
+def _finding(path, finding, st):
+    return {
+        "path": path,
+        "finding": finding,
+        "mode": OCTAL_TABLE[st.st_mode & 0o7777] if st else None,
+        "symbolic": SYMBOLIC_TABLE[st.st_mode & 0o7777] if st else None,
+        "uid": st.st_uid if st else None,
+        "gid": st.st_gid if st else None,
+    }
+
+def _scan_directory(path, device):
+    # Scan one directory. Returns (findings, subdirectories to descend into).
+    findings = []
+    subdirs = []
+    try:
+        with os.scandir(path) as scanner:
+            for entry in scanner:
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if stat.S_ISLNK(st.st_mode):
+                    continue
+                for finding in check_mode(st.st_mode):
+                    findings.append(_finding(entry.path, finding, st))
+                if stat.S_ISDIR(st.st_mode) and (device is None or st.st_dev == device):
+                    subdirs.append(entry.path)
+    except OSError:
+        findings.append(_finding(path, "unreadable", None))
+    return findings, subdirs
+
+def audit_tree(roots, workers=16, same_device=False):
+    """Walk the trees under roots on a thread pool and yield finding dicts
+    as directories are scanned. Order follows scan completion."""
+    from concurrent.futures import ThreadPoolExecutor
+    results = []
+    done = threading.Condition()
+    pending = 0
+
+    def scan(path, device):
+        findings, subdirs = _scan_directory(path, device)
+        with done:
+            results.append((findings, subdirs, device))
+            done.notify()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for root in roots:
+            st = os.stat(root, follow_symlinks=False)
+            for finding in check_mode(st.st_mode):
+                yield _finding(root, finding, st)
+            if stat.S_ISDIR(st.st_mode):
+                pending += 1
+                pool.submit(scan, root, st.st_dev if same_device else None)
+
+        while pending:
+            with done:
+                while not results:
+                    done.wait()
+                batch, results[:] = results[:], []
+            for findings, subdirs, device in batch:
+                pending -= 1
+                for subdir in subdirs:
+                    pending += 1
+                    pool.submit(scan, subdir, device)
+                yield from findings
+
+def print_conversion(input_perm):
+    if is_numeric_perm(input_perm):
         symbolic_result = numeric_to_symbolic(input_perm)
         user_perms = symbolic_result[:3]
         group_perms = symbolic_result[3:6]
@@ -83,13 +285,80 @@ def main():
         print(f"User(U): {user_perms}")
         print(f"Group(G): {group_perms}")
         print(f"Others(O): {others_perms}")
-    elif len(input_perm) == 9 and all(char in '-rwx' for char in input_perm):
-        numeric_result = symbolic_to_numeric(input_perm)
+    elif is_symbolic_perm(input_perm):
+        parsed = parse_ls_mode(input_perm)
+        numeric_result = symbolic_to_numeric(parsed[1] if parsed else input_perm)
         print(f"User provided Symbolic Notation: {input_perm}")
         print(f"The Number Notation is: {numeric_result}")
     else:
-        print("Invalid input format. Please enter a valid 3-digit numeric or 9-character symbolic permission.")
+        print("Invalid input format. Please enter a valid 1-4 digit numeric or 9-character symbolic permission.")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert Linux permissions between numeric and symbolic notation"
+    )
+    parser.add_argument(
+        "permission",
+        nargs="?",
+        help="Numeric (e.g. 755) or symbolic (e.g. rwxr-xr-x) permission"
+    )
+    parser.add_argument(
+        "--audit",
+        nargs="+",
+        metavar="PATH",
+        help="Audit the trees under PATH and print findings as JSONL"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=16,
+        help="Directory scanning threads for --audit (default: 16)"
+    )
+    parser.add_argument(
+        "--xdev",
+        action="store_true",
+        help="Do not cross filesystem boundaries during --audit"
+    )
+    parser.add_argument(
+        "--filter",
+        action="store_true",
+        help="Convert the permission field of every line read from stdin"
+    )
+    parser.add_argument(
+        "--field",
+        type=int,
+        default=1,
+        help="Whitespace-separated field holding the permission for --filter (default: 1)"
+    )
+    args = parser.parse_args()
+
+    if args.filter:
+        try:
+            filter_lines(sys.stdin, sys.stdout, args.field)
+        except BrokenPipeError:
+            sys.stderr.close()
+        return
+
+    if args.audit:
+        try:
+            for finding in audit_tree(args.audit, args.workers, args.xdev):
+                sys.stdout.write(json.dumps(finding) + "\n")
+        except BrokenPipeError:
+            sys.stderr.close()
+        except FileNotFoundError as e:
+            print(f"Error: Path '{e.filename}' does not exist", file=sys.stderr)
+            sys.exit(1)
+        except OSError as e:
+            print(f"Error: Cannot read '{e.filename}': {e.strerror}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    if args.permission:
+        input_perm = args.permission
+    else:
+        input_perm = input("Enter a Linux permission in numeric (e.g., 755) or symbolic (e.g., rwxr-xr-x) format: ")
+
+    print_conversion(input_perm)
 
 if __name__ == "__main__":
     main()
-
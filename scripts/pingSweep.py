@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+=============================================================================
+File:           pingSweep.py
+Purpose:        Discovers live hosts across IPv4 ranges of any size. Probes
+               every host with concurrent TCP connects (and optional ICMP
+               echo) from a single asyncio event loop and prints each live
+               host as soon as it answers. Replaces pingSweep.sh.
+
+How to run:     python pingSweep.py [options] target [target ...]
+               Targets:
+                   10.0.0.0/16, 10.0.0.0/255.255.0.0, 10.0.0.7,
+                   10.0.0.10-10.0.0.50, or a legacy 192.168.1 prefix (/24)
+               Options:
+                   --ports LIST: TCP ports to try (default: 22,80,443)
+                   --icmp: Also send ICMP echo requests
+                   --timeout S: Seconds to wait for each host (default: 1.0)
+                   --concurrency N: Hosts probed at once (default: 1024)
+                   --rate N: Maximum hosts started per second (default:
+                       unlimited)
+                   --format {text,csv,jsonl}: Output format (default: text)
+               Examples:
+                   python pingSweep.py 192.168.1
+                   python pingSweep.py 10.20.0.0/16 --concurrency 4096 --timeout 0.5
+                   sudo python pingSweep.py 10.0.0.0/24 --icmp --ports ""
+
+Dependencies:   Python 3.7+
+               - argparse
+               - asyncio
+               - ipaddress
+               - socket
+               - subnet.py (same directory)
+
+Author:         Tom Kinsella
+Email:          tkinsella@sisng.io
+Organization:   Personal Project
+
+Creation Date:  2026-10-18
+Last Updated:   2026-10-18
+Version:        1.0.1
+
+Change History:
+   1.0.0 (2026-10-18) - Initial release
+       - CIDR, netmask, range, single address and legacy /24 targets,
+         deduplicated across overlapping targets
+       - asyncio TCP-connect probes; a refused connection counts as live
+       - Optional ICMP echo over one shared socket (unprivileged ping
+         socket where allowed, raw socket as root)
+       - Bounded concurrency, per-host timeout and a hosts/second limit
+       - Live hosts streamed as text, CSV or JSONL
+   1.0.1 (2026-10-18) - Fixes
+       - ICMP echo requests are sent with socket.sendto instead of
+         loop.sock_sendto, which needs Python 3.11; --icmp works on 3.7+
+
+License:        MIT License
+               Copyright (c) 2024 Tom Kinsella
+               See LICENSE file for full license text
+
+Notes:
+   - A host is live when any probe answers: a TCP handshake, a TCP reset
+     (connection refused) or an ICMP echo reply. The first answer wins and
+     the host's remaining probes are cancelled
+   - Like subnet.py, network and broadcast addresses are skipped for
+     prefixes shorter than /31
+   - All ports of a host are tried at once, one socket each; the file
+     descriptor limit is raised to fit --concurrency x ports where the
+     hard limit allows
+   - Sweep time is roughly (hosts x timeout) / concurrency for ranges that
+     are mostly empty; ICMP uses a single socket for every host
+   - May trigger IDS/IPS systems
+   - test_pingSweep.py checks the TCP probes and target deduplication
+     against listeners on 127.0.0.1 (python -m unittest test_pingSweep)
+=============================================================================
+"""
+
+import sys
+import csv
+import json
+import time
+import errno
+import socket
+import struct
+import asyncio
+import argparse
+import ipaddress
+from itertools import count
+
+from subnet import merge_ranges, int_to_ip
+
+OUTPUT_COLUMNS = ['IP', 'Method', 'RTT (ms)']
+
+# connect_ex() results: the host answered, or the handshake is under way
+ANSWERED = {0, errno.ECONNREFUSED}
+PENDING = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN}
+
+def target_hosts(target):
+    # Return the (first, last) host range of one target as integers.
+    text = target.strip()
+    if '-' in text:
+        start, end = (int(ipaddress.IPv4Address(part.strip())) for part in text.split('-', 1))
+        if start > end:
+            raise ValueError(f"Invalid range: {text!r}")
+        return start, end
+    if text.count('.') == 2 and '/' not in text:
+        # Legacy pingSweep.sh argument: first three octets of a /24
+        text += '.0/24'
+    network = ipaddress.IPv4Network(text, strict=False)
+    first, last = int(network.network_address), int(network.broadcast_address)
+    if network.prefixlen < 31:
+        first, last = first + 1, last - 1
+    return first, last
+
+def expand_targets(targets):
+    # Yield every host address (as a string) of the targets once, in order.
+    for first, last in merge_ranges(target_hosts(t) for t in targets):
+        for value in range(first, last + 1):
+            yield int_to_ip(value)
+
+class RateLimiter:
+    """Spaces out acquire() calls to at most rate per second"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_slot = 0.0
+
+    async def acquire(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        slot = max(now, self.next_slot)
+        self.next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+def _checksum(data):
+    if len(data) % 2:
+        data += b'\0'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+class IcmpPinger:
+    """Sends ICMP echo requests over one socket and matches the replies"""
+
+    def __init__(self):
+        # Unprivileged ping sockets (net.ipv4.ping_group_range) first, then
+        # a raw socket, which needs root or CAP_NET_RAW
+        try:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+            self.raw = False
+        except OSError:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+            self.raw = True
+        self.sock.setblocking(False)
+        self.ident = id(self) & 0xFFFF
+        self.sequence = count()
+        self.waiters = {}        # (ip, sequence) -> future
+        self.loop = asyncio.get_running_loop()
+        self.loop.add_reader(self.sock.fileno(), self._read_replies)
+
+    def _read_replies(self):
+        while True:
+            try:
+                data, (ip, _) = self.sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                continue
+            if self.raw:
+                # Raw sockets see every ICMP packet with its IP header
+                data = data[(data[0] & 0x0F) * 4:]
+            if len(data) < 8 or data[0] != 0:
+                continue
+            ident, sequence = struct.unpack('!HH', data[4:8])
+            if self.raw and ident != self.ident:
+                continue
+            waiter = self.waiters.pop((ip, sequence), None)
+            if waiter is not None and not waiter.done():
+                waiter.set_result(None)
+
+    async def ping(self, ip, timeout):
+        """Return True if ip answers an echo request within timeout"""
+        sequence = next(self.sequence) & 0xFFFF
+        header = struct.pack('!BBHHH', 8, 0, 0, self.ident, sequence)
+        payload = b'pingSweep.py'
+        packet = struct.pack('!BBHHH', 8, 0, _checksum(header + payload), self.ident, sequence) + payload
+
+        waiter = self.loop.create_future()
+        self.waiters[(ip, sequence)] = waiter
+        try:
+            # A datagram this small never blocks on a non-blocking socket
+            # (a full send buffer raises BlockingIOError, an OSError), and
+            # loop.sock_sendto only exists from Python 3.11
+            self.sock.sendto(packet, (ip, 0))
+            await asyncio.wait_for(waiter, timeout)
+            return True
+        except (asyncio.TimeoutError, OSError):
+            return False
+        finally:
+            self.waiters.pop((ip, sequence), None)
+
+    def close(self):
+        self.loop.remove_reader(self.sock.fileno())
+        self.sock.close()
+
+async def tcp_probe(ip, ports, timeout):
+    # Connect to every port at once; return "tcp/<port>" for the first port
+    # that completes or refuses the handshake, or None after timeout. Uses
+    # writer callbacks and one timer instead of a task per connection, which
+    # keeps the event loop overhead low on large sweeps.
+    loop = asyncio.get_running_loop()
+    waiter = loop.create_future()
+    sockets = {}             # fd -> (socket, port) of pending connections
+    opened = []
+    timer = None
+
+    def finish(method):
+        if not waiter.done():
+            waiter.set_result(method)
+
+    def on_writable(fd):
+        sock, port = sockets.pop(fd)
+        loop.remove_writer(fd)
+        if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) in ANSWERED:
+            finish(f"tcp/{port}")
+        elif not sockets:
+            finish(None)
+
+    try:
+        for port in ports:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            opened.append(sock)
+            sock.setblocking(False)
+            result = sock.connect_ex((ip, port))
+            if result in ANSWERED:
+                return f"tcp/{port}"
+            if result in PENDING:
+                sockets[sock.fileno()] = (sock, port)
+                loop.add_writer(sock.fileno(), on_writable, sock.fileno())
+        if not sockets:
+            return None
+        timer = loop.call_later(timeout, finish, None)
+        return await waiter
+    finally:
+        for fd in sockets:
+            loop.remove_writer(fd)
+        if timer is not None:
+            timer.cancel()
+        for sock in opened:
+            sock.close()
+
+async def probe_host(ip, ports, timeout, pinger=None):
+    # Probe one host with TCP and ICMP at once; return (ip, method, rtt_ms)
+    # for the first answer, or None when nothing answered.
+    started = time.monotonic()
+    probes = []
+    if ports:
+        probes.append(tcp_probe(ip, ports, timeout))
+    if pinger is not None:
+        async def icmp_probe():
+            return "icmp" if await pinger.ping(ip, timeout) else None
+        probes.append(icmp_probe())
+
+    if len(probes) == 1:
+        method = await probes[0]
+    else:
+        method = None
+        tasks = [asyncio.ensure_future(probe) for probe in probes]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                method = await finished
+                if method:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+    if not method:
+        return None
+    return ip, method, round((time.monotonic() - started) * 1000, 1)
+
+async def sweep(hosts, ports=(22, 80, 443), timeout=1.0, concurrency=1024, rate=None, icmp=False):
+    """Async generator yielding (ip, method, rtt_ms) for every live host in
+    hosts, in the order they answer. At most concurrency hosts are probed
+    at once, started at no more than rate hosts per second."""
+    limiter = RateLimiter(rate)
+    pinger = IcmpPinger() if icmp else None
+    results = asyncio.Queue()
+    # Caps the host tasks in existence, so a /8 is not queued all at once
+    host_slots = asyncio.BoundedSemaphore(concurrency)
+
+    async def run(ip):
+        try:
+            await results.put(await probe_host(ip, ports, timeout, pinger))
+        except Exception as e:
+            # Surfaced by the consumer, e.g. running out of sockets
+            await results.put(e)
+        finally:
+            host_slots.release()
+
+    async def produce():
+        for ip in hosts:
+            await host_slots.acquire()
+            await limiter.acquire()
+            asyncio.ensure_future(run(ip))
+        # Wait for the remaining host tasks, then signal the end
+        for _ in range(concurrency):
+            await host_slots.acquire()
+        await results.put(StopAsyncIteration)
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while True:
+            result = await results.get()
+            if result is StopAsyncIteration:
+                break
+            if isinstance(result, Exception):
+                raise result
+            if result is not None:
+                yield result
+        await producer
+    finally:
+        producer.cancel()
+        if pinger is not None:
+            pinger.close()
+
+def raise_file_limit(wanted):
+    # Raise the soft open-file limit towards wanted; returns the new limit.
+    try:
+        import resource
+    except ImportError:
+        return wanted
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != resource.RLIM_INFINITY and soft < wanted:
+        soft = wanted if hard == resource.RLIM_INFINITY else min(wanted, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+    return soft
+
+async def run_sweep(args, ports, out):
+    # Print live hosts as they answer; returns the number found.
+    if args.format == 'jsonl':
+        def write(row):
+            out.write(json.dumps(dict(zip(OUTPUT_COLUMNS, row))) + '\n')
+    elif args.format == 'csv':
+        writer = csv.writer(out, lineterminator='\n')
+        writer.writerow(OUTPUT_COLUMNS)
+        write = writer.writerow
+    else:
+        def write(row):
+            ip, method, rtt = row
+            out.write(f"{ip:<15} {method:<10} {rtt:.1f} ms\n")
+
+    live = 0
+    hosts = expand_targets(args.targets)
+    async for row in sweep(hosts, ports, args.timeout, args.concurrency, args.rate, args.icmp):
+        write(row)
+        out.flush()
+        live += 1
+    return live
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Discover live hosts with concurrent TCP and ICMP probes"
+    )
+    parser.add_argument("targets", nargs="+", help="CIDR, netmask, range, address or legacy a.b.c prefix")
+    parser.add_argument("--ports", default="22,80,443", help="Comma-separated TCP ports (default: 22,80,443)")
+    parser.add_argument("--icmp", action="store_true", help="Also send ICMP echo requests")
+    parser.add_argument("--timeout", type=float, default=1.0, help="Seconds to wait per host (default: 1.0)")
+    parser.add_argument("--concurrency", type=int, default=1024, help="Hosts probed at once (default: 1024)")
+    parser.add_argument("--rate", type=float, help="Maximum hosts started per second")
+    parser.add_argument("--format", choices=["text", "csv", "jsonl"], default="text", help="Output format (default: text)")
+    args = parser.parse_args()
+
+    try:
+        ports = [int(p) for p in args.ports.split(',') if p.strip()]
+        for target in args.targets:
+            target_hosts(target)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if not ports and not args.icmp:
+        print("Error: No probes selected; give --ports or --icmp")
+        sys.exit(1)
+
+    # Each host in flight holds one socket per port
+    per_host = max(len(ports), 1)
+    limit = raise_file_limit(args.concurrency * per_host + 64)
+    if args.concurrency * per_host + 64 > limit:
+        args.concurrency = max(1, (limit - 64) // per_host)
+        print(f"Warning: open file limit {limit}, concurrency lowered to {args.concurrency}", file=sys.stderr)
+
+    started = time.monotonic()
+    try:
+        live = asyncio.run(run_sweep(args, ports, sys.stdout))
+    except PermissionError:
+        print("Error: ICMP needs root or net.ipv4.ping_group_range; drop --icmp or use sudo")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        sys.exit(130)
+    except BrokenPipeError:
+        sys.stderr.close()
+        return
+    print(f"{live} live hosts found in {time.monotonic() - started:.1f}s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
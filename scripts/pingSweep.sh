@@ -1,5 +1,5 @@
 #!/bin/sh
-"""
+: """
 =============================================================================
 File:           pingSweep.sh
 Purpose:        A simple network scanning tool that performs a ping sweep of
@@ -21,8 +21,8 @@ Email:          tkinsella@sisng.io
 Organization:   Personal Project
 
 Creation Date:  2012-03-07
-Last Updated:   2012-03-07
-Version:        1.0.0
+Last Updated:   2026-10-18
+Version:        1.0.1
 
 Change History:
    1.0.0 (2012-03-07) - Initial release
@@ -32,6 +32,11 @@ Change History:
        - Simplified output showing only responding IP addresses
        - Basic input validation and usage instructions
        - Uses standard Unix/Linux tools (ping, cut, tr)
+   1.0.1 (2026-10-18) - Fixes
+       - Closed the argument check (missing fi and exit) and fixed its
+         test syntax
+       - Header block is now a no-op (:) instead of a command
+       - Superseded by pingSweep.py for ranges larger than a /24
 
 License:        MIT License
                Copyright (c) 2024 Tom Kinsella
@@ -43,15 +48,19 @@ Notes:
    - May trigger IDS/IPS systems
    - Performance depends on network conditions
    - Uses parallel execution for faster results
+   - pingSweep.py takes the same argument, handles any CIDR range and
+     limits concurrency
 =============================================================================
 """
 
 #!/bin/sh
 
-if [ "$1" == ""]
+if [ "$1" = "" ]
 then
 echo "You forgot an IP address!"
 echo "Syntax: pingSweep 192.168.1"
+exit 1
+fi
 
 for ip in $(seq 1 254); do
     ping -c 1 $1.$ip | grep "64 bytes" | cut -d " " -f 4 | tr -d ":" &
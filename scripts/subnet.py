@@ -6,11 +6,23 @@ Purpose:        A network utility that performs subnet calculations based on
                CIDR notation or netmask input. Provides comprehensive subnet
                information including IP ranges, host counts, and decimal
                conversions in both human-readable and JSON formats.
+               A batch mode calculates the same fields for a whole file of
+               CIDRs/netmasks in one pass, and set operations summarize,
+               check and carve up large lists of subnets.
 
 How to run:     python subnet.py [CIDR/netmask]
+               python subnet.py --batch FILE [--format {jsonl,csv}]
+               python subnet.py --aggregate FILE
+               python subnet.py --overlaps FILE
+               python subnet.py --vlsm SPACE [SPACE ...] --hosts N [N ...]
+                                [--hosts-file FILE] [--used FILE]
                Examples:
                    python subnet.py 192.168.1.0/24
                    python subnet.py 255.255.255.0
+                   python subnet.py --batch ipam_export.txt > subnets.jsonl
+                   cut -d, -f1 ipam.csv | python subnet.py --batch - --format csv
+                   python subnet.py --aggregate routes.txt
+                   python subnet.py --vlsm 10.20.0.0/16 --hosts 500 120 60 --used ipam.txt
                If no argument provided, script will prompt for input.
 
 Dependencies:   Python 3.6+
@@ -18,14 +30,18 @@ Dependencies:   Python 3.6+
                - sys
                - datetime
                - json
+               - argparse
+               - csv
+               - heapq
+               - bisect
 
 Author:         Tom Kinsella
 Email:          tkinsella@sisng.io
 Organization:   Personal Project
 
 Creation Date:  2021-12-04
-Last Updated:   2021-12-04
-Version:        1.0.0
+Last Updated:   2026-10-18
+Version:        1.3.1
 
 Change History:
    1.0.0 (2021-12-04) - Initial release
@@ -41,6 +57,33 @@ Change History:
        - Input validation and error handling
        - Interactive mode when no arguments provided
        - Timestamp inclusion in output
+   1.1.0 (2026-10-18) - Batch mode
+       - --batch reads one CIDR/netmask per line from a file or stdin
+       - Integer math with per-prefix lookup tables instead of
+         ipaddress objects for every line
+       - JSONL or CSV output, written in a single pass
+       - Invalid lines are reported on stderr and skipped
+       - A bare dotted netmask (e.g. 255.255.255.0) is now treated as a
+         netmask instead of a /32 host address
+       - Script body moved into main() so the module can be imported
+   1.2.0 (2026-10-18) - Subnet set operations
+       - --aggregate collapses adjacent and overlapping subnets into the
+         minimal list of CIDRs covering the same addresses
+       - --overlaps reports duplicate and nested subnets
+       - --vlsm allocates subnets for a list of host counts from the free
+         space of one or more parent ranges
+       - All three sort once and sweep: O(n log n) in the number of subnets
+   1.3.0 (2026-10-18) - Library use
+       - calculate_subnet_info raises ValueError on invalid input instead
+         of exiting; main() prints the message and exits with status 1
+       - Available as "tools.py subnet"
+   1.3.1 (2026-10-18) - Fixes
+       - Invalid --hosts-file lines (not a number, below 1 or too large
+         for IPv4) are reported on stderr and skipped, like invalid
+         subnet lines, instead of stopping the whole --vlsm run
+       - --vlsm finds the used ranges inside each space by binary search
+         instead of scanning every used range per space
+       - The VLSM note describes the actual allocation order
 
 License:        MIT License
                Copyright (c) 2024 Tom Kinsella
@@ -48,9 +91,16 @@ License:        MIT License
 
 Notes:
    - Supports IPv4 addresses only
-   - All calculations use the ipaddress module for accuracy
+   - Single lookups use the ipaddress module for accuracy; batch mode
+     uses plain integer math and produces identical fields
+   - Batch mode takes the timestamp once per run, not once per line
    - Assumes input is either CIDR notation or dotted decimal netmask
    - Network and broadcast addresses are included in total host count
+   - VLSM requests are sized for usable hosts (total - 2) and allocated
+     largest first, each from the smallest free block that fits (the
+     lowest such block when several are free), which keeps large blocks
+     whole for later requests. Allocations are therefore not always at
+     the lowest free address
 =============================================================================
 """
 
@@ -58,10 +108,95 @@ import ipaddress
 import sys
 import datetime
 import json
+import argparse
+import csv
+import heapq
+import bisect
+
+# Per-prefix lookup tables, indexed by prefix length 0-32
+PREFIX_MASKS = [(0xFFFFFFFF << (32 - p)) & 0xFFFFFFFF for p in range(33)]
+NETMASK_TO_PREFIX = {mask: p for p, mask in enumerate(PREFIX_MASKS)}
+HOSTMASK_TO_PREFIX = {mask ^ 0xFFFFFFFF: p for p, mask in enumerate(PREFIX_MASKS)}
+
+def int_to_ip(value):
+    return f"{value >> 24}.{(value >> 16) & 255}.{(value >> 8) & 255}.{value & 255}"
+
+NETMASK_STRINGS = [int_to_ip(mask) for mask in PREFIX_MASKS]
+WILDCARD_STRINGS = [int_to_ip(mask ^ 0xFFFFFFFF) for mask in PREFIX_MASKS]
+TOTAL_HOSTS = [1 << (32 - p) for p in range(33)]
+
+def ip_to_int(text):
+    # Strict dotted-quad parser matching ipaddress rules (no leading zeros).
+    parts = text.split('.')
+    if len(parts) != 4:
+        raise ValueError(f"Invalid IPv4 address: {text!r}")
+    value = 0
+    for part in parts:
+        if not (part.isascii() and part.isdigit()) or len(part) > 3 or (len(part) > 1 and part[0] == '0'):
+            raise ValueError(f"Invalid IPv4 address: {text!r}")
+        octet = int(part)
+        if octet > 255:
+            raise ValueError(f"Invalid IPv4 address: {text!r}")
+        value = (value << 8) | octet
+    return value
+
+def parse_subnet(input_str):
+    # Parse a CIDR, address/netmask, bare netmask or bare address into
+    # (network address as int, prefix length). Raises ValueError.
+    text = input_str.strip()
+    address, slash, suffix = text.partition('/')
+    ip = ip_to_int(address)
+    if not slash:
+        if ip in NETMASK_TO_PREFIX:
+            return 0, NETMASK_TO_PREFIX[ip]
+        return ip, 32
+    if suffix.isascii() and suffix.isdigit():
+        prefix = int(suffix)
+        if prefix > 32:
+            raise ValueError(f"Invalid prefix length: {suffix!r}")
+    else:
+        mask = ip_to_int(suffix)
+        if mask in NETMASK_TO_PREFIX:
+            prefix = NETMASK_TO_PREFIX[mask]
+        elif mask in HOSTMASK_TO_PREFIX:
+            prefix = HOSTMASK_TO_PREFIX[mask]
+        else:
+            raise ValueError(f"Invalid netmask: {suffix!r}")
+    return ip & PREFIX_MASKS[prefix], prefix
+
+def subnet_fields(network, prefix, timestamp):
+    # Build the calculate_subnet_info dictionary from integer values.
+    broadcast = network | (PREFIX_MASKS[prefix] ^ 0xFFFFFFFF)
+    total_hosts = TOTAL_HOSTS[prefix]
+    first_ip = int_to_ip(network)
+    return {
+        "Date and Time": timestamp,
+        "CIDR Subnet": f"{first_ip}/{prefix}",
+        "Netmask": NETMASK_STRINGS[prefix],
+        "Wildcard Bits": WILDCARD_STRINGS[prefix],
+        "First IP": first_ip,
+        "First IP (Decimal)": network,
+        "Last IP": int_to_ip(broadcast),
+        "Last IP (Decimal)": broadcast,
+        "Total Hosts": total_hosts,
+        "Usable Hosts": total_hosts - 2,
+    }
+
+def is_netmask(input_str):
+    # True for a bare dotted netmask such as 255.255.255.0
+    if '/' in input_str:
+        return False
+    try:
+        return ip_to_int(input_str.strip()) in NETMASK_TO_PREFIX
+    except ValueError:
+        return False
 
 # Function to calculate subnet information
 def calculate_subnet_info(input_str):
     try:
+        # A bare netmask would otherwise parse as a /32 host address
+        if is_netmask(input_str):
+            raise ValueError(input_str)
         # Try parsing as a CIDR subnet
         subnet = ipaddress.IPv4Network(input_str, strict=False)
         is_subnet = True
@@ -71,8 +206,7 @@ def calculate_subnet_info(input_str):
             netmask = ipaddress.IPv4Address(input_str)
             is_subnet = False
         except ValueError:
-            print("Invalid input. Please enter a valid CIDR subnet or netmask.")
-            exit(1)
+            raise ValueError("Invalid input. Please enter a valid CIDR subnet or netmask.")
 
     if is_subnet:
         netmask = subnet.netmask
@@ -100,23 +234,295 @@ def calculate_subnet_info(input_str):
 
     return subnet_info
 
-# Check if an input argument is provided
-if len(sys.argv) > 1:
-    input_arg = sys.argv[1]
-else:
-    # If not provided, prompt the user for the input
-    input_arg = input("Enter a CIDR subnet or netmask: ")
+def calculate_subnet_batch(lines, out, output_format="jsonl", errors=sys.stderr):
+    # Calculate subnet information for every line and write it to out.
+    # Invalid lines are reported to errors and skipped.
+    # Returns (records written, invalid lines).
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    if output_format == "csv":
+        writer = csv.writer(out, lineterminator="\n")
+        header_written = False
+    dumps = json.dumps
+
+    written = invalid = 0
+    for line_number, line in enumerate(lines, 1):
+        text = line.strip()
+        if not text or text.startswith("#"):
+            continue
+        try:
+            network, prefix = parse_subnet(text)
+        except ValueError:
+            errors.write(f"Line {line_number}: invalid CIDR subnet or netmask: {text}\n")
+            invalid += 1
+            continue
+
+        subnet_info = subnet_fields(network, prefix, timestamp)
+        if output_format == "csv":
+            if not header_written:
+                writer.writerow(subnet_info.keys())
+                header_written = True
+            writer.writerow(subnet_info.values())
+        else:
+            out.write(dumps(subnet_info) + "\n")
+        written += 1
 
-# Calculate and report the information
-subnet_info = calculate_subnet_info(input_arg)
+    return written, invalid
+
+def read_subnets(lines, errors=sys.stderr):
+    # Yield (network, prefix) for every valid CIDR/netmask line, reporting
+    # invalid lines to errors. Text after the first comma is ignored.
+    for line_number, line in enumerate(lines, 1):
+        text = line.split(",", 1)[0].strip()
+        if not text or text.startswith("#"):
+            continue
+        try:
+            yield parse_subnet(text)
+        except ValueError:
+            errors.write(f"Line {line_number}: invalid CIDR subnet or netmask: {text}\n")
+
+def read_host_counts(lines, errors=sys.stderr):
+    # Yield the host count on every valid line, reporting invalid lines
+    # (not a number, below 1 or too large for IPv4) to errors. Blank lines
+    # and # comments are skipped.
+    for line_number, line in enumerate(lines, 1):
+        text = line.strip()
+        if not text or text.startswith("#"):
+            continue
+        try:
+            hosts = int(text)
+            prefix_for_hosts(hosts)
+        except ValueError:
+            errors.write(f"Line {line_number}: invalid host count: {text}\n")
+            continue
+        yield hosts
+
+def subnet_range(network, prefix):
+    return network, network | (PREFIX_MASKS[prefix] ^ 0xFFFFFFFF)
+
+def range_to_subnets(start, end):
+    # Split an inclusive address range into the fewest aligned CIDR blocks.
+    subnets = []
+    while start <= end:
+        # Largest block aligned at start that does not run past end
+        size = 1 << (end - start + 1).bit_length() - 1
+        if start:
+            size = min(size, start & -start)
+        subnets.append((start, 32 - size.bit_length() + 1))
+        start += size
+    return subnets
+
+def merge_ranges(ranges):
+    # Merge (start, end) ranges that overlap or touch. Returns a sorted list.
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return merged
+
+def aggregate_subnets(subnets):
+    # Collapse (network, prefix) pairs into the minimal covering CIDR list.
+    result = []
+    for start, end in merge_ranges(subnet_range(n, p) for n, p in subnets):
+        result.extend(range_to_subnets(start, end))
+    return result
+
+def find_overlaps(subnets):
+    # Yield (kind, (network, prefix), (network, prefix)) for every subnet
+    # that duplicates or sits inside another one. Each subnet is reported
+    # against the most specific subnet that contains it.
+    stack = []
+    for network, prefix in sorted(subnets):
+        start, end = subnet_range(network, prefix)
+        while stack and stack[-1][1] < start:
+            stack.pop()
+        if stack:
+            outer = stack[-1][2]
+            kind = "duplicate" if outer == (network, prefix) else "nested"
+            yield kind, (network, prefix), outer
+        stack.append((start, end, (network, prefix)))
+
+def prefix_for_hosts(hosts):
+    # Smallest prefix whose usable host count (total - 2) fits hosts.
+    if hosts < 1:
+        raise ValueError(f"Host count must be at least 1: {hosts}")
+    prefix = 32 - (hosts + 1).bit_length()
+    if prefix < 0:
+        raise ValueError(f"Host count too large for IPv4: {hosts}")
+    return prefix
+
+def allocate_vlsm(spaces, host_counts, used=()):
+    # Allocate one subnet per host count from the free part of spaces.
+    # spaces and used are (network, prefix) pairs. Returns a list with one
+    # (network, prefix) or None per host count, in request order.
+    # Free space is kept as a buddy allocator: one heap of free aligned
+    # blocks per prefix length, so every request costs O(32 log n).
+    free = {prefix: [] for prefix in range(33)}
+    # Merged ranges are disjoint, so their ends are sorted too
+    used_ranges = merge_ranges(subnet_range(n, p) for n, p in used)
+    used_ends = [used_end for _, used_end in used_ranges]
+    for start, end in merge_ranges(subnet_range(n, p) for n, p in spaces):
+        position = start
+        # Walk the used ranges overlapping this space and free the gaps
+        i = bisect.bisect_left(used_ends, start)
+        while i < len(used_ranges) and used_ranges[i][0] <= end:
+            used_start, used_end = used_ranges[i]
+            for block in range_to_subnets(position, used_start - 1):
+                free[block[1]].append(block[0])
+            position = max(position, used_end + 1)
+            i += 1
+        for block in range_to_subnets(position, end):
+            free[block[1]].append(block[0])
+    for heap in free.values():
+        heapq.heapify(heap)
+
+    allocations = [None] * len(host_counts)
+    order = sorted(range(len(host_counts)), key=lambda i: -host_counts[i])
+    for i in order:
+        wanted = prefix_for_hosts(host_counts[i])
+        prefix = wanted
+        while prefix >= 0 and not free[prefix]:
+            prefix -= 1
+        if prefix < 0:
+            continue
+        network = heapq.heappop(free[prefix])
+        # Split the block down to the wanted size, freeing the upper halves
+        while prefix < wanted:
+            prefix += 1
+            heapq.heappush(free[prefix], network | (1 << (32 - prefix)))
+        allocations[i] = (network, prefix)
+    return allocations
+
+def format_subnet(subnet):
+    return f"{int_to_ip(subnet[0])}/{subnet[1]}"
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Calculate subnet information from a CIDR subnet or netmask"
+    )
+    parser.add_argument(
+        "subnet",
+        nargs="?",
+        help="CIDR subnet or netmask (prompted for if omitted)"
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="Read one CIDR subnet or netmask per line from FILE ('-' for stdin)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["jsonl", "csv"],
+        default="jsonl",
+        help="Batch output format (default: jsonl)"
+    )
+    parser.add_argument(
+        "--aggregate",
+        metavar="FILE",
+        help="Print the minimal CIDR list covering every subnet in FILE"
+    )
+    parser.add_argument(
+        "--overlaps",
+        metavar="FILE",
+        help="Report duplicate and nested subnets in FILE"
+    )
+    parser.add_argument(
+        "--vlsm",
+        nargs="+",
+        metavar="SPACE",
+        help="Allocate subnets for --hosts/--hosts-file from these ranges"
+    )
+    parser.add_argument(
+        "--hosts",
+        nargs="+",
+        type=int,
+        default=[],
+        help="Usable host counts to allocate with --vlsm"
+    )
+    parser.add_argument(
+        "--hosts-file",
+        metavar="FILE",
+        help="File with one host count per line for --vlsm"
+    )
+    parser.add_argument(
+        "--used",
+        metavar="FILE",
+        help="Subnets already allocated inside the --vlsm ranges"
+    )
+    args = parser.parse_args()
+
+    if args.aggregate or args.overlaps:
+        path = args.aggregate or args.overlaps
+        with (sys.stdin if path == "-" else open(path)) as f:
+            subnets = list(read_subnets(f))
+        if args.aggregate:
+            for subnet in aggregate_subnets(subnets):
+                print(format_subnet(subnet))
+        else:
+            for kind, inner, outer in find_overlaps(subnets):
+                print(f"{kind},{format_subnet(inner)},{format_subnet(outer)}")
+        return
+
+    if args.vlsm:
+        try:
+            spaces = [parse_subnet(space) for space in args.vlsm]
+        except ValueError as e:
+            print(f"Invalid input. {e}")
+            sys.exit(1)
+        host_counts = list(args.hosts)
+        if args.hosts_file:
+            with open(args.hosts_file) as f:
+                host_counts.extend(read_host_counts(f))
+        used = []
+        if args.used:
+            with open(args.used) as f:
+                used = list(read_subnets(f))
+        try:
+            allocations = allocate_vlsm(spaces, host_counts, used)
+        except ValueError as e:
+            print(f"Invalid input. {e}")
+            sys.exit(1)
+        for hosts, subnet in zip(host_counts, allocations):
+            if subnet is None:
+                print(f"No free space for {hosts} hosts", file=sys.stderr)
+            else:
+                print(f"{hosts},{format_subnet(subnet)}")
+        return
+
+    if args.batch:
+        if args.batch == "-":
+            written, invalid = calculate_subnet_batch(sys.stdin, sys.stdout, args.format)
+        else:
+            with open(args.batch) as f:
+                written, invalid = calculate_subnet_batch(f, sys.stdout, args.format)
+        print(f"Processed {written} subnets, {invalid} invalid lines", file=sys.stderr)
+        return
+
+    # Check if an input argument is provided
+    if args.subnet:
+        input_arg = args.subnet
+    else:
+        # If not provided, prompt the user for the input
+        input_arg = input("Enter a CIDR subnet or netmask: ")
+
+    # Calculate and report the information
+    try:
+        subnet_info = calculate_subnet_info(input_arg)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
 
-# Print information in a table format
-print("\nSubnet Information:")
-for key, value in subnet_info.items():
-    print(f"{key:<20}: {value}")
+    # Print information in a table format
+    print("\nSubnet Information:")
+    for key, value in subnet_info.items():
+        print(f"{key:<20}: {value}")
 
-# Print information in formatted JSON output
-json_output = json.dumps(subnet_info, indent=4)
-print("\nJSON Output:")
-print(json_output)
+    # Print information in formatted JSON output
+    json_output = json.dumps(subnet_info, indent=4)
+    print("\nJSON Output:")
+    print(json_output)
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+=============================================================================
+File:           subnetLookup.py
+Purpose:        Tags IP addresses with the subnet that owns them. Loads a
+               subnet inventory once into a longest-prefix-match index and
+               then answers "which subnet contains this IP" with a single
+               binary search per address. Usable as a library or as a
+               streaming filter over log files.
+
+How to run:     python subnetLookup.py [options] inventory < logfile
+               Options:
+                   --field N: Take the IP from the Nth field (1-based)
+                       instead of the first IPv4 address on the line
+                   --delimiter D: Field delimiter (default: whitespace for
+                       --field, "," for appended output)
+                   --all: Append every containing subnet, most specific
+                       first, instead of only the longest match
+               Inventory format: one CIDR subnet or netmask per line, with
+               an optional label after the first comma.
+               Examples:
+                   python subnetLookup.py subnets.csv < flows.log
+                   cut -d' ' -f3 fw.log | python subnetLookup.py --field 1 subnets.txt
+
+Dependencies:   Python 3.6+
+               - argparse
+               - bisect
+               - re
+               - subnet.py (same directory)
+
+Author:         Tom Kinsella
+Email:          tkinsella@sisng.io
+Organization:   Personal Project
+
+Creation Date:  2026-10-18
+Last Updated:   2026-10-18
+Version:        1.0.1
+
+Change History:
+   1.0.0 (2026-10-18) - Initial release
+       - SubnetIndex with longest-prefix-match and all-matches lookups
+       - Nested subnets flattened into sorted, non-overlapping ranges
+       - Streaming stdin filter that appends the owning subnet and label
+   1.0.1 (2026-10-18) - Fixes
+       - IPs are parsed with the strict subnet.py parser; legacy forms
+         such as 010.0.0.1 (octal) or 10 (0.0.0.10) are no longer
+         silently tagged with the wrong subnet
+       - Labels containing the delimiter or quotes are CSV-quoted
+
+License:        MIT License
+               Copyright (c) 2024 Tom Kinsella
+               See LICENSE file for full license text
+
+Notes:
+   - Supports IPv4 only, like subnet.py
+   - Subnet parsing uses the integer helpers from subnet.py
+   - Lines without an IP, or with an IP outside every subnet, get an
+     empty subnet column. So do zero-padded addresses (010.000.000.001),
+     which are rejected like in subnet.py rather than read as octal
+=============================================================================
+"""
+
+import re
+import sys
+import argparse
+from bisect import bisect_right
+
+from subnet import PREFIX_MASKS, parse_subnet, int_to_ip, ip_to_int
+
+IPV4_PATTERN = re.compile(r'(?<![\d.])(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})(?![\d.])')
+
+class SubnetIndex:
+    """Longest-prefix-match index over a set of IPv4 subnets"""
+
+    def __init__(self, subnets=()):
+        # subnets: iterable of (subnet string, label) pairs
+        self.subnets = []           # (network, prefix, cidr, label)
+        self._starts = []
+        self._owners = []
+        self._by_prefix = {}
+        for subnet, label in subnets:
+            self.add(subnet, label)
+        self.build()
+
+    def add(self, subnet, label=None):
+        """Add a subnet; call build() before looking anything up"""
+        network, prefix = parse_subnet(subnet)
+        self.subnets.append((network, prefix, f"{int_to_ip(network)}/{prefix}", label))
+
+    def build(self):
+        """Flatten the subnets into sorted non-overlapping ranges"""
+        # Sort parents before the subnets nested inside them, then sweep with
+        # a stack of open subnets. Each emitted range starts at _starts[i] and
+        # belongs to _owners[i] (an index into self.subnets, or -1 for none).
+        order = sorted(range(len(self.subnets)),
+                       key=lambda i: (self.subnets[i][0], self.subnets[i][1]))
+        starts, owners, stack = [], [], []
+        position = 0
+
+        def emit(start, owner):
+            if starts and starts[-1] == start:
+                owners[-1] = owner
+            else:
+                starts.append(start)
+                owners.append(owner)
+
+        def close_until(limit):
+            # Pop every open subnet that ends before limit
+            nonlocal position
+            while stack and stack[-1][0] < limit:
+                end, owner = stack.pop()
+                if position <= end:
+                    emit(position, owner)
+                position = end + 1
+
+        for i in order:
+            network, prefix = self.subnets[i][:2]
+            end = network | (PREFIX_MASKS[prefix] ^ 0xFFFFFFFF)
+            close_until(network)
+            if position < network:
+                emit(position, stack[-1][1] if stack else -1)
+            stack.append((end, i))
+            position = network
+        close_until(1 << 32)
+        if position <= 0xFFFFFFFF:
+            emit(position, -1)
+        if not starts or starts[0] != 0:
+            starts.insert(0, 0)
+            owners.insert(0, -1)
+
+        self._starts = starts
+        self._owners = owners
+        self._by_prefix = {}
+        for network, prefix, cidr, label in self.subnets:
+            self._by_prefix.setdefault(prefix, {})[network] = (cidr, label)
+        self._prefixes = sorted(self._by_prefix, reverse=True)
+
+    def lookup_int(self, ip):
+        """Return (cidr, label) of the longest match for an integer IP, or None"""
+        owner = self._owners[bisect_right(self._starts, ip) - 1]
+        if owner < 0:
+            return None
+        subnet = self.subnets[owner]
+        return subnet[2], subnet[3]
+
+    def lookup(self, ip):
+        """Return (cidr, label) of the longest match for a dotted IP, or
+        None. Raises ValueError unless ip is a strict dotted quad."""
+        return self.lookup_int(ip_to_int(ip))
+
+    def lookup_all(self, ip):
+        """Return every (cidr, label) containing a dotted IP, most specific first"""
+        value = ip_to_int(ip)
+        return [
+            self._by_prefix[prefix][value & PREFIX_MASKS[prefix]]
+            for prefix in self._prefixes
+            if value & PREFIX_MASKS[prefix] in self._by_prefix[prefix]
+        ]
+
+def load_inventory(lines):
+    # Yield (subnet, label) pairs from "CIDR[,label]" lines, skipping comments
+    for line in lines:
+        text = line.strip()
+        if not text or text.startswith('#'):
+            continue
+        subnet, _, label = text.partition(',')
+        yield subnet.strip(), label.strip()
+
+def extract_ip(line, field=None, delimiter=None):
+    # Return the IP on a log line: the given 1-based field or the first IPv4
+    if field is not None:
+        fields = line.split(delimiter)
+        return fields[field - 1] if len(fields) >= field else None
+    match = IPV4_PATTERN.search(line)
+    return match.group(1) if match else None
+
+def quote_field(value, sep):
+    # CSV-quote a field that contains the separator, a quote or a newline
+    if sep in value or '"' in value or '\n' in value or '\r' in value:
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+def tag_lines(index, lines, out, field=None, delimiter=None, all_matches=False):
+    # Append the owning subnet and label to every line read from lines.
+    sep = delimiter or ','
+    lookup = index.lookup
+    quoted = {}
+    for line in lines:
+        line = line.rstrip('\n')
+        ip = extract_ip(line, field, delimiter)
+        matches = []
+        if ip is not None:
+            try:
+                matches = index.lookup_all(ip) if all_matches else [lookup(ip)]
+            except ValueError:
+                pass
+        tags = []
+        for match in matches:
+            if match:
+                if match not in quoted:
+                    quoted[match] = f"{match[0]}{sep}{quote_field(match[1], sep)}"
+                tags.append(quoted[match])
+        out.write(f"{line}{sep}{sep.join(tags) if tags else sep}\n")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Tag IP addresses read from stdin with their owning subnet"
+    )
+    parser.add_argument("inventory", help="Subnet inventory file (CIDR[,label] per line)")
+    parser.add_argument("--field", type=int, help="1-based field holding the IP")
+    parser.add_argument("--delimiter", help="Field delimiter (default: whitespace / ',')")
+    parser.add_argument("--all", action="store_true", help="Append every containing subnet")
+    args = parser.parse_args()
+
+    with open(args.inventory) as f:
+        index = SubnetIndex(load_inventory(f))
+
+    try:
+        tag_lines(index, sys.stdin, sys.stdout, args.field, args.delimiter, args.all)
+    except BrokenPipeError:
+        sys.stderr.close()
+
+if __name__ == "__main__":
+    main()
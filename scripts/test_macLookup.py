@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+=============================================================================
+File:           test_macLookup.py
+Purpose:        Tests for macLookup.py bulk tagging. Compiles a small IEEE
+               registry into a temporary index and checks the lines that
+               tag_lines() writes.
+
+How to run:     python -m unittest test_macLookup     (from scripts/)
+               python -m pytest scripts/test_macLookup.py
+
+Dependencies:   Python 3.6+
+               - io
+               - tempfile
+               - unittest
+               - macLookup.py (same directory)
+
+Author:         Tom Kinsella
+Email:          tkinsella@sisng.io
+Organization:   Personal Project
+
+Creation Date:  2026-10-18
+Last Updated:   2026-10-18
+Version:        1.0.0
+
+License:        MIT License
+               Copyright (c) 2024 Tom Kinsella
+               See LICENSE file for full license text
+
+Notes:
+   - Needs no registry download; the test registry is written on the fly
+=============================================================================
+"""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from macLookup import OuiIndex, compile_index, tag_lines
+
+REGISTRY = (
+    'Registry,Assignment,Organization Name,Organization Address\n'
+    'MA-L,005056,"VMware, Inc.",3401 Hillview Avenue PALO ALTO CA US 94304\n'
+    'MA-L,3C5AB4,Google LLC,1600 Amphitheatre Parkway Mountain View CA US 94043\n'
+)
+
+class TagLinesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        registry_path = os.path.join(self.workdir.name, 'oui.csv')
+        with open(registry_path, 'w') as f:
+            f.write(REGISTRY)
+        index_path = os.path.join(self.workdir.name, 'oui.idx')
+        compile_index([registry_path], index_path)
+        self.index = OuiIndex(index_path)
+
+    def tearDown(self):
+        self.index.close()
+        self.workdir.cleanup()
+
+    def tag(self, lines, **options):
+        out = io.StringIO()
+        tag_lines(self.index, lines, out, **options)
+        return out.getvalue().splitlines()
+
+    def test_csv_line_keeps_its_columns(self):
+        lines = ['10.0.0.1,00:50:56:aa:bb:cc,eth0\n', '10.0.0.2,3c:5a:b4:00:00:01,eth1\n']
+        self.assertEqual(self.tag(lines), [
+            '10.0.0.1,00:50:56:aa:bb:cc,eth0,"VMware, Inc."',
+            '10.0.0.2,3c:5a:b4:00:00:01,eth1,Google LLC',
+        ])
+
+    def test_unknown_and_missing_mac(self):
+        self.assertEqual(self.tag(['10.0.0.3,02:00:00:00:00:01\n', 'no mac here\n']), [
+            '10.0.0.3,02:00:00:00:00:01,',
+            'no mac here,',
+        ])
+
+    def test_field_and_delimiter(self):
+        lines = ['eth0\t10.0.0.1\t00-50-56-aa-bb-cc\n']
+        self.assertEqual(self.tag(lines, field=3, delimiter='\t'), [
+            'eth0\t10.0.0.1\t00-50-56-aa-bb-cc\tVMware, Inc.',
+        ])
+
+if __name__ == "__main__":
+    unittest.main()
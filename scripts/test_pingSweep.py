@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+=============================================================================
+File:           test_pingSweep.py
+Purpose:        Loopback tests for pingSweep.py. Starts asyncio listeners
+               on 127.0.0.1 and checks the TCP-connect probe results and
+               the deduplication of overlapping targets.
+
+How to run:     python -m unittest test_pingSweep     (from scripts/)
+               python -m pytest scripts/test_pingSweep.py
+
+Dependencies:   Python 3.8+
+               - asyncio
+               - socket
+               - unittest
+               - pingSweep.py (same directory)
+
+Author:         Tom Kinsella
+Email:          tkinsella@sisng.io
+Organization:   Personal Project
+
+Creation Date:  2026-10-18
+Last Updated:   2026-10-18
+Version:        1.0.0
+
+License:        MIT License
+               Copyright (c) 2024 Tom Kinsella
+               See LICENSE file for full license text
+
+Notes:
+   - Needs no privileges and no network beyond the loopback interface;
+     ICMP is not exercised
+=============================================================================
+"""
+
+import os
+import sys
+import socket
+import asyncio
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pingSweep import expand_targets, sweep, tcp_probe
+
+def free_port():
+    # A loopback port with nothing listening on it
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+class LoopbackSweepTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.connections = 0
+
+        def connected(reader, writer):
+            self.connections += 1
+            writer.close()
+
+        self.server = await asyncio.start_server(connected, '127.0.0.1', 0)
+        self.open_port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def test_open_port(self):
+        method = await tcp_probe('127.0.0.1', [self.open_port], 1.0)
+        self.assertEqual(method, f"tcp/{self.open_port}")
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.connections, 1)
+
+    async def test_closed_port_counts_as_live(self):
+        # A reset (connection refused) proves the host is up
+        closed_port = free_port()
+        method = await tcp_probe('127.0.0.1', [closed_port], 1.0)
+        self.assertEqual(method, f"tcp/{closed_port}")
+
+    async def test_no_ports(self):
+        self.assertIsNone(await tcp_probe('127.0.0.1', [], 1.0))
+
+    async def test_overlapping_targets_probed_once(self):
+        targets = ['127.0.0.0/30', '127.0.0.1-127.0.0.3', '127.0.0.2']
+        hosts = list(expand_targets(targets))
+        self.assertEqual(hosts, ['127.0.0.1', '127.0.0.2', '127.0.0.3'])
+
+        rows = [row async for row in sweep(expand_targets(targets), [self.open_port], timeout=1.0)]
+        self.assertEqual(sorted(ip for ip, _, _ in rows), hosts)
+        self.assertTrue(all(method == f"tcp/{self.open_port}" for _, method, _ in rows))
+        # Only 127.0.0.1 has the listener, and it was connected to once
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.connections, 1)
+
+    async def test_concurrency_smaller_than_hosts(self):
+        targets = ['127.0.1.0/26']
+        rows = [row async for row in sweep(expand_targets(targets), [free_port()], timeout=1.0, concurrency=4)]
+        self.assertEqual(len(rows), 62)
+        self.assertEqual(len({ip for ip, _, _ in rows}), 62)
+
+if __name__ == "__main__":
+    unittest.main()
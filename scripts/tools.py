@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+=============================================================================
+File:           tools.py
+Purpose:        Single entry point for the scripts in this directory. Each
+               subcommand is the main() of one script, imported only when
+               that subcommand runs, so light commands start as fast as the
+               script they wrap.
+
+How to run:     python tools.py <command> [options]
+               python tools.py <command> --help
+               Commands:
+                   subnet     Subnet calculator (subnet.py)
+                   lookup     Tag IPs with their subnet (subnetLookup.py)
+                   perms      Permission converter and audit (perms.py)
+                   nmap       Parse nmap output (nmapFormat.py)
+                   nmap-diff  Compare two nmap scans (nmapDiff.py)
+                   nmap-index Index many nmap scans (nmapIndex.py)
+                   sweep      Host discovery (pingSweep.py)
+                   mac        MAC vendor lookup (macLookup.py)
+                   tree       Directory tree (ftg.py)
+                   creds      Usernames and passwords (userPass.py)
+                   employees  Synthetic employee data (employeeGenerator.py)
+                   daemon     Resident lookup server and client (toolsd.py)
+               Examples:
+                   python tools.py subnet 10.0.0.0/22
+                   python tools.py perms 755
+                   nmap -p- 10.0.0.0/24 | python tools.py nmap --format csv
+                   alias tools="python /opt/tools/scripts/tools.py"
+
+Dependencies:   Python 3.6+
+               - importlib
+               - The script behind each command and its dependencies
+
+Author:         Tom Kinsella
+Email:          tkinsella@sisng.io
+Organization:   Personal Project
+
+Creation Date:  2026-10-18
+Last Updated:   2026-10-18
+Version:        1.1.0
+
+Change History:
+   1.0.0 (2026-10-18) - Initial release
+       - One CLI over every script, with lazy per-command imports
+       - TOOLS_TIMING=1 reports import and run time on stderr
+   1.1.0 (2026-10-18) - Daemon
+       - "daemon" command for toolsd.py
+
+License:        MIT License
+               Copyright (c) 2024 Tom Kinsella
+               See LICENSE file for full license text
+
+Notes:
+   - The scripts stay standalone; "python subnet.py ..." and "python
+     tools.py subnet ..." take the same options
+   - Importing any script only defines functions and lookup tables; no
+     script parses arguments, reads stdin, exits or imports pandas/numpy
+     until its main() or an export function is called
+   - Startup, median wall time with a bytecode cache (interpreter alone
+     13 ms): help 14 ms, creds 34 ms, mac 36 ms, subnet 39 ms, perms
+     44 ms, nmap 45 ms, tree 49 ms. sweep (asyncio) and employees (data
+     tables) are heavier by nature. With PYTHONDONTWRITEBYTECODE set every
+     script is recompiled on each run, which adds 10-20 ms
+=============================================================================
+"""
+
+import os
+import sys
+import time
+import importlib
+
+# command -> (module, one-line description)
+COMMANDS = {
+    'subnet': ('subnet', 'Subnet calculator'),
+    'lookup': ('subnetLookup', 'Tag IPs with their subnet'),
+    'perms': ('perms', 'Permission converter and audit'),
+    'nmap': ('nmapFormat', 'Parse nmap output'),
+    'nmap-diff': ('nmapDiff', 'Compare two nmap scans'),
+    'nmap-index': ('nmapIndex', 'Index many nmap scans'),
+    'sweep': ('pingSweep', 'Host discovery'),
+    'mac': ('macLookup', 'MAC vendor lookup'),
+    'tree': ('ftg', 'Directory tree'),
+    'creds': ('userPass', 'Usernames and passwords'),
+    'employees': ('employeeGenerator', 'Synthetic employee data'),
+    'daemon': ('toolsd', 'Resident lookup server and client'),
+}
+
+def usage():
+    lines = ["usage: tools <command> [options]", "", "commands:"]
+    for command, (module, description) in COMMANDS.items():
+        lines.append(f"  {command:<11} {description} ({module}.py)")
+    lines.append("")
+    lines.append("Run 'tools <command> --help' for the options of a command.")
+    return '\n'.join(lines)
+
+def load_command(command):
+    # Import and return the module behind a command. Raises KeyError.
+    module, _ = COMMANDS[command]
+    here = os.path.dirname(os.path.abspath(__file__))
+    if here not in sys.path:
+        sys.path.insert(0, here)
+    return importlib.import_module(module)
+
+def run(argv):
+    # Run a command line (without the program name). Returns an exit code.
+    if not argv or argv[0] in ('-h', '--help', 'help'):
+        try:
+            print(usage())
+        except BrokenPipeError:
+            sys.stderr.close()
+        return 0
+    command, args = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"Error: Unknown command '{command}'\n", file=sys.stderr)
+        print(usage(), file=sys.stderr)
+        return 2
+
+    timing = os.environ.get('TOOLS_TIMING')
+    started = time.perf_counter()
+    module = load_command(command)
+    imported = time.perf_counter()
+
+    # The command's argparse parser reads sys.argv and names itself after
+    # sys.argv[0]
+    sys.argv = [f"tools {command}", *args]
+    try:
+        module.main()
+    finally:
+        if timing:
+            finished = time.perf_counter()
+            print(f"[tools] {command}: import {(imported - started) * 1000:.1f} ms, "
+                  f"run {(finished - imported) * 1000:.1f} ms", file=sys.stderr)
+    return 0
+
+def main():
+    sys.exit(run(sys.argv[1:]))
+
+if __name__ == "__main__":
+    main()
@@ -7,21 +7,53 @@ Purpose:        Generates secure usernames and passwords following specific
                passwords are 16 characters with specific character type
                requirements while avoiding ambiguous characters.
 
-How to run:     python userPass.py
+How to run:     python userPass.py [options]
                Outputs generated username and password with analysis of
                password composition.
+               Options:
+                   --count N: Generate N credentials in bulk
+                   --format {csv,jsonl}: Bulk output format (default: csv)
+                   --output FILE: Write bulk output to FILE
+                   --registry FILE: Bitmap of issued usernames. Bulk
+                       usernames are checked against it and recorded, so
+                       they stay unique across runs (they are always unique
+                       within a run)
+                   --benchmark N: Generate N credentials and report the
+                       rate in credentials per second
+               Examples:
+                   python userPass.py --count 500000 --output lab_users.csv
+                   python userPass.py --count 500000 --registry issued.bitmap
+                   python userPass.py --audit dump.txt --policy policy.json \
+                       --workers 8 --violations bad.csv
+               Audit options:
+                   --audit FILE: Check every line of FILE against the policy
+                       and print per-rule statistics
+                   --policy FILE: JSON policy, e.g.
+                       {"length": [12, 64], "uppercase": [1, null],
+                        "digits": [1, null], "symbols": [1, null]}
+                       (default: the generator policy described below)
+                   --workers N: Audit processes (default: CPU count)
+                   --violations FILE: Write line,failed_rules CSV rows
+                   python userPass.py --benchmark 100000
 
 Dependencies:   Python 3.6+
-               - random
+               - os
                - string
+               - argparse
+               - csv
+               - json
+               - time
+               - concurrent.futures
+               - mmap
+               - secrets
 
 Author:         Tom Kinsella
 Email:          tkinsella@sisng.io
 Organization:   Personal Project
 
 Creation Date:  2019-02-12
-Last Updated:   2019-02-12
-Version:        1.0.0
+Last Updated:   2026-10-18
+Version:        1.4.1
 
 Change History:
    1.0.0 (2019-02-12) - Initial release
@@ -38,6 +70,40 @@ Change History:
        - Password verification system
        - Detailed password analysis output
        - Object-oriented design with CredentialGenerator class
+   1.1.0 (2026-10-18) - Bulk generation
+       - Randomness now comes from os.urandom, read in 64 KB blocks and
+         turned into unbiased indexes by rejection sampling
+       - Passwords meet the requirements by construction; the recursive
+         retry is gone
+       - generate_credentials() batch API and --count/--format/--output
+       - --benchmark reports credentials per second
+   1.2.0 (2026-10-18) - Unique usernames
+       - UsernameRegistry keeps one bit per possible username in a
+         memory-mapped file (about 37 MB for all 24^2 * 9^6 usernames)
+       - --registry makes bulk usernames unique within and across runs
+   1.3.0 (2026-10-18) - Password policies
+       - PasswordPolicy describes length and per-class min/max counts and
+         is shared by generation and verification
+       - Policies compile to a str.translate table, so a password is
+         classified in one C-level pass
+       - --audit streams a password file through a process pool and
+         reports per-rule violation counts
+   1.4.0 (2026-10-18) - Startup time
+       - concurrent.futures is imported only by --audit
+       - Available as "tools.py creds"
+   1.4.1 (2026-10-18) - Fixes
+       - Bulk usernames are unique within every run; without --registry
+         the issued-username bitmap is kept in anonymous memory
+       - Policies with a maximum below the minimum, or a minimum count of
+         "other" characters, are rejected when loaded instead of failing
+         or hanging during generation
+       - Lengths over 256 characters no longer hang the random source
+       - --policy applies to single credentials and --benchmark too
+       - --audit reports an unreadable password file or violations file
+         as a one-line error and exits 1; the violations file is only
+         created once the password file has been opened
+       - SecureRandomBuffer takes the byte source as an argument, so the
+         benchmark harness can run it from a seed
 
 License:        MIT License
                Copyright (c) 2024 Tom Kinsella
@@ -46,71 +112,439 @@ License:        MIT License
 Notes:
    - Excludes similar-looking characters (I, O, 0, l)
    - Passwords always contain minimum required characters
-   - Uses cryptographically secure random number generator
+   - Uses cryptographically secure random number generator (os.urandom)
    - Includes verification to ensure all requirements are met
-   - Recursively generates new password if requirements not met
+   - Usernames never repeat within a run; --registry extends that across
+     runs. The in-memory bitmap reserves about 37 MB of address space but
+     only the pages that hold issued usernames are ever allocated
+   - Character classes for policies use the same sets as generation, so
+     I, O, 0 and l count as "other" characters
+   - Audited passwords are never written out, only their line numbers
 =============================================================================
 """
 
-import random
+import os
+import sys
+import csv
+import json
+import time
 import string
+import mmap
+import secrets
+import argparse
+from collections import Counter, deque
+
+class SecureRandomBuffer:
+    """Unbiased small random integers drawn from buffered os.urandom bytes.
+    source(n) returns n random bytes; only override it for reproducible
+    test or benchmark runs."""
+
+    def __init__(self, buffer_size=65536, source=os.urandom):
+        self.buffer_size = buffer_size
+        self.source = source
+        self._buffer = b""
+        self._position = 0
+
+    def below(self, n):
+        """Return a random integer in range(n), for n >= 1"""
+        if n > 256:
+            # One byte cannot cover the range; randbelow is unbiased too
+            return secrets.randbelow(n)
+        if n < 1:
+            raise ValueError(f"Cannot draw below {n}")
+        # Reject bytes past the largest multiple of n to avoid modulo bias
+        limit = 256 - 256 % n
+        while True:
+            if self._position >= len(self._buffer):
+                self._buffer = self.source(self.buffer_size)
+                self._position = 0
+            value = self._buffer[self._position]
+            self._position += 1
+            if value < limit:
+                return value % n
+
+    def choices(self, population, k):
+        n = len(population)
+        return [population[self.below(n)] for _ in range(k)]
+
+    def shuffle(self, items):
+        # Fisher-Yates
+        for i in range(len(items) - 1, 0, -1):
+            j = self.below(i + 1)
+            items[i], items[j] = items[j], items[i]
+
+# Character classes, excluding similar-looking characters
+CHARACTER_CLASSES = {
+    "uppercase": ''.join(sorted(set(string.ascii_uppercase) - set('IO'))),
+    "lowercase": ''.join(sorted(set(string.ascii_lowercase) - set('l'))),
+    "digits": ''.join(sorted(set(string.digits) - set('0'))),
+    "symbols": '!@#$%^&*()_+-=[]{}|;:,.<>?',
+}
+
+class PasswordPolicy:
+    """Length and per-character-class count limits for passwords"""
+
+    # Class markers used in the compiled translate table
+    _MARKERS = {name: chr(i + 1) for i, name in enumerate(CHARACTER_CLASSES)}
+
+    def __init__(self, length=(16, 16), uppercase=(3, 5), digits=(3, None),
+                 symbols=(3, None), lowercase=(0, None), other=(0, None)):
+        # Each limit is a (minimum, maximum) pair; a maximum of None means
+        # no upper bound. "other" covers characters outside every class.
+        self.length = tuple(length)
+        self.classes = {
+            "uppercase": tuple(uppercase),
+            "lowercase": tuple(lowercase),
+            "digits": tuple(digits),
+            "symbols": tuple(symbols),
+        }
+        self.other = tuple(other)
+        self.rules = ["length", *self.classes, "other"]
+        for rule, (low, high) in (("length", self.length), *self.classes.items(), ("other", self.other)):
+            if low < 0 or (high is not None and high < low):
+                raise ValueError(f"Invalid limits for {rule}: [{low}, {high}]")
+        self._plan = None
+
+        # Compile: every class character maps to its class marker and the
+        # marker characters themselves map to "other", so one translate()
+        # plus a count() per class classifies a whole password in C
+        table = {ord(marker): "\x00" for marker in self._MARKERS.values()}
+        for name, chars in CHARACTER_CLASSES.items():
+            for c in chars:
+                table[ord(c)] = self._MARKERS[name]
+        self._table = table
+        self._checks = [(name, self._MARKERS[name], low, high)
+                        for name, (low, high) in self.classes.items()
+                        if low > 0 or high is not None]
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a policy from {"length": [min, max], "digits": [min, max], ...}"""
+        unknown = set(data) - {"length", "other", *CHARACTER_CLASSES}
+        if unknown:
+            raise ValueError(f"Unknown policy rules: {', '.join(sorted(unknown))}")
+        return cls(**{name: tuple(limits) for name, limits in data.items()})
+
+    def violations(self, password):
+        """Return the names of the rules the password breaks"""
+        failed = []
+        length = len(password)
+        low, high = self.length
+        if length < low or (high is not None and length > high):
+            failed.append("length")
+
+        classified = password.translate(self._table)
+        for name, marker, low, high in self._checks:
+            count = classified.count(marker)
+            if count < low or (high is not None and count > high):
+                failed.append(name)
+
+        low, high = self.other
+        if low > 0 or high is not None:
+            other = length - sum(classified.count(m) for m in self._MARKERS.values())
+            if other < low or (high is not None and other > high):
+                failed.append("other")
+        return failed
+
+    def is_valid(self, password):
+        return not self.violations(password)
+
+    def _generation_plan(self):
+        # Work out once which classes get an exact count and which share
+        # the fill characters, and check the policy can be satisfied
+        if self.other[0] > 0:
+            raise ValueError("Password policy cannot be satisfied: passwords are never generated with 'other' characters")
+        length = self.length[1] or self.length[0]
+        bounded = [(name, low, high - low + 1) for name, (low, high) in self.classes.items() if high is not None]
+        unbounded = [name for name, (_, high) in self.classes.items() if high is None]
+        reserved = {name: self.classes[name][0] for name in unbounded}
+        minimum = sum(reserved.values()) + sum(low for _, low, _ in bounded)
+        maximum = sum(low + span - 1 for _, low, span in bounded)
+        if self.length[0] > length or minimum > length or (not unbounded and maximum < length):
+            raise ValueError("Password policy cannot be satisfied")
+        fill_chars = ''.join(CHARACTER_CLASSES[name] for name in unbounded)
+        return length - sum(reserved.values()), bounded, reserved, bool(unbounded), fill_chars
+
+    def check_generation(self):
+        """Raise ValueError if no password can be generated under the policy"""
+        if self._plan is None:
+            self._plan = self._generation_plan()
+
+    def plan(self, rng):
+        """Pick per-class counts for a new password. Returns (counts, fill
+        count, fill characters): counts holds the exact or minimum count per
+        class, the fill characters come from the classes without a maximum."""
+        self.check_generation()
+        free, bounded, reserved, has_fill, fill_chars = self._plan
+
+        # Bounded classes get a uniform count in their range; retry the
+        # draw (not the password) in the rare case they do not fit
+        for _ in range(1000):
+            counts = {name: low + rng.below(span) for name, low, span in bounded}
+            fill = free - sum(counts.values())
+            if fill >= 0 and (has_fill or fill == 0):
+                counts.update(reserved)
+                return counts, fill, fill_chars
+        raise ValueError("Password policy cannot be satisfied")
+
+def _audit_init(policy):
+    global _audit_policy
+    _audit_policy = policy
+
+def _audit_chunk(job):
+    # Worker: check a chunk of (line number, password) pairs
+    stats = Counter()
+    failures = []
+    violations = _audit_policy.violations
+    for line_number, password in job:
+        failed = violations(password)
+        if failed:
+            stats.update(failed)
+            failures.append((line_number, failed))
+    return len(job), stats, failures
+
+def audit_passwords(lines, policy, workers=None, chunk_size=50000, on_violation=None):
+    """Check passwords (one per line) against policy on a process pool.
+    Calls on_violation(line number, failed rules) in input order and
+    returns (passwords checked, passwords failed, per-rule Counter)."""
+    def chunks():
+        chunk = []
+        for line_number, line in enumerate(lines, 1):
+            chunk.append((line_number, line.rstrip("\r\n")))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    total = failed = 0
+    stats = Counter()
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers, initializer=_audit_init, initargs=(policy,)) as pool:
+        pending = deque()
+        limit = (workers or os.cpu_count() or 1) * 2
+
+        def collect():
+            nonlocal total, failed
+            count, chunk_stats, failures = pending.popleft().result()
+            total += count
+            failed += len(failures)
+            stats.update(chunk_stats)
+            if on_violation:
+                for line_number, rules in failures:
+                    on_violation(line_number, rules)
+
+        # Keep a bounded number of chunks in flight so memory stays flat
+        for chunk in chunks():
+            pending.append(pool.submit(_audit_chunk, chunk))
+            if len(pending) >= limit:
+                collect()
+        while pending:
+            collect()
+    return total, failed, stats
 
 class CredentialGenerator:
-    def __init__(self):
+    def __init__(self, rng=None, policy=None):
         # Define character sets, excluding similar-looking characters
-        self.letters = list(set(string.ascii_uppercase) - set('IO'))
-        self.digits = list(set(string.digits) - set('0'))
-        self.lowercase = list(set(string.ascii_lowercase) - set('l'))
-        self.symbols = list('!@#$%^&*()_+-=[]{}|;:,.<>?')
+        self.letters = list(CHARACTER_CLASSES["uppercase"])
+        self.digits = list(CHARACTER_CLASSES["digits"])
+        self.lowercase = list(CHARACTER_CLASSES["lowercase"])
+        self.symbols = list(CHARACTER_CLASSES["symbols"])
+        self.policy = policy or PasswordPolicy()
+        self.rng = rng or SecureRandomBuffer()
         
     def generate_username(self):
         """Generate username in format XX000000"""
-        letters = ''.join(random.choices(self.letters, k=2))
-        numbers = ''.join(random.choices(self.digits, k=6))
+        letters = ''.join(self.rng.choices(self.letters, k=2))
+        numbers = ''.join(self.rng.choices(self.digits, k=6))
         return f"{letters}{numbers}"
     
     def generate_password(self):
-        """Generate a 16-character password meeting all requirements"""
-        # Generate exactly between 3-5 uppercase letters
-        num_uppercase = random.randint(3, 5)
-        
-        # Calculate remaining characters needed
-        remaining_length = 16 - num_uppercase
-        
-        # Ensure minimum requirements for other character types
-        password_chars = (
-            random.choices(self.letters, k=num_uppercase) +     # 3-5 uppercase
-            random.choices(self.digits, k=3) +                  # 3 numbers
-            random.choices(self.symbols, k=3) +                 # 3 symbols
-            random.choices(                                     # remaining chars from lowercase, digits, and symbols
-                self.lowercase + self.digits + self.symbols,
-                k=remaining_length - 6                          # -6 for the numbers and symbols above
-            )
-        )
+        """Generate a password meeting all policy requirements (by default
+        16 characters, 3-5 uppercase, at least 3 numbers and 3 symbols)"""
+        rng = self.rng
+        # Exact counts for classes with a maximum (3-5 uppercase by default)
+        # and minimums for the rest; the remaining characters come only from
+        # classes without a maximum, so every password built here passes
+        # _verify_password without a retry.
+        counts, fill, fill_chars = self.policy.plan(rng)
+        password_chars = []
+        for name, count in counts.items():
+            password_chars += rng.choices(CHARACTER_CLASSES[name], k=count)
+        password_chars += rng.choices(fill_chars, k=fill)
         
         # Shuffle the characters
-        random.shuffle(password_chars)
-        
-        # Verify the password meets requirements
-        password = ''.join(password_chars)
-        if not self._verify_password(password):
-            return self.generate_password()  # Try again if requirements not met
-            
-        return password
+        rng.shuffle(password_chars)
+        return ''.join(password_chars)
+
+    def generate_credentials(self, count, registry=None):
+        """Yield count (username, password) pairs with unique usernames.
+        A registry also keeps them unique across runs."""
+        run_registry = None
+        if registry is None:
+            registry = run_registry = UsernameRegistry(None, self)
+        try:
+            for _ in range(count):
+                yield registry.allocate(), self.generate_password()
+        finally:
+            if run_registry:
+                run_registry.close()
     
     def _verify_password(self, password):
         """Verify the password meets all requirements"""
-        uppercase_count = sum(1 for c in password if c in self.letters)
-        digit_count = sum(1 for c in password if c in self.digits)
-        symbol_count = sum(1 for c in password if c in self.symbols)
-        
-        return (len(password) == 16 and
-                3 <= uppercase_count <= 5 and
-                digit_count >= 3 and
-                symbol_count >= 3)
+        return self.policy.is_valid(password)
 
-def main():
-    generator = CredentialGenerator()
+class UsernameRegistry:
+    """Memory-mapped bitmap of issued XX000000 usernames, kept in a file
+    or, with path None, in anonymous memory for a single run"""
+
+    # Random draws before falling back to scanning for a free bit
+    MAX_DRAWS = 64
+
+    def __init__(self, path, generator):
+        self.generator = generator
+        self._letter_index = {c: i for i, c in enumerate(generator.letters)}
+        self._digit_index = {c: i for i, c in enumerate(generator.digits)}
+        self.size = len(generator.letters) ** 2 * len(generator.digits) ** 6
+        nbytes = (self.size + 7) // 8
+
+        if path is None:
+            self._file = None
+            self._bitmap = mmap.mmap(-1, nbytes)
+            return
+
+        # A new registry is a sparse zero-filled file of the bitmap size
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.truncate(nbytes)
+        self._file = open(path, "r+b")
+        if os.fstat(self._file.fileno()).st_size != nbytes:
+            self._file.close()
+            raise ValueError(f"{path} is not a username registry ({nbytes} bytes expected)")
+        self._bitmap = mmap.mmap(self._file.fileno(), nbytes)
+
+    def index_of(self, username):
+        """Position of a username in the bitmap"""
+        index = self._letter_index[username[0]] * len(self._letter_index) + self._letter_index[username[1]]
+        base = len(self._digit_index)
+        for c in username[2:]:
+            index = index * base + self._digit_index[c]
+        return index
+
+    def username_of(self, index):
+        """Username stored at a bitmap position"""
+        digits = self.generator.digits
+        chars = []
+        for _ in range(6):
+            index, d = divmod(index, len(digits))
+            chars.append(digits[d])
+        first, second = divmod(index, len(self.generator.letters))
+        return self.generator.letters[first] + self.generator.letters[second] + "".join(reversed(chars))
+
+    def is_issued(self, username):
+        index = self.index_of(username)
+        return bool(self._bitmap[index >> 3] & (1 << (index & 7)))
+
+    def claim(self, username):
+        """Record a username; returns False if it was already issued"""
+        index = self.index_of(username)
+        bit = 1 << (index & 7)
+        byte = self._bitmap[index >> 3]
+        if byte & bit:
+            return False
+        self._bitmap[index >> 3] = byte | bit
+        return True
+
+    def allocate(self):
+        """Issue a new random username that has never been issued before"""
+        for _ in range(self.MAX_DRAWS):
+            username = self.generator.generate_username()
+            if self.claim(username):
+                return username
+        # The bitmap is dense; scan from a random byte for the next free slot
+        return self._claim_next_free(self.index_of(self.generator.generate_username()))
+
+    def _claim_next_free(self, start):
+        nbytes = len(self._bitmap)
+        for offset in range(nbytes):
+            position = (start // 8 + offset) % nbytes
+            byte = self._bitmap[position]
+            if byte == 0xFF:
+                continue
+            for bit in range(8):
+                index = position * 8 + bit
+                if index < self.size and not byte & (1 << bit):
+                    self._bitmap[position] = byte | (1 << bit)
+                    return self.username_of(index)
+        raise RuntimeError("Every username has been issued")
+
+    def close(self):
+        if self._file:
+            self._bitmap.flush()
+        self._bitmap.close()
+        if self._file:
+            self._file.close()
+
+def write_credentials(generator, count, out, output_format="csv", registry=None):
+    # Write count credentials to out. Returns the number written.
+    credentials = generator.generate_credentials(count, registry)
+    if output_format == "jsonl":
+        for username, password in credentials:
+            out.write(json.dumps({"username": username, "password": password}) + "\n")
+    else:
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(["username", "password"])
+        writer.writerows(credentials)
+    return count
+
+def benchmark(count, policy=None):
+    # Generate count credentials and return credentials per second
+    generator = CredentialGenerator(policy=policy)
+    start = time.perf_counter()
+    for _ in generator.generate_credentials(count):
+        pass
+    return count / (time.perf_counter() - start)
+
+def run_audit(path, policy, workers=None, violations_path=None):
+    # Audit a password file and print per-rule statistics. Exits with
+    # status 1 if the input cannot be read or the violations file written.
+    # The input is opened first, so a missing file leaves no empty
+    # violations file behind.
+    try:
+        f = open(path, encoding="utf-8", errors="surrogateescape")
+    except OSError as e:
+        print(f"Error: Cannot read '{path}': {e.strerror}", file=sys.stderr)
+        sys.exit(1)
+    with f:
+        try:
+            out = open(violations_path, "w", newline="") if violations_path else None
+        except OSError as e:
+            print(f"Error: Cannot write '{violations_path}': {e.strerror}", file=sys.stderr)
+            sys.exit(1)
+        on_violation = None
+        if out:
+            writer = csv.writer(out, lineterminator="\n")
+            writer.writerow(["line", "failed_rules"])
+
+            def on_violation(line_number, rules):
+                writer.writerow([line_number, ";".join(rules)])
+        try:
+            total, failed, stats = audit_passwords(f, policy, workers, on_violation=on_violation)
+        except OSError as e:
+            print(f"Error: Cannot read '{path}': {e.strerror}", file=sys.stderr)
+            sys.exit(1)
+        finally:
+            if out:
+                out.close()
+
+    print(f"Passwords checked: {total}")
+    print(f"Passwords failed:  {failed}")
+    print("\nViolations by rule:")
+    for rule in policy.rules:
+        print(f"{rule + ':':<12} {stats.get(rule, 0)}")
+
+def print_single(policy=None):
+    generator = CredentialGenerator(policy=policy)
     username = generator.generate_username()
     password = generator.generate_password()
     
@@ -128,5 +562,57 @@ def main():
     print(f"Numbers: {digit_count}")
     print(f"Symbols: {symbol_count}")
 
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate usernames and passwords"
+    )
+    parser.add_argument("--count", type=int, help="Generate COUNT credentials in bulk")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv", help="Bulk output format (default: csv)")
+    parser.add_argument("--output", help="Bulk output file (default: stdout)")
+    parser.add_argument("--registry", help="Issued-username bitmap file, created if missing")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="Report credentials per second for N credentials")
+    parser.add_argument("--audit", metavar="FILE", help="Audit a password file (one per line) against the policy")
+    parser.add_argument("--policy", metavar="FILE", help="JSON password policy (default: generator policy)")
+    parser.add_argument("--workers", type=int, help="Audit processes (default: CPU count)")
+    parser.add_argument("--violations", metavar="FILE", help="Write line,failed_rules rows for failing passwords")
+    args = parser.parse_args()
+
+    policy = None
+    if args.policy:
+        try:
+            with open(args.policy) as f:
+                policy = PasswordPolicy.from_dict(json.load(f))
+            if not args.audit:
+                policy.check_generation()
+        except (OSError, ValueError, TypeError) as e:
+            print(f"Error: Invalid policy '{args.policy}': {e}")
+            sys.exit(1)
+
+    if args.audit:
+        policy = policy or PasswordPolicy()
+        run_audit(args.audit, policy, args.workers, args.violations)
+        return
+
+    if args.benchmark:
+        rate = benchmark(args.benchmark, policy)
+        print(f"Generated {args.benchmark} credentials: {rate:,.0f} credentials/second")
+        return
+
+    if args.count is None:
+        print_single(policy)
+        return
+
+    generator = CredentialGenerator(policy=policy)
+    registry = UsernameRegistry(args.registry, generator) if args.registry else None
+    try:
+        if args.output:
+            with open(args.output, "w", newline="") as out:
+                write_credentials(generator, args.count, out, args.format, registry)
+        else:
+            write_credentials(generator, args.count, sys.stdout, args.format, registry)
+    finally:
+        if registry:
+            registry.close()
+
 if __name__ == "__main__":
     main()